@@ -0,0 +1,50 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import DBDep, IsAdminDep
+from app.database.database import engine, read_engine
+from app.services.admin import AdminService
+from app.services.exports import ExportEntity, ExportFormat, ExportService
+
+router = APIRouter(prefix="/admin", tags=["Администрирование"])
+
+
+@router.get("/dashboard", summary="Статистика для админ-панели")
+async def get_dashboard_stats(
+    db: DBDep,
+    is_admin: IsAdminDep,
+) -> dict[str, int | float]:
+    return await AdminService(db).get_dashboard_stats()
+
+
+@router.get("/db/pool", summary="Метрики пула соединений с БД")
+async def get_pool_stats(
+    is_admin: IsAdminDep,
+) -> dict[str, dict[str, int | float]]:
+    stats = {"primary": engine.pool.stats()}
+    if read_engine is not None:
+        stats["read"] = read_engine.pool.stats()
+    return stats
+
+
+@router.post("/ratings/rebuild", summary="Пересчет агрегатов рейтинга ферм и товаров")
+async def rebuild_rating_aggregates(
+    db: DBDep,
+    is_admin: IsAdminDep,
+) -> dict[str, int]:
+    return await AdminService(db).rebuild_rating_aggregates()
+
+
+@router.get("/export/{entity}", summary="Потоковая выгрузка заказов, пользователей, отзывов или товаров")
+async def export_table(
+    entity: ExportEntity,
+    db: DBDep,
+    is_admin: IsAdminDep,
+    format: ExportFormat = "csv",
+) -> StreamingResponse:
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        ExportService(db).export(entity, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"'},
+    )
@@ -19,6 +19,8 @@ from app.exceptions.auth import (
     PasswordTooShortHTTPError,
     EmptyFieldHTTPError,
     InvalidEmailHTTPError,
+    PasswordHashingBusyError,
+    PasswordHashingBusyHTTPError,
 )
 from app.schemes.users import SUserAddRequest, UserAuth, UserDeleteResponse, UserProfile, UserUpdate, UserPartialUpdate
 
@@ -52,6 +54,8 @@ async def register_user(
         raise EmptyFieldHTTPError
     except InvalidEmailError:
         raise InvalidEmailHTTPError
+    except PasswordHashingBusyError:
+        raise PasswordHashingBusyHTTPError
 
 
 @router.post("/login", summary="Аутентификация пользователя")
@@ -66,6 +70,8 @@ async def login_user(
         raise UserNotFoundHTTPError
     except InvalidPasswordError:
         raise InvalidPasswordHTTPError
+    except PasswordHashingBusyError:
+        raise PasswordHashingBusyHTTPError
     
     response.set_cookie(
         "access_token",
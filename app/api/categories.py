@@ -1,6 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response
 
-from app.api.dependencies import DBDep, IsAdminDep, CurrentUserDep
+from app.api.dependencies import DBDep, IsAdminDep, CurrentUserDep, conditional_get
 from app.exceptions.categories import (
     CategoryNotFoundError,
     CategoryNotFoundHTTPError,
@@ -9,14 +9,17 @@ from app.exceptions.categories import (
 )
 from app.schemes.categories import SCategoryAdd, SCategoryGet
 from app.services.categories import CategoryService
+from app.utils.serialization import ValidatedListResponse
 
 router = APIRouter(prefix="/categories", tags=["Категории"])
 
-@router.get("", summary="Получение списка категорий")
+@router.get("", summary="Получение списка категорий", response_model=list[SCategoryGet], dependencies=[Depends(conditional_get("categories", cached_etag=lambda db: CategoryService(db).get_categories_etag()))])
 async def get_all_categories(
+    response: Response,
     db: DBDep,
-) -> list[SCategoryGet]:
-    return await CategoryService(db).get_categories()
+) -> Response:
+    categories = await CategoryService(db).get_categories()
+    return ValidatedListResponse(categories, SCategoryGet, headers=response.headers)
 
 @router.post("", summary="Создание новой категории")
 async def create_new_category(
@@ -1,16 +1,19 @@
-from typing import Annotated
+from typing import Annotated, Awaitable, Callable, Optional
 
-from fastapi import Depends, HTTPException, Request
+from fastapi import Depends, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 
-from app.database.database import async_session_maker
+from app.database.database import async_read_session_maker, async_session_maker
+from app.database.table_versions import etag_matches, table_etag
+from app.models.table_versions import VERSIONED_TABLES
 from app.exceptions.auth import (
     InvalidJWTTokenError,
     InvalidTokenHTTPError,
     IsNotAdminHTTPError,
     NoAccessTokenHTTPError,
 )
-from app.models.users import User
+from app.exceptions.base import NotModifiedHTTPError
+from app.schemes.users import STokenClaims
 from app.services.auth import AuthService
 from app.database.db_manager import DBManager
 
@@ -23,6 +26,14 @@ class PaginationParams(BaseModel):
 PaginationDep = Annotated[PaginationParams, Depends()]
 
 
+class CursorPaginationParams(BaseModel):
+    limit: int = Field(default=100, ge=1, le=500)
+    cursor: str | None = None
+
+
+CursorPaginationDep = Annotated[CursorPaginationParams, Depends()]
+
+
 def get_token(request: Request) -> str:
     token = request.cookies.get("access_token", None)
     if token is None:
@@ -30,32 +41,67 @@ def get_token(request: Request) -> str:
     return token
 
 
-def get_current_user_id(token: str = Depends(get_token)) -> int:
+async def get_db(request: Request):
+    # GET-запросы читают из реплики; сервисы могут вернуться на основную БД через db.use_primary()
+    read_session_factory = async_read_session_maker if request.method in ("GET", "HEAD") else None
+    async with DBManager(session_factory=async_session_maker, read_session_factory=read_session_factory) as db:
+        yield db
+
+
+DBDep = Annotated[DBManager, Depends(get_db)]
+
+
+async def get_token_claims(db: DBDep, token: str = Depends(get_token)) -> STokenClaims:
+    """Claims проверенного токена; роль и версия берутся из токена, а не из таблицы users.
+    
+    Версия токена при промахе кэша читается в сессии самого запроса, а не во второй сессии:
+    запрос, держащий соединение и ждущий еще одно, при нагрузке исчерпал бы пул.
+    """
+    async def load_token_version(user_id: int) -> Optional[int]:
+        # Основная БД: реплика может отставать от только что выполненной смены роли
+        await db.use_primary()
+        return await db.users.get_token_version(user_id)
+    
     try:
-        data = AuthService.decode_token(token)
+        return await AuthService.check_token(token, load_token_version)
     except InvalidJWTTokenError:
         raise InvalidTokenHTTPError
-    return data["user_id"]
 
 
-UserIdDep = Annotated[int, Depends(get_current_user_id)]
+TokenClaimsDep = Annotated[STokenClaims, Depends(get_token_claims)]
 
 
-async def get_db():
-    async with DBManager(session_factory=async_session_maker) as db:
-        yield db
+async def get_current_user_id(claims: TokenClaimsDep) -> int:
+    return claims.id
 
 
-DBDep = Annotated[DBManager, Depends(get_db)]
+UserIdDep = Annotated[int, Depends(get_current_user_id)]
 
 
-async def check_is_admin(db: DBDep, user_id: UserIdDep) -> int:
-    user = await db.users.get_one_with_role(id=user_id)
-    if not user:
-        raise InvalidTokenHTTPError
+def conditional_get(*tables: str, cached_etag: Optional[Callable[[DBManager], Awaitable[str]]] = None):
+    """Зависимость для списков: ETag по версиям таблиц из table_versions, 304 на совпавший If-None-Match.
+
+    Версии читаются одним запросом по первичному ключу до загрузки строк, поэтому 304
+    не загружает и не сериализует список. Для списков из reference_cache cached_etag отдает ETag,
+    сохраненный вместе со списком: попадание в кэш не обращается к БД совсем.
+    """
+    unversioned = set(tables) - set(VERSIONED_TABLES)
+    if unversioned:
+        raise ValueError(f"Для таблиц {sorted(unversioned)} не ведутся версии: добавьте их в VERSIONED_TABLES и миграцию")
+    
+    async def dependency(request: Request, response: Response, db: DBDep) -> None:
+        etag = await cached_etag(db) if cached_etag else await table_etag(db.session, *tables)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise NotModifiedHTTPError(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
     
-    if user.role.name == "admin":
-        return user_id
+    return dependency
+
+
+async def check_is_admin(claims: TokenClaimsDep) -> int:
+    if claims.role == "admin":
+        return claims.id
     else:
         raise IsNotAdminHTTPError
 
@@ -63,23 +109,13 @@ async def check_is_admin(db: DBDep, user_id: UserIdDep) -> int:
 IsAdminDep = Annotated[int, Depends(check_is_admin)]
 
 
-async def get_current_user(db: DBDep, user_id: UserIdDep):
-    user = await db.users.get_one_with_role(id=user_id)
-    if not user:
-        raise InvalidTokenHTTPError
-    return user
-
-
-CurrentUserDep = Annotated[User, Depends(get_current_user)]
+# Маршрутам нужен только id пользователя, поэтому строка users не загружается
+CurrentUserDep = TokenClaimsDep
 
 
-async def check_is_farmer_or_admin(db: DBDep, user_id: UserIdDep) -> int:
-    user = await db.users.get_one_with_role(id=user_id)
-    if not user:
-        raise InvalidTokenHTTPError
-    
-    if user.role.name in ["farmer", "admin"]:
-        return user_id
+async def check_is_farmer_or_admin(claims: TokenClaimsDep) -> int:
+    if claims.role in ["farmer", "admin"]:
+        return claims.id
     else:
         raise HTTPException(status_code=403, detail="Недостаточно прав")
 
@@ -100,13 +136,9 @@ class RoleEnum(str, Enum):
 
 
 def get_current_user_with_role_dependency(required_role: RoleEnum):
-    async def dependency(db: DBDep, user_id: UserIdDep) -> int:
-        user = await db.users.get_one_with_role(id=user_id)
-        if not user:
-            raise InvalidTokenHTTPError
-        
-        if user.role.name == required_role.value:
-            return user_id
+    async def dependency(claims: TokenClaimsDep) -> int:
+        if claims.role == required_role.value:
+            return claims.id
         else:
             raise HTTPException(status_code=403, detail=f"Требуется роль {required_role.value}")
     
@@ -1,22 +1,73 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response, Depends
+from fastapi.responses import RedirectResponse
 
-from app.api.dependencies import DBDep, CurrentUserDep, IsAdminDep, IsFarmerOrAdminDep
+from app.api.dependencies import DBDep, CurrentUserDep, IsAdminDep, IsFarmerOrAdminDep, CursorPaginationDep, conditional_get
+from app.exceptions.pagination import InvalidCursorError, InvalidCursorHTTPError
 from app.exceptions.farms import (
     FarmNotFoundError,
     FarmNotFoundHTTPError,
     FarmAlreadyExistsError,
     FarmAlreadyExistsHTTPError,
+    FarmImageNotFoundError,
+    FarmImageNotFoundHTTPError,
+    FarmNotYoursError,
+    FarmNotYoursHTTPError,
 )
+from app.exceptions.images import ImageTooLargeError, ImageTooLargeHTTPError, InvalidImageError, InvalidImageHTTPError
 from app.schemes.farms import SFarmAdd, SFarmGet, SFarmApplicationResponse
 from app.services.farms import FarmService
+from app.utils.serialization import ValidatedListResponse
 
 router = APIRouter(prefix="/farms", tags=["Фермы"])
 
-@router.get("", summary="Получение списка ферм")
+@router.get("", summary="Получение списка ферм", response_model=list[SFarmGet], dependencies=[Depends(conditional_get("farms"))])
 async def get_all_farms(
+    response: Response,
     db: DBDep,
-) -> list[SFarmGet]:
-    return await FarmService(db).get_farms()
+    pagination: CursorPaginationDep,
+) -> Response:
+    try:
+        farms, next_cursor = await FarmService(db).get_farms(limit=pagination.limit, cursor=pagination.cursor)
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return ValidatedListResponse(farms, SFarmGet, headers=response.headers)
+
+@router.get("/{id}/image", summary="Получение изображения фермы")
+async def get_farm_image(
+    id: int,
+    request: Request,
+    db: DBDep,
+) -> RedirectResponse:
+    """Перенаправляет на неизменяемый адрес файла в /images"""
+    try:
+        image_key = await FarmService(db).get_farm_image(farm_id=id)
+    except FarmNotFoundError:
+        raise FarmNotFoundHTTPError
+    except FarmImageNotFoundError:
+        raise FarmImageNotFoundHTTPError
+    return RedirectResponse(request.url_for("get_image", key=image_key))
+
+@router.put("/{id}/image", summary="Загрузка изображения фермы")
+async def set_farm_image(
+    id: int,
+    request: Request,
+    db: DBDep,
+    user: IsFarmerOrAdminDep,
+) -> dict[str, str]:
+    """Тело запроса - сам файл (JPEG, PNG, WebP или GIF), оно читается потоком"""
+    try:
+        image_key = await FarmService(db).set_farm_image(farm_id=id, chunks=request.stream(), user_id=user)
+    except FarmNotFoundError:
+        raise FarmNotFoundHTTPError
+    except FarmNotYoursError:
+        raise FarmNotYoursHTTPError
+    except ImageTooLargeError:
+        raise ImageTooLargeHTTPError
+    except InvalidImageError:
+        raise InvalidImageHTTPError
+    return {"status": "OK", "image_key": image_key}
 
 @router.post("/applications", summary="Подача заявки на регистрацию фермы")
 async def create_farm_application(
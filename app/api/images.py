@@ -0,0 +1,37 @@
+from typing import Optional
+
+import anyio
+from fastapi import APIRouter, Request
+from fastapi.responses import FileResponse
+
+from app.database.table_versions import etag_matches
+from app.exceptions.base import NotModifiedHTTPError
+from app.exceptions.images import ImageNotFoundHTTPError
+from app.utils.images import IMAGE_KEY, MEDIA_TYPES, THUMBNAIL_EXTENSION, THUMBNAIL_WIDTHS, image_store
+from app.utils.static_files import IMMUTABLE_CACHE_CONTROL
+
+router = APIRouter(prefix="/images", tags=["Изображения"])
+
+@router.get("/{key}", summary="Получение изображения или его миниатюры")
+async def get_image(
+    key: str,
+    request: Request,
+    w: Optional[int] = None,
+) -> FileResponse:
+    """Файлы адресуются хешем содержимого и не меняются: immutable-кэш, ETag и Range (FileResponse)"""
+    match = IMAGE_KEY.match(key)
+    if not match or (w is not None and w not in THUMBNAIL_WIDTHS):
+        raise ImageNotFoundHTTPError
+    path = image_store.path(key, w)
+    if not await anyio.to_thread.run_sync(path.is_file):
+        raise ImageNotFoundHTTPError
+    
+    etag = f'"{match["digest"]}"' if w is None else f'"{match["digest"]}-w{w}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise NotModifiedHTTPError(etag)
+    extension = match["extension"] if w is None else THUMBNAIL_EXTENSION
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[extension],
+        headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL},
+    )
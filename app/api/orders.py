@@ -1,7 +1,8 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from app.api.dependencies import DBDep, CurrentUserDep, IsAdminDep
+from app.api.dependencies import DBDep, CurrentUserDep, IsAdminDep, CursorPaginationDep
+from app.exceptions.pagination import InvalidCursorError, InvalidCursorHTTPError
 from app.exceptions.orders import (
     OrderNotFoundError,
     OrderNotFoundHTTPError,
@@ -12,22 +13,32 @@ from app.exceptions.orders import (
 )
 from app.schemes.orders import SOrderCreate, SOrderGet, SOrderUpdate
 from app.services.orders import OrderService
+from app.utils.serialization import ValidatedListResponse
 
 router = APIRouter(prefix="/orders", tags=["Заказы"])
 
-@router.get("", summary="Получение списка заказов пользователя")
+@router.get("", summary="Получение списка заказов пользователя", response_model=list[SOrderGet])
 async def get_user_orders(
     db: DBDep,
     current_user: CurrentUserDep,
-) -> list[SOrderGet]:
-    return await OrderService(db).get_user_orders(user_id=current_user.id)
+) -> Response:
+    orders = await OrderService(db).get_user_orders(user_id=current_user.id)
+    return ValidatedListResponse(orders, SOrderGet)
 
-@router.get("/all", summary="Получение всех заказов (только для админов)")
+@router.get("/all", summary="Получение всех заказов (только для админов)", response_model=list[SOrderGet])
 async def get_all_orders(
+    response: Response,
     db: DBDep,
     is_admin: IsAdminDep,
-) -> list[SOrderGet]:
-    return await OrderService(db).get_all_orders()
+    pagination: CursorPaginationDep,
+) -> Response:
+    try:
+        orders, next_cursor = await OrderService(db).get_all_orders(limit=pagination.limit, cursor=pagination.cursor)
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return ValidatedListResponse(orders, SOrderGet, headers=response.headers)
 
 @router.get("/{order_id}", summary="Получение конкретного заказа")
 async def get_order(
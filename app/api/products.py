@@ -1,6 +1,11 @@
-from fastapi import APIRouter
+from typing import Annotated
 
-from app.api.dependencies import DBDep, CurrentUserDep, IsFarmerOrAdminDep
+from fastapi import APIRouter, Depends, Query, Request, Response, UploadFile
+from fastapi.responses import RedirectResponse
+
+from app.api.dependencies import DBDep, CurrentUserDep, IsFarmerOrAdminDep, CursorPaginationDep, conditional_get
+from app.exceptions.images import ImageTooLargeError, ImageTooLargeHTTPError, InvalidImageError, InvalidImageHTTPError
+from app.exceptions.pagination import InvalidCursorError, InvalidCursorHTTPError
 from app.exceptions.products import (
     ProductNotFoundError,
     ProductNotFoundHTTPError,
@@ -8,17 +13,42 @@ from app.exceptions.products import (
     ProductNotInStockHTTPError,
     ProductNotYoursError,
     ProductNotYoursHTTPError,
+    ProductImageNotFoundError,
+    ProductImageNotFoundHTTPError,
+    ProductImportFileError,
+    ProductImportFileHTTPError,
 )
-from app.schemes.products import SProductAdd, SProductUpdate, SProductGet, SProductPartialUpdate
+from app.schemes.products import SProductAdd, SProductUpdate, SProductGet, SProductPartialUpdate, SProductFilter, SProductImportReport
 from app.services.products import ProductService
+from app.utils.serialization import ValidatedListResponse
 
 router = APIRouter(prefix="/products", tags=["Товары"])
 
-@router.get("", summary="Получение списка товаров")
+@router.get("", summary="Получение списка товаров", response_model=list[SProductGet], dependencies=[Depends(conditional_get("products"))])
 async def get_all_products(
+    response: Response,
+    db: DBDep,
+    pagination: CursorPaginationDep,
+    filters: Annotated[SProductFilter, Depends()],
+) -> Response:
+    try:
+        products, next_cursor = await ProductService(db).get_products(
+            limit=pagination.limit, cursor=pagination.cursor, filters=filters
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return ValidatedListResponse(products, SProductGet, headers=response.headers)
+
+@router.get("/search", summary="Полнотекстовый поиск товаров", response_model=list[SProductGet])
+async def search_products(
     db: DBDep,
-) -> list[SProductGet]:
-    return await ProductService(db).get_products()
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+) -> Response:
+    products = await ProductService(db).search_products(query=q, limit=limit)
+    return ValidatedListResponse(products, SProductGet)
 
 @router.get("/{id}", summary="Получение конкретного товара")
 async def get_product(
@@ -30,6 +60,41 @@ async def get_product(
     except ProductNotFoundError:
         raise ProductNotFoundHTTPError
 
+@router.get("/{id}/image", summary="Получение изображения товара")
+async def get_product_image(
+    id: int,
+    request: Request,
+    db: DBDep,
+) -> RedirectResponse:
+    """Перенаправляет на неизменяемый адрес файла в /images"""
+    try:
+        image_key = await ProductService(db).get_product_image(product_id=id)
+    except ProductNotFoundError:
+        raise ProductNotFoundHTTPError
+    except ProductImageNotFoundError:
+        raise ProductImageNotFoundHTTPError
+    return RedirectResponse(request.url_for("get_image", key=image_key))
+
+@router.put("/{id}/image", summary="Загрузка изображения товара")
+async def set_product_image(
+    id: int,
+    request: Request,
+    db: DBDep,
+    user: IsFarmerOrAdminDep,
+) -> dict[str, str]:
+    """Тело запроса - сам файл (JPEG, PNG, WebP или GIF), оно читается потоком"""
+    try:
+        image_key = await ProductService(db).set_product_image(product_id=id, chunks=request.stream(), user_id=user)
+    except ProductNotFoundError:
+        raise ProductNotFoundHTTPError
+    except ProductNotYoursError:
+        raise ProductNotYoursHTTPError
+    except ImageTooLargeError:
+        raise ImageTooLargeHTTPError
+    except InvalidImageError:
+        raise InvalidImageHTTPError
+    return {"status": "OK", "image_key": image_key}
+
 @router.post("", summary="Создание нового товара")
 async def create_product(
     product_data: SProductAdd,
@@ -39,6 +104,23 @@ async def create_product(
     await ProductService(db).create_product(product_data=product_data, user_id=user)
     return {"status": "OK"}
 
+@router.post("/import", summary="Импорт товаров из CSV")
+async def import_products(
+    file: UploadFile,
+    db: DBDep,
+    user: IsFarmerOrAdminDep,
+) -> SProductImportReport:
+    """Колонки: name, price, quantity, category (название) или category_id; необязательные: unit, description, farm_id.
+    
+    Разделитель - запятая, точка с запятой или табуляция. Строки с ошибками пропускаются и возвращаются в отчете.
+    """
+    try:
+        return await ProductService(db).import_products(file=file.file, user_id=user)
+    except ProductNotYoursError:
+        raise ProductNotYoursHTTPError
+    except ProductImportFileError:
+        raise ProductImportFileHTTPError
+
 @router.put("/{id}", summary="Полное изменение товара")
 async def update_product(
     id: int,
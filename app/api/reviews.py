@@ -1,22 +1,37 @@
-from fastapi import APIRouter
+from typing import Annotated
 
-from app.api.dependencies import DBDep, CurrentUserDep, IsAdminDep
+from fastapi import APIRouter, Response, Depends
+
+from app.api.dependencies import DBDep, CurrentUserDep, IsAdminDep, CursorPaginationDep, conditional_get
+from app.exceptions.pagination import InvalidCursorError, InvalidCursorHTTPError
 from app.exceptions.reviews import (
     ReviewNotFoundError,
     ReviewNotFoundHTTPError,
     ReviewAlreadyExistsError,
     ReviewAlreadyExistsHTTPError,
 )
-from app.schemes.reviews import SReviewAdd, SReviewGet
+from app.schemes.reviews import SReviewAdd, SReviewFilter, SReviewGet
 from app.services.reviews import ReviewService
+from app.utils.serialization import ValidatedListResponse
 
 router = APIRouter(prefix="/reviews", tags=["Отзывы"])
 
-@router.get("", summary="Получение списка отзывов")
+@router.get("", summary="Получение списка отзывов", response_model=list[SReviewGet], dependencies=[Depends(conditional_get("reviews"))])
 async def get_all_reviews(
+    response: Response,
     db: DBDep,
-) -> list[SReviewGet]:
-    return await ReviewService(db).get_reviews()
+    pagination: CursorPaginationDep,
+    filters: Annotated[SReviewFilter, Depends()],
+) -> Response:
+    try:
+        reviews, next_cursor = await ReviewService(db).get_reviews(
+            limit=pagination.limit, cursor=pagination.cursor, filters=filters
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return ValidatedListResponse(reviews, SReviewGet, headers=response.headers)
 
 @router.get("/{id}", summary="Получение конкретного отзыва")
 async def get_review(
@@ -1,6 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, Depends
 
-from app.api.dependencies import DBDep, CurrentUserDep, IsAdminDep
+from app.api.dependencies import DBDep, CurrentUserDep, IsAdminDep, CursorPaginationDep, conditional_get
+from app.exceptions.pagination import InvalidCursorError, InvalidCursorHTTPError
 from app.exceptions.subscriptions import (
     SubscriptionPlanNotFoundError,
     SubscriptionPlanNotFoundHTTPError,
@@ -15,14 +16,23 @@ from app.exceptions.subscriptions import (
 )
 from app.schemes.subscription import SSubscriptionPlanAdd, SSubscriptionPlanGet, SUserSubscriptionGet
 from app.services.subscription import SubscriptionService
+from app.utils.serialization import ValidatedListResponse
 
 router = APIRouter(prefix="/subscriptions", tags=["Подписки"])
 
-@router.get("/plans", summary="Получение списка планов подписок")
+@router.get("/plans", summary="Получение списка планов подписок", response_model=list[SSubscriptionPlanGet], dependencies=[Depends(conditional_get("subscription_plans", cached_etag=lambda db: SubscriptionService(db).get_plans_etag()))])
 async def get_subscription_plans(
+    response: Response,
     db: DBDep,
-) -> list[SSubscriptionPlanGet]:
-    return await SubscriptionService(db).get_plans()
+    pagination: CursorPaginationDep,
+) -> Response:
+    try:
+        plans, next_cursor = await SubscriptionService(db).get_plans(limit=pagination.limit, cursor=pagination.cursor)
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return ValidatedListResponse(plans, SSubscriptionPlanGet, headers=response.headers)
 
 @router.get("/plans/{id}", summary="Получение конкретного плана")
 async def get_subscription_plan(
@@ -57,6 +67,8 @@ async def update_subscription_plan(
         await SubscriptionService(db).update_plan(plan_id=id, plan_data=plan_data)
     except SubscriptionPlanNotFoundError:
         raise SubscriptionPlanNotFoundHTTPError
+    except SubscriptionPlanAlreadyExistsError:
+        raise SubscriptionPlanAlreadyExistsHTTPError
     return {"status": "OK"}
 
 @router.delete("/plans/{id}", summary="Удаление плана подписки")
@@ -2,9 +2,12 @@ from fastapi import APIRouter, Request
 
 from fastapi.templating import Jinja2Templates
 
+from app.utils.assets import asset_url
+
 
 router = APIRouter(prefix="/web", tags=["Фронтенд"])
 templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["asset_url"] = asset_url
 
 
 @router.get("/auth")
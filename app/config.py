@@ -1,4 +1,6 @@
 import os
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,6 +15,50 @@ class Settings(BaseSettings):
     DB_PASS: str = "password"
     DB_TYPE: str = "sqlite"
     ENVIRONMENT: str = "development"
+    # Сколько раз одна и та же форма SQL может выполниться за запрос до предупреждения о N+1
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+    DB_ECHO: bool = False
+    # Сколько секунд админ-панель показывает закэшированный снимок статистики
+    DASHBOARD_STATS_TTL: int = 30
+    # Сколько секунд живут закэшированные категории, роли и тарифы: за это время запись,
+    # сделанная другим воркером, становится видна и в этом
+    REFERENCE_CACHE_TTL: int = 30
+
+    # Хранилище изображений: оригиналы и миниатюры лежат на диске под SHA-256 содержимого
+    MEDIA_DIR: str = "media"
+    IMAGE_MAX_BYTES: int = 10 * 1024 * 1024
+    IMAGE_WORKERS: int = 2  # процессы для декодирования и генерации миниатюр
+
+    # bcrypt: потоки для хешей (половина ядер, остальное - event loop'у) и предел вызовов
+    # в работе и очереди, сверх которого вход и регистрация отвечают 503
+    PASSWORD_HASH_WORKERS: int = max(1, (os.cpu_count() or 2) // 2)
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # Таблица версий токенов (app/utils/token_versions.py): сколько пользователей держится в памяти
+    # и через сколько секунд версия перечитывается из users - за это время отзыв роли или удаление
+    # пользователя, выполненные другим воркером, доходят до этого
+    TOKEN_VERSIONS_MAX_SIZE: int = 100_000
+    TOKEN_VERSIONS_TTL: int = 10
+
+    # Пул соединений
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg, 0 - для pgbouncer в transaction mode
+
+    # Движок для чтения: URL реплики либо read-only соединение к тому же файлу SQLite (WAL)
+    DB_READ_URL: Optional[str] = None
+    SQLITE_READ_ONLY_ENGINE: bool = False
+
+    # Профиль SQLite, применяется к каждому новому соединению
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # отрицательное значение - размер в КиБ
+    SQLITE_BUSY_TIMEOUT: int = 5000  # мс
+    SQLITE_TEMP_STORE: str = "MEMORY"
     
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
@@ -30,6 +76,25 @@ class Settings(BaseSettings):
         else:
             raise ValueError(f"Unsupported database type: {self.DB_TYPE}")
 
+    @property
+    def get_db_read_url(self) -> Optional[str]:
+        if self.DB_READ_URL:
+            return self.DB_READ_URL
+        if self.DB_TYPE == "sqlite" and self.SQLITE_READ_ONLY_ENGINE:
+            return f"sqlite+aiosqlite:///file:{self.DB_NAME}?mode=ro&uri=true"
+        return None
+
+    @property
+    def sqlite_pragmas(self):
+        return {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "mmap_size": self.SQLITE_MMAP_SIZE,
+            "cache_size": self.SQLITE_CACHE_SIZE,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT,
+            "temp_store": self.SQLITE_TEMP_STORE,
+        }
+
     @property
     def auth_data(self):
         return {"secret_key": self.SECRET_KEY, "algorithm": self.ALGORITHM}
@@ -1,15 +1,80 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+from contextlib import AsyncExitStack
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-import os
 
-# URL базы данных
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./garden.db")
+from app.config import settings
+from app.database.pool_metrics import MeteredAsyncQueuePool
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Настраивает соединение SQLite: WAL, кэш страниц, mmap и ожидание блокировок"""
+    cursor = dbapi_connection.cursor()
+    for name, value in settings.sqlite_pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def apply_sqlite_read_only_pragmas(dbapi_connection, connection_record):
+    """Read-only соединение не может менять journal_mode: режим WAL задает основной движок"""
+    cursor = dbapi_connection.cursor()
+    for name, value in settings.sqlite_pragmas.items():
+        if name != "journal_mode":
+            cursor.execute(f"PRAGMA {name}={value}")
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def create_db_engine(url: str | None = None, read_only: bool = False) -> AsyncEngine:
+    """Единая фабрика движков: URL и параметры пула берутся из Settings"""
+    url = url or settings.get_db_url
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+
+    db_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=MeteredAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    if db_engine.dialect.name == "sqlite":
+        pragmas = apply_sqlite_read_only_pragmas if read_only else apply_sqlite_pragmas
+        event.listen(db_engine.sync_engine, "connect", pragmas)
+    return db_engine
+
+
+async def warm_pool(db_engine: AsyncEngine) -> None:
+    """Открывает pool_size соединений заранее, чтобы первые запросы не ждали подключения"""
+    async def open_connection(stack: AsyncExitStack):
+        connection = await stack.enter_async_context(db_engine.connect())
+        await connection.execute(text("SELECT 1"))
+
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(open_connection(stack) for _ in range(db_engine.pool.size())))
+
 
 # Создаем движок
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_db_engine()
+
+# Движок для чтения (реплика), если настроен
+read_engine = create_db_engine(settings.get_db_read_url, read_only=True) if settings.get_db_read_url else None
 
-# Создаем фабрику сессий
+# Создаем фабрики сессий
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+async_read_session_maker = (
+    async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False) if read_engine else None
+)
 
 # Базовый класс для моделей
 Base = declarative_base()
@@ -17,4 +82,4 @@ Base = declarative_base()
 # Функция для получения сессии (добавьте её)
 async def get_db():
     async with async_session_maker() as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -13,32 +13,76 @@ from app.repositories.user_subscriptions import UserSubscriptionRepository
 
 
 class DBManager:
-    def __init__(self, session_factory):
+    # Репозитории создаются при первом обращении к атрибуту, сессия - при первом репозитории
+    repositories = {
+        "users": UsersRepository,
+        "roles": RolesRepository,
+        "categories": CategoryRepository,
+        "farms": FarmRepository,
+        "products": ProductRepository,
+        "reviews": ReviewRepository,
+        "cart": CartRepository,
+        "orders": OrderRepository,
+        "order_items": OrderItemRepository,
+        "subscription_plans": SubscriptionPlanRepository,
+        "user_subscriptions": UserSubscriptionRepository,
+    }
+
+    def __init__(self, session_factory, read_session_factory=None):
         self.session_factory = session_factory
+        # Если задана фабрика реплики, все чтения идут в нее до вызова use_primary()
+        self.read_session_factory = read_session_factory
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            factory = self.read_session_factory or self.session_factory
+            self._session = factory()
+        return self._session
+
+    def __getattr__(self, name):
+        repository_class = self.repositories.get(name)
+        if repository_class is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        repository = repository_class(self.session)
+        setattr(self, name, repository)
+        return repository
 
     async def __aenter__(self):
-        self.session = self.session_factory()
-        self.users = UsersRepository(self.session)
-        self.roles = RolesRepository(self.session)
-        self.categories = CategoryRepository(self.session)
-        self.farms = FarmRepository(self.session)
-        self.products = ProductRepository(self.session)
-        self.reviews = ReviewRepository(self.session)
-        self.cart = CartRepository(self.session)
-        self.orders = OrderRepository(self.session)
-        self.order_items = OrderItemRepository(self.session)
-        self.subscription_plans = SubscriptionPlanRepository(self.session)
-        self.user_subscriptions = UserSubscriptionRepository(self.session)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._session is None:
+            return
         if exc_type is not None:
-            await self.session.rollback()
-        await self.session.close()
+            await self._session.rollback()
+        await self._session.close()
+
+    async def use_primary(self):
+        """Переключает менеджер на основную БД, когда нужно читать собственные записи"""
+        if self.read_session_factory is None:
+            return
+        self.read_session_factory = None
+        if self._session is None:
+            return
+        await self._session.close()
+        self._session = self.session_factory()
+        # Сервисы держат ссылки на репозитории, поэтому переносим их на новую сессию
+        for name in self.repositories:
+            repository = self.__dict__.get(name)
+            if repository is not None:
+                repository.session = self._session
 
     async def commit(self):
-        await self.session.commit()
+        """Единственный commit запроса: репозитории только делают flush"""
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self):
+        if self._session is not None:
+            await self._session.rollback()
 
-    # Удаляем ненужные методы, которые дублируют функциональность репозиториев
-    # Все методы уже доступны через соответствующие репозитории в __aenter__
-    pass
+    def savepoint(self):
+        """SAVEPOINT внутри транзакции запроса: откатывает только вложенный блок"""
+        return self.session.begin_nested()
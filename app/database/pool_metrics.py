@@ -0,0 +1,59 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass
+class PoolMetrics:
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    peak_checked_out: int = 0
+
+    def record_checkout(self, wait: float, checked_out: int) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+
+class MeteredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool, который считает время ожидания соединения при checkout"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+    def capacity(self) -> int:
+        return self.size() + max(self._max_overflow, 0)
+
+    def stats(self) -> dict:
+        checked_out = self.checkedout()
+        capacity = self.capacity()
+        metrics = self.metrics
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": checked_out,
+            "checked_in": self.checkedin(),
+            "overflow": self.overflow(),
+            "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+            "peak_saturation": round(metrics.peak_checked_out / capacity, 3) if capacity else 0.0,
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "avg_wait_ms": round(metrics.total_wait / metrics.checkouts * 1000, 3) if metrics.checkouts else 0.0,
+            "max_wait_ms": round(metrics.max_wait * 1000, 3),
+        }
@@ -0,0 +1,115 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Активные сборщики статистики: middleware запроса и вложенные query_budget из тестов
+_collectors: ContextVar[tuple["QueryStats", ...]] = ContextVar("query_stats_collectors", default=())
+
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)|\((?:\s*%\(\w+\)s\s*,)+\s*%\(\w+\)s\s*\)|\((?:\s*\$\d+\s*,)+\s*\$\d+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Нормализует SQL: одинаковые запросы с разной длиной IN (...) дают одну форму"""
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Формы запросов, выполненные больше threshold раз (признак N+1)"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+@contextmanager
+def collect_queries():
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """Хелпер для pytest: падает, если внутри блока выполнено больше max_queries запросов.
+
+        with query_budget(3):
+            await client.delete("/cart")
+    """
+    with collect_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        details = "\n".join(f"  {count} x {shape}" for shape, count in stats.shapes.most_common())
+        raise AssertionError(f"Выполнено {stats.count} SQL-запросов при бюджете {max_queries}:\n{details}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Время старта хранится в контексте выполнения, а не в conn.info: если запрос упадет,
+    # after_cursor_execute не вызовется, и запись не останется на соединении из пула
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_start_time", None)
+    duration = time.perf_counter() - start if start is not None else 0.0
+    for stats in _collectors.get():
+        stats.record(statement, duration)
+
+
+def install_query_listeners(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryCounterMiddleware:
+    """ASGI middleware: число запросов и время БД в заголовках, предупреждение о N+1 в лог"""
+
+    def __init__(self, app, threshold: int = 10):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_queries() as stats:
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(stats.count).encode()))
+                    headers.append((b"x-db-query-time", f"{stats.total_time * 1000:.2f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+        repeated = stats.repeated(self.threshold)
+        if repeated:
+            route = scope.get("route")
+            path = getattr(route, "path", scope["path"])
+            for shape, count in repeated:
+                logger.warning("Возможный N+1 в %s %s: %d раз выполнен запрос %s", scope["method"], path, count, shape)
@@ -0,0 +1,68 @@
+from typing import Optional
+
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.table_versions import VERSIONED_TABLES, TableVersion
+
+# Версии хранятся в БД и растут в транзакции записи, поэтому ETag одинаков во всех воркерах
+# и переживает перезапуск; счетчик в памяти процесса не видел бы записей других воркеров
+_table = TableVersion.__table__
+
+
+async def table_etag(session: AsyncSession, *tables: str) -> str:
+    """Слабый ETag по версиям таблиц, из которых собран ответ: один запрос по первичному ключу"""
+    result = await session.execute(select(_table.c.name, _table.c.version).where(_table.c.name.in_(tables)))
+    versions = dict(result.all())
+    return 'W/"{}"'.format("-".join(str(versions.get(table, 0)) for table in tables))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Слабое сравнение из RFC 9110: префикс W/ не учитывается"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def _mark_written(session, table_name: str) -> None:
+    if table_name in VERSIONED_TABLES:
+        session.info.setdefault("written_tables", set()).add(table_name)
+
+
+def _do_orm_execute(orm_execute_state):
+    # insert/update/delete, выполненные репозиториями через session.execute
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_written(orm_execute_state.session, orm_execute_state.statement.table.name)
+
+
+def _after_flush(session, flush_context):
+    # Объекты, добавленные через session.add или измененные атрибутами
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        _mark_written(session, instance.__table__.name)
+
+
+def _before_commit(session):
+    # flush до подсчета: commit сбросил бы оставшиеся объекты уже после обновления версий
+    session.flush()
+    tables = sorted(session.info.pop("written_tables", ()))
+    if not tables:
+        return
+    # Через соединение, а не session.execute: обновление версий само не должно попадать в written_tables.
+    # Строки версий заведены миграцией, поэтому здесь только UPDATE, без гонки двух первых вставок
+    session.connection().execute(update(_table).where(_table.c.name.in_(tables)).values(version=_table.c.version + 1))
+
+
+def _after_rollback(session):
+    session.info.pop("written_tables", None)
+
+
+def install_table_version_listeners() -> None:
+    if not event.contains(Session, "before_commit", _before_commit):
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "before_commit", _before_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
@@ -1,3 +1,5 @@
+from fastapi import HTTPException
+
 from app.exceptions.base import MyAppError, MyAppHTTPError
 
 class UserAlreadyExistsError(MyAppError):
@@ -45,6 +47,9 @@ class PasswordsDoNotMatchError(MyAppError):
 class WeakPasswordError(MyAppError):
     detail = "Пароль слишком слабый"
 
+class PasswordHashingBusyError(MyAppError):
+    detail = "Слишком много одновременных входов, повторите попытку позже"
+
 class InvalidTokenHTTPError(MyAppHTTPError):
     status_code = 401
     detail = "Неверный токен доступа"
@@ -111,4 +116,11 @@ class PasswordsDoNotMatchHTTPError(MyAppHTTPError):
 
 class WeakPasswordHTTPError(MyAppHTTPError):
     status_code = 422
-    detail = "Пароль слишком слабый"
\ No newline at end of file
+    detail = "Пароль слишком слабый"
+
+class PasswordHashingBusyHTTPError(MyAppHTTPError):
+    status_code = 503
+    detail = "Слишком много одновременных входов, повторите попытку позже"
+
+    def __init__(self):
+        HTTPException.__init__(self, status_code=self.status_code, detail=self.detail, headers={"Retry-After": "1"})
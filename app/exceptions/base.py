@@ -23,3 +23,11 @@ class ObjectNotFoundError(MyAppError):
 class ObjectAlreadyExistsError(MyAppError):
     detail = "Похожий объект уже существует"
 
+
+
+class NotModifiedHTTPError(MyAppHTTPError):
+    status_code = 304
+    detail = "Не изменено"
+
+    def __init__(self, etag: str):
+        HTTPException.__init__(self, status_code=self.status_code, detail=self.detail, headers={"ETag": etag})
@@ -12,6 +12,12 @@ class FarmApplicationNotFoundError(MyAppError):
 class FarmApplicationAlreadyProcessedError(MyAppError):
     detail = "Заявка уже обработана"
 
+class FarmImageNotFoundError(MyAppError):
+    detail = "У фермы нет изображения"
+
+class FarmNotYoursError(MyAppError):
+    detail = "Это не ваша ферма"
+
 class FarmNotFoundHTTPError(MyAppHTTPError):
     status_code = 404
     detail = "Ферма не найдена"
@@ -26,4 +32,12 @@ class FarmApplicationNotFoundHTTPError(MyAppHTTPError):
 
 class FarmApplicationAlreadyProcessedHTTPError(MyAppHTTPError):
     status_code = 409
-    detail = "Заявка уже обработана"
\ No newline at end of file
+    detail = "Заявка уже обработана"
+
+class FarmImageNotFoundHTTPError(MyAppHTTPError):
+    status_code = 404
+    detail = "У фермы нет изображения"
+
+class FarmNotYoursHTTPError(MyAppHTTPError):
+    status_code = 403
+    detail = "Это не ваша ферма"
@@ -0,0 +1,22 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+class ImageNotFoundError(MyAppError):
+    detail = "Изображение не найдено"
+
+class InvalidImageError(MyAppError):
+    detail = "Файл не является изображением JPEG, PNG, WebP или GIF"
+
+class ImageTooLargeError(MyAppError):
+    detail = "Изображение слишком большое"
+
+class ImageNotFoundHTTPError(MyAppHTTPError):
+    status_code = 404
+    detail = "Изображение не найдено"
+
+class InvalidImageHTTPError(MyAppHTTPError):
+    status_code = 422
+    detail = "Файл не является изображением JPEG, PNG, WebP или GIF"
+
+class ImageTooLargeHTTPError(MyAppHTTPError):
+    status_code = 413
+    detail = "Изображение слишком большое"
@@ -0,0 +1,8 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+class InvalidCursorError(MyAppError):
+    detail = "Некорректный курсор пагинации"
+
+class InvalidCursorHTTPError(MyAppHTTPError):
+    status_code = 422
+    detail = "Некорректный курсор пагинации"
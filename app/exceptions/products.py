@@ -9,6 +9,12 @@ class ProductNotInStockError(MyAppError):
 class ProductNotYoursError(MyAppError):
     detail = "Это не ваш товар"
 
+class ProductImageNotFoundError(MyAppError):
+    detail = "У товара нет изображения"
+
+class ProductImportFileError(MyAppError):
+    detail = "Файл должен быть в формате CSV (UTF-8) с колонками name, price, quantity и category или category_id"
+
 class ProductNotFoundHTTPError(MyAppHTTPError):
     status_code = 404
     detail = "Товар не найден"
@@ -19,4 +25,12 @@ class ProductNotInStockHTTPError(MyAppHTTPError):
 
 class ProductNotYoursHTTPError(MyAppHTTPError):
     status_code = 403
-    detail = "Это не ваш товар"
\ No newline at end of file
+    detail = "Это не ваш товар"
+
+class ProductImageNotFoundHTTPError(MyAppHTTPError):
+    status_code = 404
+    detail = "У товара нет изображения"
+
+class ProductImportFileHTTPError(MyAppHTTPError):
+    status_code = 422
+    detail = "Файл должен быть в формате CSV (UTF-8) с колонками name, price, quantity и category или category_id"
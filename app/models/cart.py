@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import ForeignKey, Float, func
+from sqlalchemy import ForeignKey, Float, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 from datetime import datetime
@@ -10,10 +10,13 @@ if TYPE_CHECKING:
 
 class Cart(Base):
     __tablename__ = "cart"
+    __table_args__ = (
+        Index("ix_cart_user_id_product_id", "user_id", "product_id", unique=True),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False, index=True)
     quantity: Mapped[float] = mapped_column(Float, nullable=False)
     created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=True)
     updated_at: Mapped[datetime] = mapped_column(default=func.now(), onupdate=func.now(), nullable=True)
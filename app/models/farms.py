@@ -2,6 +2,7 @@ from typing import Optional, TYPE_CHECKING
 from sqlalchemy import String, ForeignKey, Text, Float
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
+from app.models.mixins import RatingAggregatesMixin
 
 if TYPE_CHECKING:
     from .users import User
@@ -9,7 +10,7 @@ if TYPE_CHECKING:
     from .orders import Order
     from .reviews import Review
 
-class Farm(Base):
+class Farm(RatingAggregatesMixin, Base):
     __tablename__ = "farms"
     
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -19,9 +20,9 @@ class Farm(Base):
     address: Mapped[str] = mapped_column(String(500), nullable=False)
     contact_email: Mapped[Optional[str]] = mapped_column(String(255))
     contact_phone: Mapped[Optional[str]] = mapped_column(String(20))
-    image: Mapped[Optional[bytes]] = mapped_column()
+    image_key: Mapped[Optional[str]] = mapped_column(String(80))
     rating_avg: Mapped[float] = mapped_column(Float, default=0.0)
-    status: Mapped[str] = mapped_column(String(20), default="active")
+    status: Mapped[str] = mapped_column(String(20), default="active", index=True)
     
     user: Mapped["User"] = relationship(back_populates="farm")
     products: Mapped[list["Product"]] = relationship(back_populates="farm")
@@ -0,0 +1,21 @@
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class RatingAggregatesMixin:
+    """Агрегаты отзывов: сумма, количество и гистограмма оценок 1-5.
+
+    Поддерживаются инкрементально в ReviewService, пересчитываются целиком задачей администратора.
+    """
+
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    @property
+    def rating_histogram(self) -> list[int]:
+        return [self.rating_1, self.rating_2, self.rating_3, self.rating_4, self.rating_5]
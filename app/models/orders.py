@@ -13,9 +13,9 @@ class Order(Base):
     __tablename__ = "orders"
     
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    farm_id: Mapped[int] = mapped_column(ForeignKey("farms.id"), nullable=False)
-    status: Mapped[str] = mapped_column(String(50), nullable=False, default="pending")
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    farm_id: Mapped[int] = mapped_column(ForeignKey("farms.id"), nullable=False, index=True)
+    status: Mapped[str] = mapped_column(String(50), nullable=False, default="pending", index=True)
     order_date: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     delivery_address: Mapped[str] = mapped_column(String(500), nullable=False)
     total_amount: Mapped[float] = mapped_column(Float, nullable=False)
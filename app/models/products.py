@@ -1,7 +1,8 @@
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import ForeignKey, String, Text, Float, Boolean, LargeBinary
+from sqlalchemy import DDL, ForeignKey, Index, String, Text, Float, Boolean, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
+from app.models.mixins import RatingAggregatesMixin
 
 if TYPE_CHECKING:
     from .categories import Category
@@ -10,22 +11,46 @@ if TYPE_CHECKING:
     from .order_items import OrderItem
     from .reviews import Review
 
-class Product(Base):
+class Product(RatingAggregatesMixin, Base):
     __tablename__ = "products"
+    # Индексы под фильтры и сортировки каталога (GET /products)
+    __table_args__ = (
+        Index("ix_products_price", "price"),
+        Index("ix_products_name", "name"),
+        Index("ix_products_rating_avg", "rating_avg"),
+        Index("ix_products_category_id_price", "category_id", "price"),
+        Index("ix_products_farm_id_price", "farm_id", "price"),
+        Index("ix_products_in_stock_price", "in_stock", "price"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
-    farm_id: Mapped[int] = mapped_column(ForeignKey("farms.id"), nullable=False)
-    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False)
+    farm_id: Mapped[int] = mapped_column(ForeignKey("farms.id"), nullable=False, index=True)
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     unit: Mapped[str] = mapped_column(String(50), nullable=False, default='шт')
     price: Mapped[float] = mapped_column(Float, nullable=False)
     quantity: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     in_stock: Mapped[bool] = mapped_column(Boolean, default=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
-    image: Mapped[Optional[bytes]] = mapped_column(LargeBinary)
+    rating_avg: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    # Ключ файла в хранилище изображений (app.utils.images), сами байты в строке не хранятся
+    image_key: Mapped[Optional[str]] = mapped_column(String(80))
     
     category: Mapped["Category"] = relationship(back_populates="products")
     farm: Mapped["Farm"] = relationship(back_populates="products")
     cart_items: Mapped[list["Cart"]] = relationship(back_populates="product")
     order_items: Mapped[list["OrderItem"]] = relationship(back_populates="product")
-    reviews: Mapped[list["Review"]] = relationship(back_populates="product")
\ No newline at end of file
+    reviews: Mapped[list["Review"]] = relationship(back_populates="product")
+
+# Полнотекстовый поиск. SQLite: FTS5 со стеммированным текстом, rowid = products.id,
+# таблицу заполняет ProductRepository.index_for_search. PostgreSQL: GIN-индекс по tsvector (конфигурация russian)
+PRODUCTS_FTS_DDL = "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(name, description, prefix='2 3 4 5 6')"
+PRODUCTS_TSVECTOR = (
+    "setweight(to_tsvector('russian', name), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+)
+PRODUCTS_TSVECTOR_INDEX_DDL = f"CREATE INDEX IF NOT EXISTS ix_products_search ON products USING gin (({PRODUCTS_TSVECTOR}))"
+
+event.listen(Product.__table__, "after_create", DDL(PRODUCTS_FTS_DDL).execute_if(dialect="sqlite"))
+event.listen(Product.__table__, "before_drop", DDL("DROP TABLE IF EXISTS products_fts").execute_if(dialect="sqlite"))
+event.listen(Product.__table__, "after_create", DDL(PRODUCTS_TSVECTOR_INDEX_DDL).execute_if(dialect="postgresql"))
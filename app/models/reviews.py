@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import TIMESTAMP, ForeignKey, Integer, Text
+from sqlalchemy import TIMESTAMP, ForeignKey, Index, Integer, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
@@ -11,11 +11,15 @@ if TYPE_CHECKING:
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_user_id_product_id", "user_id", "product_id"),
+        Index("ix_reviews_user_id_farm_id", "user_id", "farm_id"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    farm_id: Mapped[Optional[int]] = mapped_column(ForeignKey("farms.id"))
-    product_id: Mapped[Optional[int]] = mapped_column(ForeignKey("products.id"))
+    farm_id: Mapped[Optional[int]] = mapped_column(ForeignKey("farms.id"), index=True)
+    product_id: Mapped[Optional[int]] = mapped_column(ForeignKey("products.id"), index=True)
     rating: Mapped[int] = mapped_column(Integer, nullable=False)
     comment: Mapped[Optional[str]] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP, default=datetime.utcnow)
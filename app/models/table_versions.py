@@ -0,0 +1,23 @@
+from sqlalchemy import Integer, String, event, insert
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+# Таблицы, списки которых отдаются с ETag (conditional_get). Остальные таблицы версий не имеют:
+# общая строка версии сериализовала бы все конкурентные записи в корзину, заказы и т. п.
+VERSIONED_TABLES = ("products", "farms", "categories", "reviews", "subscription_plans")
+
+
+class TableVersion(Base):
+    """Версия таблицы для ETag: растет в той же транзакции, что и запись в таблицу"""
+    __tablename__ = "table_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+
+def _seed_table_versions(target, connection, **kw):
+    # create_all (тесты, новая БД): строки версий заводятся сразу, при записи их остается только обновить
+    connection.execute(insert(target), [{"name": name, "version": 0} for name in VERSIONED_TABLES])
+
+
+event.listen(TableVersion.__table__, "after_create", _seed_table_versions)
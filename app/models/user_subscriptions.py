@@ -15,7 +15,7 @@ class UserSubscription(Base):
     subscription_plan_id: Mapped[int] = mapped_column(ForeignKey("subscription_plans.id"), nullable=False)
     start_date: Mapped[Date] = mapped_column(Date, nullable=False)
     next_delivery_date: Mapped[Date] = mapped_column(Date, nullable=False)
-    status: Mapped[str] = mapped_column(String(50), nullable=False, default="active")
+    status: Mapped[str] = mapped_column(String(50), nullable=False, default="active", index=True)
     
     user: Mapped["User"] = relationship(back_populates="subscriptions")
     plan: Mapped["SubscriptionPlan"] = relationship(back_populates="user_subscriptions")
\ No newline at end of file
@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 
 class User(Base):
     __tablename__ = "users"
+    # id удаленного пользователя не должен достаться новому: токены опознают пользователя по user_id и ver
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id: Mapped[int] = mapped_column(primary_key=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
@@ -22,6 +24,8 @@ class User(Base):
     phone: Mapped[Optional[str]] = mapped_column(String(20))
     address: Mapped[Optional[str]] = mapped_column(String(500))
     card: Mapped[Optional[int]] = mapped_column(Integer)
+    # Растет при смене роли: токены с прежним claim ver перестают приниматься
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     
     role: Mapped["Role"] = relationship(back_populates="users")
     farm: Mapped[Optional["Farm"]] = relationship(back_populates="user")
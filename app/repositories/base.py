@@ -1,8 +1,11 @@
-from typing import Type, TypeVar, Generic, List, Optional, Dict, Any
+from typing import Type, TypeVar, Generic, List, Optional, Dict, Any, Tuple, Sequence, AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, insert, update, delete, tuple_
 from pydantic import BaseModel
 
+from app.exceptions.pagination import InvalidCursorError
+from app.utils.pagination import encode_cursor, decode_cursor
+
 ModelType = TypeVar("ModelType")
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
 
@@ -15,10 +18,29 @@ class BaseRepository(Generic[ModelType, SchemaType]):
     async def create(self, data: Dict[str, Any]) -> ModelType:
         instance = self.model(**data)
         self.session.add(instance)
-        await self.session.commit()
+        await self.session.flush()
         await self.session.refresh(instance)
         return instance
     
+    async def create_many(self, data: List[Dict[str, Any]]) -> set[int]:
+        """Пакетная вставка одним INSERT (insertmanyvalues), возвращает множество id вставленных строк.
+        
+        Порядок id не сопоставлен с порядком data: sort_by_parameter_order на SQLite без колонки-sentinel
+        превращает пакет в INSERT на каждую строку (20 000 строк - 20 000 запросов вместо 20).
+        Кому нужны сами строки, перечитывает их через get_by_ids.
+        """
+        if not data:
+            return set()
+        if self.session.get_bind().dialect.insert_executemany_returning:
+            query = insert(self.model).returning(self.model.id)
+            result = await self.session.execute(query, data)
+            return set(result.scalars().all())
+        
+        instances = [self.model(**item) for item in data]
+        self.session.add_all(instances)
+        await self.session.flush()
+        return {instance.id for instance in instances}
+    
     async def get_one(self, **filter_by) -> Optional[ModelType]:
         query = select(self.model).filter_by(**filter_by)
         result = await self.session.execute(query)
@@ -36,27 +58,123 @@ class BaseRepository(Generic[ModelType, SchemaType]):
             raise ObjectNotFoundError()
         return obj
     
-    async def get_all(self, **filter_by) -> List[ModelType]:
+    async def get_existing_ids(self, ids: Sequence[int]) -> set[int]:
+        """Какие из ids есть в таблице: одна проверка на пачку вместо get_one на каждый id"""
+        if not ids:
+            return set()
+        result = await self.session.execute(select(self.model.id).where(self.model.id.in_(set(ids))))
+        return set(result.scalars().all())
+    
+    async def get_by_ids(self, ids: Sequence[int]) -> List[ModelType]:
+        query = select(self.model).where(self.model.id.in_(ids)).order_by(self.model.id)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+    
+    async def get_all(self, offset: Optional[int] = None, limit: Optional[int] = None, **filter_by) -> List[ModelType]:
         query = select(self.model).filter_by(**filter_by)
+        if offset is not None or limit is not None:
+            query = query.order_by(self.model.id).offset(offset).limit(limit)
         result = await self.session.execute(query)
         return result.scalars().all()
     
-    async def update(self, id: int, data: Dict[str, Any]) -> ModelType:
+    async def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        conditions: Sequence[Any] = (),
+        sort_column: Any = None,
+        descending: bool = False,
+        **filter_by,
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Keyset-пагинация по (sort_column, id) или только по id: возвращает страницу и курсор следующей"""
+        keys = [self.model.id] if sort_column is None else [sort_column, self.model.id]
+        query = (
+            select(self.model)
+            .where(*conditions)
+            .filter_by(**filter_by)
+            .order_by(*(key.desc() if descending else key for key in keys))
+        )
+        key = decode_cursor(cursor)
+        if key is not None:
+            if len(key) != len(keys) or type(key[-1]) is not int:
+                raise InvalidCursorError
+            position, last = (keys[0], key[0]) if len(keys) == 1 else (tuple_(*keys), tuple_(*key))
+            query = query.where(position < last if descending else position > last)
+        result = await self.session.execute(query.limit(limit + 1))
+        items = list(result.scalars().all())
+        
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor([getattr(items[-1], column.key) for column in keys])
+        return items, next_cursor
+    
+    async def stream_batches(self, batch_size: int = 1000, options: Sequence[Any] = (), **filter_by) -> AsyncIterator[List[ModelType]]:
+        """Серверный курсор (stream_scalars + yield_per): в памяти только текущая пачка строк"""
+        query = (
+            select(self.model)
+            .filter_by(**filter_by)
+            .options(*options)
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream_scalars(query)
+        async for batch in result.partitions():
+            yield batch
+    
+    async def update(self, id: int, data: Dict[str, Any], **filter_by) -> Optional[ModelType]:
+        """UPDATE ... RETURNING за один запрос; None, если строка не найдена (с учётом filter_by)"""
+        if not data:
+            return await self.get_one(id=id, **filter_by)
+        
         query = (
             update(self.model)
             .where(self.model.id == id)
+            .filter_by(**filter_by)
             .values(**data)
         )
-        await self.session.execute(query)
-        await self.session.commit()
+        if self.session.get_bind().dialect.update_returning:
+            query = query.returning(self.model).execution_options(populate_existing=True)
+            result = await self.session.execute(query)
+            return result.scalars().one_or_none()
         
-        updated_obj = await self.get_one(id=id)
-        return updated_obj
+        # MySQL не поддерживает RETURNING: перечитываем строку отдельным запросом
+        await self.session.execute(query)
+        return await self.get_one(id=id, **filter_by)
+    
+    async def update_many(self, data: Dict[str, Any], ids: Optional[Sequence[int]] = None, **filter_by) -> List[int]:
+        """Set-based UPDATE ... WHERE, возвращает id изменённых строк"""
+        query = update(self.model).filter_by(**filter_by).values(**data)
+        if ids is not None:
+            query = query.where(self.model.id.in_(ids))
+        returning = self.session.get_bind().dialect.update_returning
+        return await self._execute_returning_ids(query, returning, ids, filter_by)
     
     async def delete(self, id: int) -> None:
         query = delete(self.model).where(self.model.id == id)
         await self.session.execute(query)
-        await self.session.commit()
+    
+    async def delete_where(self, ids: Optional[Sequence[int]] = None, **filter_by) -> List[int]:
+        """Set-based DELETE ... WHERE, возвращает id удалённых строк"""
+        query = delete(self.model).filter_by(**filter_by)
+        if ids is not None:
+            query = query.where(self.model.id.in_(ids))
+        returning = self.session.get_bind().dialect.delete_returning
+        return await self._execute_returning_ids(query, returning, ids, filter_by)
+    
+    async def _execute_returning_ids(self, query, returning: bool, ids: Optional[Sequence[int]], filter_by: Dict[str, Any]) -> List[int]:
+        if returning:
+            result = await self.session.execute(query.returning(self.model.id))
+            return list(result.scalars().all())
+        
+        # MySQL не поддерживает RETURNING: сначала выбираем id, затем выполняем запрос
+        id_query = select(self.model.id).filter_by(**filter_by)
+        if ids is not None:
+            id_query = id_query.where(self.model.id.in_(ids))
+        affected = list((await self.session.execute(id_query.with_for_update())).scalars().all())
+        if affected:
+            await self.session.execute(query)
+        return affected
 
 
     async def create_one(self, data: dict) -> ModelType:
@@ -1,7 +1,9 @@
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import select, insert, literal, func
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.orm import selectinload
 from app.models.cart import Cart
+from app.models.products import Product
 from app.schemes.cart import SCartItemGet
 from .base import BaseRepository
 
@@ -18,12 +20,42 @@ class CartRepository(BaseRepository[Cart, SCartItemGet]):
     async def get_user_cart_item(self, user_id: int, product_id: int) -> Optional[Cart]:
         return await self.get_one(user_id=user_id, product_id=product_id)
     
+    async def add_quantity(self, user_id: int, product_id: int, quantity: float) -> bool:
+        """Атомарный upsert одной командой: INSERT ... SELECT ... ON CONFLICT DO UPDATE.
+        
+        Строка вставляется, только если товар существует; возвращает False, если товара нет.
+        """
+        source = select(
+            literal(user_id), Product.id, literal(quantity), func.now(), func.now()
+        ).where(Product.id == product_id)
+        columns = ["user_id", "product_id", "quantity", "created_at", "updated_at"]
+        
+        dialect = self.session.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            query = dialect_insert(self.model).from_select(columns, source)
+            query = query.on_conflict_do_update(
+                index_elements=["user_id", "product_id"],
+                set_={"quantity": self.model.quantity + query.excluded.quantity, "updated_at": func.now()},
+            )
+        elif dialect == "mysql":
+            query = mysql.insert(self.model).from_select(columns, source)
+            query = query.on_duplicate_key_update(
+                quantity=self.model.quantity + query.inserted.quantity, updated_at=func.now()
+            )
+        else:
+            existing = await self.get_user_cart_item(user_id, product_id)
+            if existing:
+                await self.update(existing.id, {"quantity": existing.quantity + quantity})
+                return True
+            query = insert(self.model).from_select(columns, source)
+        
+        result = await self.session.execute(query)
+        return result.rowcount > 0
+    
     async def clear_user_cart(self, user_id: int) -> int:
-        cart_items = await self.get_by_user_id(user_id)
-        count = len(cart_items)
-        for item in cart_items:
-            await self.delete(item.id)
-        return count
+        deleted_ids = await self.delete_where(user_id=user_id)
+        return len(deleted_ids)
     
     async def get_cart_with_products(self, user_id: int) -> List[Cart]:
         query = (
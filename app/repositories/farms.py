@@ -4,8 +4,11 @@ from sqlalchemy.orm import selectinload
 from app.models.farms import Farm
 from app.schemes.farms import SFarmGet
 from .base import BaseRepository
+from .ratings import RatingAggregatesRepositoryMixin
 
-class FarmRepository(BaseRepository[Farm, SFarmGet]):
+class FarmRepository(RatingAggregatesRepositoryMixin, BaseRepository[Farm, SFarmGet]):
+    rating_review_key = "farm_id"
+    
     def __init__(self, session):
         super().__init__(session, Farm, SFarmGet)
     
@@ -1,7 +1,10 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import AsyncIterator, List, Optional
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.orders import Order
+from app.models.order_items import OrderItem
 from app.schemes.orders import SOrderGet
 from .base import BaseRepository
 
@@ -29,4 +32,15 @@ class OrderRepository(BaseRepository[Order, SOrderGet]):
             )
         )
         result = await self.session.execute(query)
-        return result.scalars().one_or_none()
\ No newline at end of file
+        return result.scalars().one_or_none()
+    
+    async def stream_batches_with_items(self, batch_size: int = 1000) -> AsyncIterator[List[Order]]:
+        # selectinload несовместим с yield_per, поэтому позиции догружаются одним IN-запросом на пачку
+        async for orders in self.stream_batches(batch_size):
+            query = select(OrderItem).where(OrderItem.order_id.in_([order.id for order in orders])).order_by(OrderItem.id)
+            items_by_order = defaultdict(list)
+            for item in (await self.session.execute(query)).scalars():
+                items_by_order[item.order_id].append(item)
+            for order in orders:
+                set_committed_value(order, "items", items_by_order[order.id])
+            yield orders
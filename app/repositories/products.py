@@ -1,14 +1,54 @@
-from typing import List, Optional
-from sqlalchemy import select
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import Float, Integer, or_, select, text, func, literal_column
 from sqlalchemy.orm import selectinload
-from app.models.products import Product
+from app.models.products import Product, PRODUCTS_TSVECTOR
 from app.schemes.products import SProductGet
+from app.utils.search import to_match_query, to_search_text, to_tsquery_text, tokenize
 from .base import BaseRepository
+from .ratings import RatingAggregatesRepositoryMixin
 
-class ProductRepository(BaseRepository[Product, SProductGet]):
+class ProductRepository(RatingAggregatesRepositoryMixin, BaseRepository[Product, SProductGet]):
+    rating_review_key = "product_id"
+    
+    # sort -> (колонка, по убыванию); id добавляется вторым ключом в get_page
+    sort_columns = {
+        "price": (Product.price, False),
+        "name": (Product.name, False),
+        "newest": (None, True),
+        "rating": (Product.rating_avg, True),
+    }
+    # Сколько самых новых совпадений FTS5 ранжируется по bm25 (только SQLite). Ограничивает время поиска
+    # по частым словам: на 100 тыс. совпадений bm25 по всем занимает ~160 мс против ~7 мс с ограничением
+    search_candidates = 2000
+    
     def __init__(self, session):
         super().__init__(session, Product, SProductGet)
     
+    async def get_filtered_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        **filter_by,
+    ) -> Tuple[List[Product], Optional[str]]:
+        """Страница каталога с фильтрами и сортировкой на стороне БД"""
+        conditions = []
+        if min_price is not None:
+            conditions.append(self.model.price >= min_price)
+        if max_price is not None:
+            conditions.append(self.model.price <= max_price)
+        sort_column, descending = self.sort_columns.get(sort, (None, False))
+        return await self.get_page(
+            limit=limit,
+            cursor=cursor,
+            conditions=conditions,
+            sort_column=sort_column,
+            descending=descending,
+            **filter_by,
+        )
+    
     async def get_products_with_relations(self) -> List[Product]:
         query = (
             select(self.model)
@@ -45,4 +85,74 @@ class ProductRepository(BaseRepository[Product, SProductGet]):
         return await self.get_all(category_id=category_id)
     
     async def get_in_stock_products(self) -> List[Product]:
-        return await self.get_all(in_stock=True)
\ No newline at end of file
+        return await self.get_all(in_stock=True)
+    
+    async def search(self, query: str, limit: int) -> List[Product]:
+        """Полнотекстовый поиск по name и description, лучшие совпадения первыми.
+        
+        В SQLite ранжируются только search_candidates самых новых совпадений: если слово встречается
+        чаще, более старые товары не попадают в выдачу, даже если совпадают лучше.
+        """
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "sqlite":
+            match = to_match_query(query)
+            if match is None:
+                return []
+            # Совпадение в названии весит в 10 раз больше, чем в описании
+            ranked = (
+                text(
+                    "SELECT id, rank FROM ("
+                    "SELECT rowid AS id, bm25(products_fts, 10.0, 1.0) AS rank FROM products_fts "
+                    "WHERE products_fts MATCH :match ORDER BY rowid DESC LIMIT :candidates"
+                    ") ORDER BY rank LIMIT :limit"
+                )
+                .bindparams(match=match, candidates=self.search_candidates, limit=limit)
+                .columns(id=Integer, rank=Float)
+                .subquery("ranked")
+            )
+            stmt = select(self.model).join(ranked, self.model.id == ranked.c.id).order_by(ranked.c.rank)
+        elif dialect == "postgresql":
+            tsquery_text = to_tsquery_text(query)
+            if tsquery_text is None:
+                return []
+            # Стемминг делает сам PostgreSQL; выражение совпадает с индексом ix_products_search
+            tsquery = func.to_tsquery(literal_column("'russian'"), tsquery_text)
+            document = literal_column(f"({PRODUCTS_TSVECTOR})")
+            stmt = (
+                select(self.model)
+                .where(document.op("@@")(tsquery))
+                .order_by(func.ts_rank_cd(document, tsquery).desc())
+                .limit(limit)
+            )
+        else:
+            words = tokenize(query)
+            if not words:
+                return []
+            stmt = (
+                select(self.model)
+                .where(*(or_(self.model.name.ilike(f"%{word}%"), self.model.description.ilike(f"%{word}%")) for word in words))
+                .order_by(self.model.id)
+                .limit(limit)
+            )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+    
+    async def index_for_search(self, products: Sequence[Product]) -> None:
+        """Обновляет FTS5-индекс SQLite; в PostgreSQL GIN-индекс по tsvector поддерживается самой БД"""
+        if not products or self.session.get_bind().dialect.name != "sqlite":
+            return
+        await self.remove_from_search([product.id for product in products])
+        await self.session.execute(
+            text("INSERT INTO products_fts (rowid, name, description) VALUES (:id, :name, :description)"),
+            [
+                {"id": product.id, "name": to_search_text(product.name), "description": to_search_text(product.description)}
+                for product in products
+            ],
+        )
+    
+    async def remove_from_search(self, product_ids: Sequence[int]) -> None:
+        if not product_ids or self.session.get_bind().dialect.name != "sqlite":
+            return
+        await self.session.execute(
+            text("DELETE FROM products_fts WHERE rowid = :id"), [{"id": product_id} for product_id in product_ids]
+        )
@@ -0,0 +1,64 @@
+from typing import Optional
+
+from sqlalchemy import Float, case, cast, func, select, update
+
+from app.models.reviews import Review
+
+RATING_VALUES = range(1, 6)
+
+
+class RatingAggregatesRepositoryMixin:
+    """Обновление агрегатов RatingAggregatesMixin; rating_review_key - колонка reviews, ссылающаяся на модель"""
+
+    rating_review_key: str
+
+    async def apply_rating_change(self, id: int, added: Optional[int] = None, removed: Optional[int] = None) -> None:
+        """Атомарно учитывает добавленную и/или удаленную оценку одним UPDATE col = col + delta"""
+        model = self.model
+        count_delta = (added is not None) - (removed is not None)
+        sum_delta = (added or 0) - (removed or 0)
+        values = {
+            "rating_count": model.rating_count + count_delta,
+            "rating_sum": model.rating_sum + sum_delta,
+        }
+        for rating, delta in ((added, 1), (removed, -1)):
+            if rating is not None:
+                column = f"rating_{rating}"
+                values[column] = values.get(column, getattr(model, column)) + delta
+        # Правая часть UPDATE видит старые значения строки, поэтому среднее считаем от них и дельт
+        values["rating_avg"] = case(
+            (values["rating_count"] > 0, cast(values["rating_sum"], Float) / values["rating_count"]),
+            else_=0.0,
+        )
+        query = update(model).where(model.id == id).values(values).execution_options(synchronize_session=False)
+        await self.session.execute(query)
+
+    async def rebuild_rating_aggregates(self) -> int:
+        """Пересчитывает агрегаты всех строк из reviews за один GROUP BY; возвращает число строк с отзывами"""
+        model = self.model
+        review_key = getattr(Review, self.rating_review_key)
+        stats = (
+            select(
+                review_key.label("target_id"),
+                func.count().label("rating_count"),
+                func.sum(Review.rating).label("rating_sum"),
+                *(func.sum(case((Review.rating == rating, 1), else_=0)).label(f"rating_{rating}") for rating in RATING_VALUES),
+            )
+            .where(review_key.is_not(None))
+            .group_by(review_key)
+            .subquery()
+        )
+        columns = ["rating_count", "rating_sum", *(f"rating_{rating}" for rating in RATING_VALUES)]
+        
+        reset = update(model).values({column: 0 for column in columns} | {"rating_avg": 0.0})
+        await self.session.execute(reset.execution_options(synchronize_session=False))
+        fill = (
+            update(model)
+            .where(model.id == stats.c.target_id)
+            .values(
+                {column: stats.c[column] for column in columns}
+                | {"rating_avg": cast(stats.c.rating_sum, Float) / stats.c.rating_count}
+            )
+        )
+        result = await self.session.execute(fill.execution_options(synchronize_session=False))
+        return result.rowcount
@@ -26,17 +26,18 @@ class UsersRepository(BaseRepository[User, SUserGet]):
         return await self.get_one(id=user_id)
     
     async def update_user(self, user_id: int, update_data: dict) -> User:
-        from app.exceptions.users import UserNotFoundError
-        user = await self.get_one_or_raise(id=user_id)
-        
-        for key, value in update_data.items():
-            if hasattr(user, key) and value is not None:
-                setattr(user, key, value)
-        
-        await self.session.commit()
-        await self.session.refresh(user)
+        data = {key: value for key, value in update_data.items() if hasattr(self.model, key) and value is not None}
+        user = await self.update(user_id, data)
+        if user is None:
+            from app.exceptions.base import ObjectNotFoundError
+            raise ObjectNotFoundError()
         return user
     
+    async def get_token_version(self, user_id: int) -> Optional[int]:
+        query = select(self.model.token_version).where(self.model.id == user_id)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+    
     async def get_one_with_role(self, **filter_by) -> Optional[User]:
         query = (
             select(self.model)
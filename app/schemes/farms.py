@@ -17,6 +17,9 @@ class SFarmGet(BaseModel):
     contact_email: Optional[str] = None
     contact_phone: Optional[str] = None
     rating_avg: float = 0.0
+    rating_count: int = 0
+    rating_histogram: list[int] = Field(default_factory=lambda: [0] * 5)
+    image_key: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from typing import Optional, List
 
+from .order_items import SOrderItemGet
+
 class SOrderItemCreate(BaseModel):
     product_id: int
     quantity: float = Field(..., gt=0)
@@ -37,4 +39,7 @@ class SOrderGet(BaseModel):
     payment_status: str
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SOrderWithItemsGet(SOrderGet):
+    items: List[SOrderItemGet] = []
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 
 class SProductAdd(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
@@ -37,6 +37,28 @@ class SProductGet(BaseModel):
     description: Optional[str] = None
     price: float
     quantity: float
+    in_stock: bool = False
+    rating_avg: float = 0.0
+    rating_count: int = 0
+    rating_histogram: list[int] = Field(default_factory=lambda: [0] * 5)
+    image_key: Optional[str] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SProductFilter(BaseModel):
+    category_id: Optional[int] = None
+    farm_id: Optional[int] = None
+    in_stock: Optional[bool] = None
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+    sort: Optional[Literal["price", "name", "newest", "rating"]] = None
+
+class SProductImportError(BaseModel):
+    row: int
+    field: Optional[str] = None
+    message: str
+
+class SProductImportReport(BaseModel):
+    created: int = 0
+    errors: list[SProductImportError] = Field(default_factory=list)
@@ -8,6 +8,10 @@ class SReviewAdd(BaseModel):
     rating: int = Field(..., ge=1, le=5)
     comment: Optional[str] = Field(None, max_length=2000)
 
+class SReviewFilter(BaseModel):
+    farm_id: Optional[int] = None
+    product_id: Optional[int] = None
+
 class SReviewGet(BaseModel):
     id: int
     user_id: int
@@ -17,6 +17,13 @@ class UserAuth(BaseModel):
     email: EmailStr
     password: str
 
+class STokenClaims(BaseModel):
+    """Пользователь запроса по claims токена - без обращения к таблице users"""
+    id: int = Field(validation_alias="user_id")
+    email: str = Field(validation_alias="sub")
+    role: str
+    ver: int
+
 class UserProfile(BaseModel):
     id: int
     email: EmailStr
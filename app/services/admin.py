@@ -1,4 +1,5 @@
 from sqlalchemy import select, func
+from app.config import settings
 from app.database.db_manager import DBManager
 from app.models.users import User
 from app.models.roles import Role
@@ -7,6 +8,13 @@ from app.models.products import Product
 from app.models.orders import Order
 from app.models.reviews import Review
 from app.models.categories import Category
+from app.exceptions.reviews import ReviewNotFoundError
+from app.services.reviews import ReviewService
+from app.utils.cache import TTLCache, reference_cache
+from app.utils.token_versions import token_versions
+
+
+_dashboard_stats_cache = TTLCache(settings.DASHBOARD_STATS_TTL)
 
 
 class AdminService:
@@ -14,47 +22,25 @@ class AdminService:
         self.db = db
 
     async def get_dashboard_stats(self) -> dict:
-        """Получить основные статистики для админ-панели"""
-        try:
-            # Количество всех пользователей
-            total_users = await self.db.execute(
-                select(func.count(User.id))
-            )
-            total_users = total_users.scalar()
-
-            # Количество ферм
-            total_farms = await self.db.execute(
-                select(func.count(Farm.id))
-            )
-            total_farms = total_farms.scalar()
-
-            # Количество продуктов
-            total_products = await self.db.execute(
-                select(func.count(Product.id))
-            )
-            total_products = total_products.scalar()
-
-            # Количество заказов
-            total_orders = await self.db.execute(
-                select(func.count(Order.id))
-            )
-            total_orders = total_orders.scalar()
-
-            # Количество отзывов
-            total_reviews = await self.db.execute(
-                select(func.count(Review.id))
-            )
-            total_reviews = total_reviews.scalar()
-
-            return {
-                "total_users": total_users or 0,
-                "total_farms": total_farms or 0,
-                "total_products": total_products or 0,
-                "total_orders": total_orders or 0,
-                "total_reviews": total_reviews or 0,
-            }
-        except Exception as e:
-            raise Exception(f"Ошибка получения статистики: {str(e)}")
+        """Получить основные статистики для админ-панели (снимок обновляется раз в DASHBOARD_STATS_TTL секунд)"""
+        return await _dashboard_stats_cache.get_or_load(self._load_dashboard_stats)
+
+    async def _load_dashboard_stats(self) -> dict:
+        """Все счетчики одним запросом из скалярных подзапросов"""
+        query = select(
+            select(func.count()).select_from(User).scalar_subquery().label("total_users"),
+            select(func.count()).select_from(Farm).scalar_subquery().label("total_farms"),
+            select(func.count()).select_from(Product).scalar_subquery().label("total_products"),
+            select(func.count()).select_from(Order).scalar_subquery().label("total_orders"),
+            select(func.count()).select_from(Review).scalar_subquery().label("total_reviews"),
+            select(func.count()).select_from(Order).where(Order.status == "pending").scalar_subquery().label("pending_orders"),
+            select(func.coalesce(func.sum(Order.total_amount), 0.0))
+            .where(Order.status != "cancelled")
+            .scalar_subquery()
+            .label("total_revenue"),
+        )
+        row = (await self.db.session.execute(query)).one()
+        return dict(row._mapping)
 
     async def get_all_users(self, page: int = 1, per_page: int = 10) -> tuple[list, int]:
         """Получить всех пользователей с пагинацией"""
@@ -77,17 +63,20 @@ class AdminService:
         if not role:
             raise ValueError(f"Роль '{new_role}' не найдена")
 
-        user.role_id = role.id
+        # Токены со старой ролью в claims перестают приниматься; пользователь входит заново
+        updated = await self.db.users.update(user_id, {"role_id": role.id, "token_version": User.token_version + 1})
+        token_version = updated.token_version
         await self.db.commit()
+        token_versions.set(user_id, token_version)
 
     async def delete_user(self, user_id: int) -> None:
         """Удалить пользователя"""
-        user = await self.db.users.get_one(id=user_id)
-        if not user:
+        deleted = await self.db.users.delete_where(id=user_id)
+        if not deleted:
             raise ValueError(f"Пользователь с ID {user_id} не найден")
         
-        await self.db.delete(user)
         await self.db.commit()
+        token_versions.revoke(user_id)
 
     async def get_all_farms(self, page: int = 1, per_page: int = 10) -> tuple[list, int]:
         """Получить все фермы с пагинацией"""
@@ -101,11 +90,10 @@ class AdminService:
 
     async def delete_farm(self, farm_id: int) -> None:
         """Удалить ферму"""
-        farm = await self.db.farms.get_one(id=farm_id)
-        if not farm:
+        deleted = await self.db.farms.delete_where(id=farm_id)
+        if not deleted:
             raise ValueError(f"Ферма с ID {farm_id} не найдена")
         
-        await self.db.delete(farm)
         await self.db.commit()
 
     async def get_all_products(self, page: int = 1, per_page: int = 10) -> tuple[list, int]:
@@ -120,11 +108,11 @@ class AdminService:
 
     async def delete_product(self, product_id: int) -> None:
         """Удалить продукт"""
-        product = await self.db.products.get_one(id=product_id)
-        if not product:
+        deleted = await self.db.products.delete_where(id=product_id)
+        if not deleted:
             raise ValueError(f"Продукт с ID {product_id} не найден")
         
-        await self.db.delete(product)
+        await self.db.products.remove_from_search(deleted)
         await self.db.commit()
 
     async def get_all_orders(self, page: int = 1, per_page: int = 10) -> tuple[list, int]:
@@ -149,12 +137,18 @@ class AdminService:
 
     async def delete_review(self, review_id: int) -> None:
         """Удалить отзыв"""
-        review = await self.db.reviews.get_one(id=review_id)
-        if not review:
+        # Через ReviewService, чтобы агрегаты рейтинга фермы и товара остались согласованными
+        try:
+            await ReviewService(self.db).delete_review(review_id)
+        except ReviewNotFoundError:
             raise ValueError(f"Отзыв с ID {review_id} не найден")
-        
-        await self.db.delete(review)
+
+    async def rebuild_rating_aggregates(self) -> dict:
+        """Пересчитать агрегаты рейтинга ферм и товаров из reviews (ремонт после сбоев)"""
+        farms = await self.db.farms.rebuild_rating_aggregates()
+        products = await self.db.products.rebuild_rating_aggregates()
         await self.db.commit()
+        return {"farms": farms, "products": products}
 
     async def get_all_categories(self) -> list:
         """Получить все категории"""
@@ -174,12 +168,13 @@ class AdminService:
         new_category = Category(name=category_name)
         await self.db.add(new_category)
         await self.db.commit()
+        reference_cache.invalidate("categories")
 
     async def delete_category(self, category_id: int) -> None:
         """Удалить категорию"""
-        category = await self.db.categories.get_one(id=category_id)
-        if not category:
+        deleted = await self.db.categories.delete_where(id=category_id)
+        if not deleted:
             raise ValueError(f"Категория с ID {category_id} не найдена")
         
-        await self.db.delete(category)
         await self.db.commit()
+        reference_cache.invalidate("categories")
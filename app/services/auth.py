@@ -1,7 +1,7 @@
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 import jwt
 from typing import Optional
+from pydantic import ValidationError
 
 
 from app.exceptions.auth import (
@@ -10,14 +10,15 @@ from app.exceptions.auth import (
     InvalidPasswordError,
     InvalidJWTTokenError,
     PasswordTooLongError,
-    PasswordTooShortError
+    PasswordTooShortError,
 )
 from app.models.users import User
 from app.repositories.users import UsersRepository
-from app.schemes.users import SUserAddRequest, UserAuth, UserProfile
+from app.schemes.users import SUserAddRequest, UserAuth, UserProfile, STokenClaims
 from app.services.base import BaseService
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services.roles import RoleService
+from app.utils.passwords import password_hasher
+from app.utils.token_versions import token_versions
 
 from app.config import settings
 
@@ -31,6 +32,7 @@ class AuthService(BaseService):
             raise PasswordTooLongError
         if len(user_data.password) < 6:
             raise PasswordTooShortError
+        password_hasher.ensure_capacity()
         
         existing_user_by_email = await self.user_repository.get_by_email(user_data.email)
         if existing_user_by_email:
@@ -40,7 +42,9 @@ class AuthService(BaseService):
         if existing_user_by_username:
             raise UserAlreadyExistsError
         
-        hashed_password = pwd_context.hash(user_data.password)
+        # Соединение возвращается в пул, пока bcrypt считает хеш
+        await self.db.rollback()
+        hashed_password = await password_hasher.hash(user_data.password)
         
         user_to_create = {
             'email': user_data.email,
@@ -51,11 +55,9 @@ class AuthService(BaseService):
         }
         
         try:
-            await self.user_repository.create(user_to_create)
-            await self.user_repository.session.commit()
+            async with self.db.savepoint():
+                await self.user_repository.create(user_to_create)
         except Exception as e:
-            # Откатываем транзакцию в случае ошибки
-            await self.user_repository.session.rollback()
             # Проверяем, является ли ошибка нарушением уникальности
             from sqlalchemy.exc import IntegrityError
             if isinstance(e, IntegrityError) and 'UNIQUE constraint failed' in str(e):
@@ -63,18 +65,30 @@ class AuthService(BaseService):
             else:
                 # Переподнимаем исключение, если это другая ошибка
                 raise
+        await self.db.commit()
     
     async def login_user(self, user_data: UserAuth) -> str:
+        password_hasher.ensure_capacity()
         user = await self.db.users.get_by_email(user_data.email)
         if not user:
             raise UserNotFoundError
         
-        if not pwd_context.verify(user_data.password, user.hashed_password):
+        # Роль и версия токена попадают в claims: зависимости авторизации не читают users на каждый запрос
+        claims = {
+            "sub": user.email,
+            "user_id": user.id,
+            "role": await RoleService(self.db).get_role_name(user.role_id),
+            "ver": user.token_version,
+        }
+        # Соединение возвращается в пул, пока bcrypt проверяет пароль; после rollback атрибуты user истекают
+        hashed_password = user.hashed_password
+        await self.db.rollback()
+        if not await password_hasher.verify(user_data.password, hashed_password):
             raise InvalidPasswordError
         
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = self._create_access_token(
-            data={"sub": user.email, "user_id": user.id},
+            data=claims,
             expires_delta=access_token_expires
         )
         
@@ -102,6 +116,7 @@ class AuthService(BaseService):
         """Обновить данные пользователя"""
         try:
             await self.user_repository.update(user_id, update_data)
+            await self.db.commit()
         except Exception as e:
             raise
 
@@ -128,6 +143,21 @@ class AuthService(BaseService):
             return payload
         except jwt.PyJWTError:
             raise InvalidJWTTokenError
+    
+    @classmethod
+    async def check_token(cls, token: str, version_loader) -> STokenClaims:
+        """Claims токена, если его версия совпадает с текущей версией пользователя.
+        
+        version_loader(user_id) читает версию из БД, когда ее еще нет в таблице token_versions.
+        Токены без role и ver (выданные до их появления) не принимаются.
+        """
+        try:
+            claims = STokenClaims.model_validate(cls.decode_token(token))
+        except ValidationError:
+            raise InvalidJWTTokenError
+        if await token_versions.get(claims.id, version_loader) != claims.ver:
+            raise InvalidJWTTokenError
+        return claims
      
     async def delete_user(self, user_id: int) -> bool:
         try:
@@ -136,7 +166,8 @@ class AuthService(BaseService):
                 return False
             
             await self.user_repository.delete(user_id)
-            await self.user_repository.session.commit()
+            await self.db.commit()
+            token_versions.revoke(user_id)
             return True
             
         except Exception as e:
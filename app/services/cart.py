@@ -1,5 +1,6 @@
 from app.services.base import BaseService
 from app.schemes.cart import SCartItemAdd, SCartItemGet
+from app.utils.serialization import validate_list
 
 class CartService(BaseService):
     def __init__(self, db_manager):
@@ -8,25 +9,19 @@ class CartService(BaseService):
         self.product_repository = db_manager.products
     
     async def get_cart(self, user_id: int) -> list[SCartItemGet]:
+        # Корзину читаем сразу после добавления товаров, отставание реплики здесь недопустимо
+        await self.db.use_primary()
         cart_items = await self.repository.get_by_user_id(user_id)
-        return [SCartItemGet.model_validate(item, from_attributes=True) for item in cart_items]
+        return validate_list(SCartItemGet, cart_items)
     
     async def add_item(self, user_id: int, cart_item: SCartItemAdd):
-        product = await self.product_repository.get_one(id=cart_item.product_id)
-        if not product:
+        added = await self.repository.add_quantity(
+            user_id=user_id, product_id=cart_item.product_id, quantity=cart_item.quantity
+        )
+        if not added:
             from app.exceptions.cart import CartItemNotFoundHTTPError
             raise CartItemNotFoundHTTPError
-        
-        existing = await self.repository.get_user_cart_item(user_id=user_id, product_id=cart_item.product_id)
-        if existing:
-            await self.repository.update(
-                existing.id, 
-                {"quantity": existing.quantity + cart_item.quantity}
-            )
-        else:
-            cart_item_dict = cart_item.model_dump()
-            cart_item_dict["user_id"] = user_id
-            await self.repository.create(cart_item_dict)
+        await self.db.commit()
     
     async def update_item(self, user_id: int, product_id: int, quantity: float):
         cart_item = await self.repository.get_user_cart_item(user_id=user_id, product_id=product_id)
@@ -38,6 +33,7 @@ class CartService(BaseService):
             await self.repository.delete(cart_item.id)
         else:
             await self.repository.update(cart_item.id, {"quantity": quantity})
+        await self.db.commit()
     
     async def delete_item(self, user_id: int, product_id: int):
         cart_item = await self.repository.get_user_cart_item(user_id=user_id, product_id=product_id)
@@ -46,8 +42,8 @@ class CartService(BaseService):
             raise CartItemNotFoundHTTPError
         
         await self.repository.delete(cart_item.id)
+        await self.db.commit()
     
     async def clear_cart(self, user_id: int):
-        cart_items = await self.repository.get_by_user_id(user_id)
-        for item in cart_items:
-            await self.repository.delete(item.id)
\ No newline at end of file
+        await self.repository.clear_user_cart(user_id)
+        await self.db.commit()
\ No newline at end of file
@@ -1,6 +1,11 @@
+from sqlalchemy.exc import IntegrityError
+
 from app.services.base import BaseService
 from app.exceptions.categories import CategoryNotFoundError, CategoryAlreadyExistsError
 from app.schemes.categories import SCategoryAdd, SCategoryGet
+from app.database.table_versions import table_etag
+from app.utils.cache import reference_cache
+from app.utils.serialization import validate_list
 
 class CategoryService(BaseService):
     def __init__(self, db_manager):
@@ -8,8 +13,18 @@ class CategoryService(BaseService):
         self.repository = db_manager.categories
     
     async def get_categories(self) -> list[SCategoryGet]:
+        etag, categories = await reference_cache.get_or_load("categories", "all", self._load_categories)
+        return list(categories)
+    
+    async def get_categories_etag(self) -> str:
+        """ETag списка из того же элемента кэша, что и сам список"""
+        etag, categories = await reference_cache.get_or_load("categories", "all", self._load_categories)
+        return etag
+    
+    async def _load_categories(self) -> tuple[str, list[SCategoryGet]]:
+        etag = await table_etag(self.db.session, "categories")
         categories = await self.repository.get_all()
-        return [SCategoryGet.model_validate(cat, from_attributes=True) for cat in categories]
+        return etag, validate_list(SCategoryGet, categories)
     
     async def create_category(self, category_data: SCategoryAdd):
         existing = await self.repository.get_category_by_name(category_data.name)
@@ -17,19 +32,21 @@ class CategoryService(BaseService):
             raise CategoryAlreadyExistsError
         
         category = await self.repository.create(category_data.model_dump())
+        await self.db.commit()
+        reference_cache.invalidate("categories")
         return SCategoryGet.model_validate(category, from_attributes=True)
     
     async def update_category(self, category_id: int, category_data: SCategoryAdd):
-        category = await self.repository.get_one(id=category_id)
-        if not category:
+        try:
+            updated = await self.repository.update(category_id, category_data.model_dump())
+        except IntegrityError:
+            await self.db.rollback()
+            raise CategoryAlreadyExistsError
+        if not updated:
             raise CategoryNotFoundError
         
-        if category_data.name != category.name:
-            existing = await self.repository.get_category_by_name(category_data.name)
-            if existing:
-                raise CategoryAlreadyExistsError
-        
-        updated = await self.repository.update(category_id, category_data.model_dump())
+        await self.db.commit()
+        reference_cache.invalidate("categories")
         return SCategoryGet.model_validate(updated, from_attributes=True)
     
     async def delete_category(self, category_id: int):
@@ -37,4 +54,6 @@ class CategoryService(BaseService):
         if not category:
             raise CategoryNotFoundError
         
-        await self.repository.delete(category_id)
\ No newline at end of file
+        await self.repository.delete(category_id)
+        await self.db.commit()
+        reference_cache.invalidate("categories")
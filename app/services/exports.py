@@ -0,0 +1,65 @@
+from typing import AsyncIterator, Literal
+
+from app.services.base import BaseService
+from app.schemes.orders import SOrderGet, SOrderWithItemsGet
+from app.schemes.products import SProductGet
+from app.schemes.reviews import SReviewGet
+from app.schemes.users import SUserGet
+from app.utils.exports import csv_chunk, ndjson_chunk
+from app.utils.serialization import list_adapter
+
+ExportEntity = Literal["orders", "users", "reviews", "products"]
+ExportFormat = Literal["csv", "ndjson"]
+
+_ORDER_ITEM_COLUMNS = {"item_id": "id", "product_id": "product_id", "quantity": "quantity", "unit_price": "unit_price"}
+
+
+class ExportService(BaseService):
+    """Потоковая выгрузка для отчетов: строки читаются серверным курсором пачками по batch_size"""
+
+    batch_size = 1000
+
+    async def export(self, entity: ExportEntity, format: ExportFormat) -> AsyncIterator[bytes]:
+        schema, batches = self._source(entity)
+        adapter = list_adapter(schema)
+        columns = self._csv_columns(entity, schema)
+        first = True
+        async for batch in batches:
+            rows = adapter.dump_python(adapter.validate_python(batch, from_attributes=True), mode="json")
+            if format == "ndjson":
+                yield ndjson_chunk(rows)
+            else:
+                if entity == "orders":
+                    rows = self._flatten_orders(rows)
+                yield csv_chunk(rows, columns, header=first)
+            first = False
+        if first and format == "csv":
+            yield csv_chunk((), columns, header=True)
+
+    def _source(self, entity: ExportEntity):
+        if entity == "orders":
+            return SOrderWithItemsGet, self.db.orders.stream_batches_with_items(self.batch_size)
+        repository, schema = {
+            "users": (self.db.users, SUserGet),
+            "reviews": (self.db.reviews, SReviewGet),
+            "products": (self.db.products, SProductGet),
+        }[entity]
+        return schema, repository.stream_batches(self.batch_size)
+
+    @staticmethod
+    def _csv_columns(entity: ExportEntity, schema) -> list[str]:
+        if entity == "orders":
+            return [*SOrderGet.model_fields, *_ORDER_ITEM_COLUMNS]
+        return list(schema.model_fields)
+
+    @staticmethod
+    def _flatten_orders(orders: list[dict]) -> list[dict]:
+        """CSV плоский: строка на каждую позицию заказа, заказ без позиций - одна строка с пустыми полями"""
+        rows = []
+        for order in orders:
+            items = order.pop("items")
+            if not items:
+                rows.append(order)
+            for item in items:
+                rows.append({**order, **{column: item[key] for column, key in _ORDER_ITEM_COLUMNS.items()}})
+        return rows
@@ -1,6 +1,17 @@
+from typing import AsyncIterable
+
 from app.services.base import BaseService
-from app.exceptions.farms import FarmNotFoundError, FarmAlreadyExistsError, FarmApplicationNotFoundError
+from app.services.roles import RoleService
+from app.exceptions.farms import (
+    FarmNotFoundError,
+    FarmAlreadyExistsError,
+    FarmApplicationNotFoundError,
+    FarmImageNotFoundError,
+    FarmNotYoursError,
+)
 from app.schemes.farms import SFarmAdd, SFarmGet, SFarmApplicationResponse
+from app.utils.images import image_store
+from app.utils.serialization import validate_list
 
 class FarmService(BaseService):
     def __init__(self, db_manager):
@@ -8,9 +19,32 @@ class FarmService(BaseService):
         self.repository = db_manager.farms
         self.user_repository = db_manager.users
     
-    async def get_farms(self) -> list[SFarmGet]:
-        farms = await self.repository.get_all()
-        return [SFarmGet.model_validate(farm, from_attributes=True) for farm in farms]
+    async def get_farms(self, limit: int, cursor: str | None = None) -> tuple[list[SFarmGet], str | None]:
+        farms, next_cursor = await self.repository.get_page(limit=limit, cursor=cursor)
+        return validate_list(SFarmGet, farms), next_cursor
+    
+    async def get_farm_image(self, farm_id: int) -> str:
+        farm = await self.repository.get_one(id=farm_id)
+        if not farm:
+            raise FarmNotFoundError
+        if not farm.image_key:
+            raise FarmImageNotFoundError
+        return farm.image_key
+    
+    async def set_farm_image(self, farm_id: int, chunks: AsyncIterable[bytes], user_id: int) -> str:
+        farm = await self.repository.get_one(id=farm_id)
+        if not farm:
+            raise FarmNotFoundError
+        if farm.user_id != user_id:
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
+                raise FarmNotYoursError
+        # Соединение возвращается в пул, пока клиент передает файл
+        await self.db.rollback()
+        
+        image_key = await image_store.save(chunks)
+        await self.repository.update(farm_id, {"image_key": image_key})
+        await self.db.commit()
+        return image_key
     
     async def create_application(self, user_id: int, farm_data: SFarmAdd):
         existing_farm = await self.repository.get_farm_by_user_id(user_id)
@@ -26,11 +60,12 @@ class FarmService(BaseService):
         farm_dict["status"] = "pending" 
         
         farm = await self.repository.create(farm_dict)
+        await self.db.commit()
         return farm
     
     async def get_applications(self) -> list[SFarmApplicationResponse]:
         applications = await self.repository.get_pending_applications()
-        return [SFarmApplicationResponse.model_validate(app, from_attributes=True) for app in applications]
+        return validate_list(SFarmApplicationResponse, applications)
     
     async def approve_application(self, application_id: int):
         application = await self.repository.get_one(id=application_id)
@@ -38,6 +73,7 @@ class FarmService(BaseService):
             raise FarmApplicationNotFoundError
         
         await self.repository.update(application_id, {"status": "approved"})
+        await self.db.commit()
     
     async def reject_application(self, application_id: int):
         application = await self.repository.get_one(id=application_id)
@@ -45,6 +81,7 @@ class FarmService(BaseService):
             raise FarmApplicationNotFoundError
         
         await self.repository.update(application_id, {"status": "rejected"})
+        await self.db.commit()
     
     async def update_farm(self, farm_id: int, farm_data: SFarmAdd, user_id: int):
         farm = await self.repository.get_one(id=farm_id)
@@ -52,11 +89,11 @@ class FarmService(BaseService):
             raise FarmNotFoundError
         
         if farm.user_id != user_id:
-            user = await self.user_repository.get_one_with_role(id=user_id)
-            if not user or user.role.name != "admin":
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
                 raise FarmNotFoundError
         
         updated = await self.repository.update(farm_id, farm_data.model_dump())
+        await self.db.commit()
         return SFarmGet.model_validate(updated, from_attributes=True)
     
     async def delete_farm(self, farm_id: int, user_id: int):
@@ -65,9 +102,8 @@ class FarmService(BaseService):
             raise FarmNotFoundError
         
         if farm.user_id != user_id:
-            user = await self.user_repository.get_one_with_role(id=user_id)
-            if not user or user.role.name != "admin":
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
                 raise FarmNotFoundError
         
         await self.repository.delete(farm_id)
-        await self.repository.session.commit()
\ No newline at end of file
+        await self.db.commit()
\ No newline at end of file
@@ -1,6 +1,8 @@
 from app.services.base import BaseService
+from app.services.roles import RoleService
 from app.exceptions.order_items import OrderItemNotFoundError, OrderItemNotInOrderError, OrderItemNotYoursError
 from app.schemes.order_items import SOrderItemGet, SOrderItemCreate, SOrderItemUpdate
+from app.utils.serialization import validate_list
 
 class OrderItemService(BaseService):
     def __init__(self, db_manager):
@@ -11,12 +13,11 @@ class OrderItemService(BaseService):
     async def get_order_items(self, order_id: int, user_id: int) -> list[SOrderItemGet]:
         order = await self.order_repository.get_one(id=order_id)
         if not order or order.user_id != user_id:
-            user = await self.db.users.get_one_with_role(id=user_id)
-            if not user or user.role.name != "admin":
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
                 raise OrderItemNotYoursError
         
         items = await self.repository.get_by_order_id(order_id)
-        return [SOrderItemGet.model_validate(item, from_attributes=True) for item in items]
+        return validate_list(SOrderItemGet, items)
     
     async def get_order_item(self, order_id: int, item_id: int, user_id: int) -> SOrderItemGet:
         item = await self.repository.get_one(id=item_id)
@@ -28,8 +29,7 @@ class OrderItemService(BaseService):
         
         order = await self.order_repository.get_one(id=order_id)
         if not order or order.user_id != user_id:
-            user = await self.db.users.get_one_with_role(id=user_id)
-            if not user or user.role.name != "admin":
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
                 raise OrderItemNotYoursError
         
         return SOrderItemGet.model_validate(item, from_attributes=True)
@@ -37,13 +37,13 @@ class OrderItemService(BaseService):
     async def add_order_item(self, order_id: int, item_data: SOrderItemCreate, user_id: int):
         order = await self.order_repository.get_one(id=order_id)
         if not order or order.user_id != user_id:
-            user = await self.db.users.get_one_with_role(id=user_id)
-            if not user or user.role.name != "admin":
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
                 raise OrderItemNotYoursError
         
         item_dict = item_data.model_dump()
         item_dict["order_id"] = order_id
         item = await self.repository.create(item_dict)
+        await self.db.commit()
         return SOrderItemGet.model_validate(item, from_attributes=True)
     
     async def update_order_item(self, order_id: int, item_id: int, item_data: SOrderItemUpdate, user_id: int):
@@ -56,11 +56,11 @@ class OrderItemService(BaseService):
         
         order = await self.order_repository.get_one(id=order_id)
         if not order or order.user_id != user_id:
-            user = await self.db.users.get_one_with_role(id=user_id)
-            if not user or user.role.name != "admin":
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
                 raise OrderItemNotYoursError
         
         updated = await self.repository.update(item_id, item_data.model_dump())
+        await self.db.commit()
         return SOrderItemGet.model_validate(updated, from_attributes=True)
     
     async def delete_order_item(self, order_id: int, item_id: int, user_id: int):
@@ -73,8 +73,8 @@ class OrderItemService(BaseService):
         
         order = await self.order_repository.get_one(id=order_id)
         if not order or order.user_id != user_id:
-            user = await self.db.users.get_one_with_role(id=user_id)
-            if not user or user.role.name != "admin":
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
                 raise OrderItemNotYoursError
         
-        await self.repository.delete(item_id)
\ No newline at end of file
+        await self.repository.delete(item_id)
+        await self.db.commit()
\ No newline at end of file
@@ -1,6 +1,8 @@
 from app.services.base import BaseService
+from app.services.roles import RoleService
 from app.exceptions.orders import OrderNotFoundError, OrderNotYoursError, OrderCannotBeCanceledError
 from app.schemes.orders import SOrderCreate, SOrderGet, SOrderUpdate
+from app.utils.serialization import validate_list
 
 class OrderService(BaseService):
     def __init__(self, db_manager):
@@ -10,21 +12,23 @@ class OrderService(BaseService):
         self.product_repository = db_manager.products
     
     async def get_user_orders(self, user_id: int) -> list[SOrderGet]:
+        # Только что оформленный заказ должен быть виден покупателю
+        await self.db.use_primary()
         orders = await self.repository.get_by_user_id(user_id)
-        return [SOrderGet.model_validate(order, from_attributes=True) for order in orders]
+        return validate_list(SOrderGet, orders)
     
-    async def get_all_orders(self) -> list[SOrderGet]:
-        orders = await self.repository.get_all()
-        return [SOrderGet.model_validate(order, from_attributes=True) for order in orders]
+    async def get_all_orders(self, limit: int, cursor: str | None = None) -> tuple[list[SOrderGet], str | None]:
+        orders, next_cursor = await self.repository.get_page(limit=limit, cursor=cursor)
+        return validate_list(SOrderGet, orders), next_cursor
     
     async def get_order(self, order_id: int, user_id: int) -> SOrderGet:
+        await self.db.use_primary()
         order = await self.repository.get_one(id=order_id)
         if not order:
             raise OrderNotFoundError
         
         if order.user_id != user_id:
-            user = await self.db.users.get_one_with_role(id=user_id)
-            if not user or user.role.name != "admin":
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
                 raise OrderNotYoursError
         
         return SOrderGet.model_validate(order, from_attributes=True)
@@ -39,19 +43,20 @@ class OrderService(BaseService):
         order = await self.repository.create(order_dict)
         for item_data in items_data:
             item_data["order_id"] = order.id
-            await self.db.order_items.create(item_data)
+        await self.db.order_items.create_many(items_data)
+        await self.db.commit()
         
         return SOrderGet.model_validate(order, from_attributes=True)
     
     async def update_order(self, order_id: int, order_data: SOrderUpdate, user_id: int):
-        order = await self.repository.get_one(id=order_id)
-        if not order:
-            raise OrderNotFoundError
-        
-        if order.user_id != user_id:
+        updated = await self.repository.update(order_id, order_data.model_dump(), user_id=user_id)
+        if not updated:
+            order = await self.repository.get_one(id=order_id)
+            if not order:
+                raise OrderNotFoundError
             raise OrderNotYoursError
         
-        updated = await self.repository.update(order_id, order_data.model_dump())
+        await self.db.commit()
         return SOrderGet.model_validate(updated, from_attributes=True)
     
     async def cancel_order(self, order_id: int, user_id: int):
@@ -66,6 +71,7 @@ class OrderService(BaseService):
             raise OrderCannotBeCanceledError
         
         await self.repository.update(order_id, {"status": "cancelled"})
+        await self.db.commit()
     
     async def update_order_status(self, order_id: int, status: str, user_id: int):
         order = await self.repository.get_one(id=order_id)
@@ -73,8 +79,8 @@ class OrderService(BaseService):
             raise OrderNotFoundError
         
         if order.user_id != user_id:
-            user = await self.db.users.get_one_with_role(id=user_id)
-            if not user or user.role.name != "admin":
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
                 raise OrderNotYoursError
         
-        await self.repository.update(order_id, {"status": status})
\ No newline at end of file
+        await self.repository.update(order_id, {"status": status})
+        await self.db.commit()
\ No newline at end of file
@@ -1,16 +1,56 @@
+from typing import AsyncIterable, BinaryIO, Optional
+
+from anyio import to_thread
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
 from app.services.base import BaseService
-from app.exceptions.products import ProductNotFoundError, ProductNotYoursError
-from app.schemes.products import SProductAdd, SProductUpdate, SProductPartialUpdate, SProductGet
+from app.services.categories import CategoryService
+from app.services.roles import RoleService
+from app.exceptions.products import (
+    ProductNotFoundError,
+    ProductNotYoursError,
+    ProductImageNotFoundError,
+    ProductImportFileError,
+)
+from app.schemes.products import (
+    SProductAdd,
+    SProductUpdate,
+    SProductPartialUpdate,
+    SProductGet,
+    SProductFilter,
+    SProductImportError,
+    SProductImportReport,
+)
+from app.utils.images import image_store
+from app.utils.imports import open_csv, read_chunk
+from app.utils.serialization import list_adapter, validate_list
+
+_IMPORT_REQUIRED_COLUMNS = {"name", "price", "quantity"}
+_IMPORT_COLUMNS = {"name", "category", "category_id", "farm_id", "unit", "description", "price", "quantity"}
+
+def _is_ascii_int(value: str) -> bool:
+    # str.isdigit() принимает и «²», «٣»: int() на них падает ValueError
+    return value.isascii() and value.isdigit()
 
 class ProductService(BaseService):
+    import_chunk_size = 1000
+    
     def __init__(self, db_manager):
         super().__init__(db_manager)
         self.repository = db_manager.products
         self.farm_repository = db_manager.farms
     
-    async def get_products(self) -> list[SProductGet]:
-        products = await self.repository.get_all()
-        return [SProductGet.model_validate(prod, from_attributes=True) for prod in products]
+    async def get_products(
+        self, limit: int, cursor: str | None = None, filters: SProductFilter | None = None
+    ) -> tuple[list[SProductGet], str | None]:
+        filter_by = filters.model_dump(exclude_none=True) if filters else {}
+        products, next_cursor = await self.repository.get_filtered_page(limit=limit, cursor=cursor, **filter_by)
+        return validate_list(SProductGet, products), next_cursor
+    
+    async def search_products(self, query: str, limit: int) -> list[SProductGet]:
+        products = await self.repository.search(query, limit)
+        return validate_list(SProductGet, products)
     
     async def get_product(self, product_id: int) -> SProductGet:
         product = await self.repository.get_one(id=product_id)
@@ -18,11 +58,32 @@ class ProductService(BaseService):
             raise ProductNotFoundError
         return SProductGet.model_validate(product, from_attributes=True)
     
+    async def get_product_image(self, product_id: int) -> str:
+        product = await self.repository.get_one(id=product_id)
+        if not product:
+            raise ProductNotFoundError
+        if not product.image_key:
+            raise ProductImageNotFoundError
+        return product.image_key
+    
+    async def set_product_image(self, product_id: int, chunks: AsyncIterable[bytes], user_id: int) -> str:
+        product = await self.repository.get_one(id=product_id)
+        if not product:
+            raise ProductNotFoundError
+        if not await self._check_product_permission(product, user_id):
+            raise ProductNotYoursError
+        # Соединение возвращается в пул, пока клиент передает файл
+        await self.db.rollback()
+        
+        image_key = await image_store.save(chunks)
+        await self.repository.update(product_id, {"image_key": image_key})
+        await self.db.commit()
+        return image_key
+    
     async def create_product(self, product_data: SProductAdd, user_id: int):
         farm = await self.farm_repository.get_farm_by_user_id_with_relations(user_id)
         if not farm:
-            user = await self.db.users.get_one_with_role(id=user_id)
-            if not user or user.role.name != "admin":
+            if await RoleService(self.db).get_user_role_name(user_id) != "admin":
                 raise ProductNotYoursError
         
         product_dict = product_data.model_dump()
@@ -30,8 +91,133 @@ class ProductService(BaseService):
             product_dict["farm_id"] = farm.id
         
         product = await self.repository.create(product_dict)
+        await self.repository.index_for_search([product])
+        await self.db.commit()
         return SProductGet.model_validate(product, from_attributes=True)
     
+    async def import_products(self, file: BinaryIO, user_id: int) -> SProductImportReport:
+        """Импорт товаров из CSV пачками по import_chunk_size строк.
+        
+        Пачка валидируется одним вызовом pydantic и вставляется одним INSERT в своей транзакции;
+        строки с ошибками пропускаются и попадают в отчет с номером строки файла.
+        """
+        farm = await self.farm_repository.get_farm_by_user_id(user_id)
+        is_admin = await RoleService(self.db).get_user_role_name(user_id) == "admin"
+        if not farm and not is_admin:
+            raise ProductNotYoursError
+        categories = {category.name.casefold(): category.id for category in await CategoryService(self.db).get_categories()}
+        
+        try:
+            reader = await to_thread.run_sync(open_csv, file)
+        except UnicodeDecodeError:
+            raise ProductImportFileError
+        columns = set(reader.fieldnames)
+        if not _IMPORT_REQUIRED_COLUMNS <= columns or not {"category", "category_id"} & columns:
+            raise ProductImportFileError
+        
+        report = SProductImportReport()
+        while True:
+            try:
+                chunk = await to_thread.run_sync(read_chunk, reader, self.import_chunk_size)
+            except UnicodeDecodeError:
+                raise ProductImportFileError
+            if not chunk:
+                report.errors.sort(key=lambda error: error.row)
+                return report
+            await self._import_chunk(chunk, categories, farm.id if farm else None, is_admin, report)
+    
+    async def _import_chunk(
+        self,
+        chunk: list[tuple[int, dict]],
+        categories: dict[str, int],
+        farm_id: Optional[int],
+        is_admin: bool,
+        report: SProductImportReport,
+    ) -> None:
+        line_numbers, raw_rows = [], []
+        for line, row in chunk:
+            data, error = self._parse_import_row(row, categories, farm_id, is_admin)
+            if error:
+                report.errors.append(SProductImportError(row=line, field=error[0], message=error[1]))
+            else:
+                line_numbers.append(line)
+                raw_rows.append(data)
+        
+        adapter = list_adapter(SProductAdd)
+        try:
+            products = adapter.validate_python(raw_rows)
+        except ValidationError as exc:
+            invalid = set()
+            for error in exc.errors(include_url=False):
+                index, *field = error["loc"]
+                invalid.add(index)
+                report.errors.append(
+                    SProductImportError(row=line_numbers[index], field=".".join(map(str, field)) or None, message=error["msg"])
+                )
+            valid = [index for index in range(len(raw_rows)) if index not in invalid]
+            line_numbers = [line_numbers[index] for index in valid]
+            products = adapter.validate_python([raw_rows[index] for index in valid])
+        
+        if is_admin:
+            existing = await self.farm_repository.get_existing_ids([product.farm_id for product in products])
+            for line, product in zip(line_numbers, products):
+                if product.farm_id not in existing:
+                    report.errors.append(SProductImportError(row=line, field="farm_id", message="Ферма не найдена"))
+            line_numbers, products = (
+                [line for line, product in zip(line_numbers, products) if product.farm_id in existing],
+                [product for product in products if product.farm_id in existing],
+            )
+        if not products:
+            return
+        
+        rows = [{**product.model_dump(), "unit": product.unit or "шт"} for product in products]
+        try:
+            ids = await self.repository.create_many(rows)
+            await self.repository.index_for_search(await self.repository.get_by_ids(ids))
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            report.errors.extend(
+                SProductImportError(row=line, message="Пачка строк не сохранена: нарушена целостность данных")
+                for line in line_numbers
+            )
+            return
+        report.created += len(ids)
+    
+    @staticmethod
+    def _parse_import_row(
+        row: dict, categories: dict[str, int], farm_id: Optional[int], is_admin: bool
+    ) -> tuple[dict, Optional[tuple[Optional[str], str]]]:
+        """Строка CSV -> данные для SProductAdd или (поле, ошибка)"""
+        if None in row:
+            return {}, (None, "Лишние значения в строке")
+        data = {key: value.strip() for key, value in row.items() if key in _IMPORT_COLUMNS and value and value.strip()}
+        for key in ("price", "quantity"):
+            if key in data:
+                data[key] = data[key].replace(",", ".")
+        
+        category = data.pop("category", None)
+        if category is not None and "category_id" not in data:
+            if category.casefold() not in categories:
+                return data, ("category", f"Категория «{category}» не найдена")
+            data["category_id"] = categories[category.casefold()]
+        elif "category_id" in data and not _is_ascii_int(data["category_id"]):
+            return data, ("category_id", "Должно быть целым числом")
+        elif "category_id" in data and int(data["category_id"]) not in categories.values():
+            return data, ("category_id", "Категория не найдена")
+        elif "category_id" not in data:
+            return data, ("category", "Не указана категория")
+        
+        if not is_admin:
+            if data.get("farm_id", str(farm_id)) != str(farm_id):
+                return data, ("farm_id", "Это не ваша ферма")
+            data["farm_id"] = farm_id
+        elif "farm_id" not in data:
+            if farm_id is None:
+                return data, ("farm_id", "Не указана ферма")
+            data["farm_id"] = farm_id
+        return data, None
+    
     async def update_product(self, product_id: int, product_data: SProductUpdate, user_id: int):
         product = await self.repository.get_one(id=product_id)
         if not product:
@@ -41,6 +227,8 @@ class ProductService(BaseService):
             raise ProductNotYoursError
         
         updated = await self.repository.update(product_id, product_data.model_dump())
+        await self.repository.index_for_search([updated])
+        await self.db.commit()
         return SProductGet.model_validate(updated, from_attributes=True)
     
     async def partial_update_product(self, product_id: int, product_data: SProductPartialUpdate, user_id: int):
@@ -56,6 +244,9 @@ class ProductService(BaseService):
             return SProductGet.model_validate(product, from_attributes=True)
         
         updated = await self.repository.update(product_id, update_data)
+        if "name" in update_data or "description" in update_data:
+            await self.repository.index_for_search([updated])
+        await self.db.commit()
         return SProductGet.model_validate(updated, from_attributes=True)
     
     async def delete_product(self, product_id: int, user_id: int):
@@ -67,17 +258,19 @@ class ProductService(BaseService):
             raise ProductNotYoursError
         
         await self.repository.delete(product_id)
+        await self.repository.remove_from_search([product_id])
+        await self.db.commit()
     
     async def _check_product_permission(self, product, user_id: int) -> bool:
-        user = await self.db.users.get_one(id=user_id)
+        role_name = await RoleService(self.db).get_user_role_name(user_id)
         
-        if not user:
+        if not role_name:
             return False
         
-        if user.role.name == "admin":
+        if role_name == "admin":
             return True
         
-        if user.role.name == "farmer":
+        if role_name == "farmer":
             farm = await self.farm_repository.get_farm_by_user_id(user_id)
             return farm and product.farm_id == farm.id
         
@@ -1,6 +1,7 @@
 from app.services.base import BaseService
 from app.exceptions.reviews import ReviewNotFoundError, ReviewAlreadyExistsError
-from app.schemes.reviews import SReviewAdd, SReviewGet
+from app.schemes.reviews import SReviewAdd, SReviewFilter, SReviewGet
+from app.utils.serialization import validate_list
 
 class ReviewService(BaseService):
     def __init__(self, db_manager):
@@ -8,9 +9,12 @@ class ReviewService(BaseService):
         self.repository = db_manager.reviews
         self.user_repository = db_manager.users
     
-    async def get_reviews(self) -> list[SReviewGet]:
-        reviews = await self.repository.get_all()
-        return [SReviewGet.model_validate(rev, from_attributes=True) for rev in reviews]
+    async def get_reviews(
+        self, limit: int, cursor: str | None = None, filters: SReviewFilter | None = None
+    ) -> tuple[list[SReviewGet], str | None]:
+        filter_by = filters.model_dump(exclude_none=True) if filters else {}
+        reviews, next_cursor = await self.repository.get_page(limit=limit, cursor=cursor, **filter_by)
+        return validate_list(SReviewGet, reviews), next_cursor
     
     async def get_review(self, review_id: int) -> SReviewGet:
         review = await self.repository.get_one(id=review_id)
@@ -31,6 +35,8 @@ class ReviewService(BaseService):
         review_dict = review_data.model_dump()
         review_dict["user_id"] = user_id
         review = await self.repository.create(review_dict)
+        await self._change_ratings(review.farm_id, review.product_id, added=review.rating)
+        await self.db.commit()
         return SReviewGet.model_validate(review, from_attributes=True)
     
     async def update_review(self, review_id: int, review_data: SReviewAdd):
@@ -38,7 +44,15 @@ class ReviewService(BaseService):
         if not review:
             raise ReviewNotFoundError
         
+        old_farm_id, old_product_id, old_rating = review.farm_id, review.product_id, review.rating
         updated = await self.repository.update(review_id, review_data.model_dump())
+        if (old_farm_id, old_product_id) == (updated.farm_id, updated.product_id):
+            if old_rating != updated.rating:
+                await self._change_ratings(updated.farm_id, updated.product_id, added=updated.rating, removed=old_rating)
+        else:
+            await self._change_ratings(old_farm_id, old_product_id, removed=old_rating)
+            await self._change_ratings(updated.farm_id, updated.product_id, added=updated.rating)
+        await self.db.commit()
         return SReviewGet.model_validate(updated, from_attributes=True)
     
     async def delete_review(self, review_id: int):
@@ -46,4 +60,13 @@ class ReviewService(BaseService):
         if not review:
             raise ReviewNotFoundError
         
-        await self.repository.delete(review_id)
\ No newline at end of file
+        await self.repository.delete(review_id)
+        await self._change_ratings(review.farm_id, review.product_id, removed=review.rating)
+        await self.db.commit()
+    
+    async def _change_ratings(self, farm_id: int | None, product_id: int | None, added: int | None = None, removed: int | None = None):
+        """Агрегаты фермы и товара меняются в той же транзакции, что и сам отзыв"""
+        if farm_id:
+            await self.db.farms.apply_rating_change(farm_id, added=added, removed=removed)
+        if product_id:
+            await self.db.products.apply_rating_change(product_id, added=added, removed=removed)
\ No newline at end of file
@@ -1,6 +1,12 @@
+from typing import Optional
+
 from app.services.base import BaseService
 from app.exceptions.roles import RoleNotFoundError, RoleAlreadyExistsError
 from app.schemes.roles import SRoleAdd, SRoleGet, SRoleGetWithRels
+from app.models.users import User
+from app.utils.cache import reference_cache
+from app.utils.token_versions import token_versions
+from app.utils.serialization import validate_list
 
 class RoleService(BaseService):
     def __init__(self, db_manager):
@@ -8,8 +14,23 @@ class RoleService(BaseService):
         self.repository = db_manager.roles
     
     async def get_roles(self) -> list[SRoleGet]:
+        roles = await reference_cache.get_or_load("roles", "all", self._load_roles)
+        return list(roles)
+    
+    async def _load_roles(self) -> list[SRoleGet]:
         roles = await self.repository.get_all()
-        return [SRoleGet.model_validate(role, from_attributes=True) for role in roles]
+        return validate_list(SRoleGet, roles)
+    
+    async def get_role_name(self, role_id: int) -> Optional[str]:
+        roles = await self.get_roles()
+        return next((role.name for role in roles if role.id == role_id), None)
+    
+    async def get_user_role_name(self, user_id: int) -> Optional[str]:
+        """Роль пользователя для проверок доступа: один запрос за пользователем, роль - из кэша"""
+        user = await self.db.users.get_one(id=user_id)
+        if not user:
+            return None
+        return await self.get_role_name(user.role_id)
     
     async def get_role(self, role_id: int) -> SRoleGetWithRels:
         role = await self.repository.get_one_with_users(role_id)
@@ -23,6 +44,8 @@ class RoleService(BaseService):
             raise RoleAlreadyExistsError
         
         role = await self.repository.create(role_data.model_dump())
+        await self.db.commit()
+        reference_cache.invalidate("roles")
         return SRoleGet.model_validate(role, from_attributes=True)
     
     async def edit_role(self, role_id: int, role_data: SRoleAdd):
@@ -35,7 +58,12 @@ class RoleService(BaseService):
             if existing:
                 raise RoleAlreadyExistsError
         
+        renamed = role_data.name != role.name
         updated = await self.repository.update(role_id, role_data.model_dump())
+        user_ids = await self._revoke_role_tokens(role_id) if renamed else []
+        await self.db.commit()
+        reference_cache.invalidate("roles")
+        token_versions.forget(user_ids)
         return SRoleGet.model_validate(updated, from_attributes=True)
     
     async def delete_role(self, role_id: int):
@@ -43,4 +71,12 @@ class RoleService(BaseService):
         if not role:
             raise RoleNotFoundError
         
-        await self.repository.delete(role_id)
\ No newline at end of file
+        user_ids = await self._revoke_role_tokens(role_id)
+        await self.repository.delete(role_id)
+        await self.db.commit()
+        reference_cache.invalidate("roles")
+        token_versions.forget(user_ids)
+    
+    async def _revoke_role_tokens(self, role_id: int) -> list[int]:
+        """В токенах пользователей роли записано ее прежнее название: такие токены отзываются"""
+        return await self.db.users.update_many({"token_version": User.token_version + 1}, role_id=role_id)
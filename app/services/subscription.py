@@ -1,4 +1,7 @@
+from sqlalchemy.exc import IntegrityError
+
 from app.services.base import BaseService
+from app.exceptions.pagination import InvalidCursorError
 from app.exceptions.subscriptions import (
     SubscriptionPlanNotFoundError,
     SubscriptionPlanAlreadyExistsError,
@@ -7,6 +10,10 @@ from app.exceptions.subscriptions import (
     UserSubscriptionNotFoundError
 )
 from app.schemes.subscription import SSubscriptionPlanAdd, SSubscriptionPlanGet, SUserSubscriptionGet
+from app.database.table_versions import table_etag
+from app.utils.cache import reference_cache
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serialization import validate_list
 
 class SubscriptionService(BaseService):
     def __init__(self, db_manager):
@@ -14,15 +21,37 @@ class SubscriptionService(BaseService):
         self.plan_repository = db_manager.subscription_plans
         self.user_sub_repository = db_manager.user_subscriptions
     
-    async def get_plans(self) -> list[SSubscriptionPlanGet]:
-        plans = await self.plan_repository.get_all()
-        return [SSubscriptionPlanGet.model_validate(plan, from_attributes=True) for plan in plans]
+    async def get_plans(self, limit: int, cursor: str | None = None) -> tuple[list[SSubscriptionPlanGet], str | None]:
+        # Тарифов единицы: страница и курсор (тот же формат, что у get_page) считаются по кэшу
+        plans = await self._get_all_plans()
+        key = decode_cursor(cursor)
+        if key is not None:
+            if len(key) != 1 or not isinstance(key[0], int):
+                raise InvalidCursorError
+            plans = [plan for plan in plans if plan.id > key[0]]
+        next_cursor = encode_cursor([plans[limit - 1].id]) if len(plans) > limit else None
+        return plans[:limit], next_cursor
     
     async def get_plan(self, plan_id: int) -> SSubscriptionPlanGet:
-        plan = await self.plan_repository.get_one(id=plan_id)
+        plans = await self._get_all_plans()
+        plan = next((plan for plan in plans if plan.id == plan_id), None)
         if not plan:
             raise SubscriptionPlanNotFoundError
-        return SSubscriptionPlanGet.model_validate(plan, from_attributes=True)
+        return plan
+    
+    async def get_plans_etag(self) -> str:
+        """ETag списка из того же элемента кэша, что и сами тарифы"""
+        etag, plans = await reference_cache.get_or_load("subscription_plans", "all", self._load_plans)
+        return etag
+    
+    async def _get_all_plans(self) -> list[SSubscriptionPlanGet]:
+        etag, plans = await reference_cache.get_or_load("subscription_plans", "all", self._load_plans)
+        return plans
+    
+    async def _load_plans(self) -> tuple[str, list[SSubscriptionPlanGet]]:
+        etag = await table_etag(self.db.session, "subscription_plans")
+        plans = await self.plan_repository.get_all()
+        return etag, sorted(validate_list(SSubscriptionPlanGet, plans), key=lambda plan: plan.id)
     
     async def create_plan(self, plan_data: SSubscriptionPlanAdd):
         existing = await self.plan_repository.get_plan_by_name(plan_data.name)
@@ -30,19 +59,21 @@ class SubscriptionService(BaseService):
             raise SubscriptionPlanAlreadyExistsError
         
         plan = await self.plan_repository.create(plan_data.model_dump())
+        await self.db.commit()
+        reference_cache.invalidate("subscription_plans")
         return SSubscriptionPlanGet.model_validate(plan, from_attributes=True)
     
     async def update_plan(self, plan_id: int, plan_data: SSubscriptionPlanAdd):
-        plan = await self.plan_repository.get_one(id=plan_id)
-        if not plan:
+        try:
+            updated = await self.plan_repository.update(plan_id, plan_data.model_dump())
+        except IntegrityError:
+            await self.db.rollback()
+            raise SubscriptionPlanAlreadyExistsError
+        if not updated:
             raise SubscriptionPlanNotFoundError
         
-        if plan_data.name != plan.name:
-            existing = await self.plan_repository.get_plan_by_name(plan_data.name)
-            if existing:
-                raise SubscriptionPlanAlreadyExistsError
-        
-        updated = await self.plan_repository.update(plan_id, plan_data.model_dump())
+        await self.db.commit()
+        reference_cache.invalidate("subscription_plans")
         return SSubscriptionPlanGet.model_validate(updated, from_attributes=True)
     
     async def delete_plan(self, plan_id: int):
@@ -51,10 +82,12 @@ class SubscriptionService(BaseService):
             raise SubscriptionPlanNotFoundError
         
         await self.plan_repository.delete(plan_id)
+        await self.db.commit()
+        reference_cache.invalidate("subscription_plans")
     
     async def get_user_subscriptions(self, user_id: int) -> list[SUserSubscriptionGet]:
         subs = await self.user_sub_repository.get_by_user_id(user_id)
-        return [SUserSubscriptionGet.model_validate(sub, from_attributes=True) for sub in subs]
+        return validate_list(SUserSubscriptionGet, subs)
     
     async def get_user_subscription(self, subscription_id: int, user_id: int) -> SUserSubscriptionGet:
         sub = await self.user_sub_repository.get_one(id=subscription_id)
@@ -84,6 +117,7 @@ class SubscriptionService(BaseService):
         }
         
         sub = await self.user_sub_repository.create(sub_data)
+        await self.db.commit()
         return SUserSubscriptionGet.model_validate(sub, from_attributes=True)
     
     async def unsubscribe_user(self, user_id: int, plan_id: int):
@@ -91,4 +125,5 @@ class SubscriptionService(BaseService):
         if not sub:
             raise UserNotSubscribedError
         
-        await self.user_sub_repository.update(sub.id, {"status": "cancelled"})
\ No newline at end of file
+        await self.user_sub_repository.update(sub.id, {"status": "cancelled"})
+        await self.db.commit()
\ No newline at end of file
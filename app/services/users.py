@@ -1,6 +1,7 @@
 from app.services.base import BaseService
 from app.exceptions.auth import UserNotFoundError
 from app.schemes.users import SUserGet, SUserUpdate
+from app.utils.serialization import validate_list
 
 class UserService(BaseService):
     def __init__(self, db_manager):
@@ -9,7 +10,7 @@ class UserService(BaseService):
     
     async def get_users(self) -> list[SUserGet]:
         users = await self.repository.get_all()
-        return [SUserGet.model_validate(user, from_attributes=True) for user in users]
+        return validate_list(SUserGet, users)
     
     async def get_user(self, user_id: int) -> SUserGet:
         user = await self.repository.get_one(id=user_id)
@@ -23,6 +24,7 @@ class UserService(BaseService):
             raise UserNotFoundError
         
         updated = await self.repository.update(id=user_id, data=user_data.model_dump(exclude_unset=True))
+        await self.db.commit()
         return SUserGet.model_validate(updated, from_attributes=True)
     
     async def delete_user(self, user_id: int):
@@ -30,4 +32,5 @@ class UserService(BaseService):
         if not user:
             raise UserNotFoundError
         
-        await self.repository.delete(user_id)
\ No newline at end of file
+        await self.repository.delete(user_id)
+        await self.db.commit()
\ No newline at end of file
@@ -5,6 +5,8 @@ let currentPage = 'home';
 let selectedCategory = 'Все';
 let selectedSupplierId = null;
 let selectedProductId = null;
+let loadedProducts = [];
+let productsNextCursor = null;
 let currentAdminTab = 'dashboard';
 let authMode = 'login';
 let currentRating = 5;
@@ -70,7 +72,7 @@ async function loadCategories() {
 async function loadSuppliers() {
     if (!suppliersCache) {
         try {
-            const suppliers = await apiRequest('/farms');
+            const suppliers = await apiRequestAll('/farms');
             suppliersCache = suppliers || [];
         } catch (error) {
             console.error('Ошибка загрузки ферм:', error);
@@ -133,6 +135,12 @@ function getImageUrl(imageData, defaultImage = '/static/images/default-product.j
     return `/static/images/${imageData}`;
 }
 
+// URL изображения из хранилища по ключу; width - ширина миниатюры (160, 320 или 640), без нее - оригинал
+function imageKeyUrl(imageKey, width = null, defaultImage = '/static/images/default-product.jpg') {
+    if (!imageKey) return defaultImage;
+    return width ? `/images/${imageKey}?w=${width}` : `/images/${imageKey}`;
+}
+
 // Функция для преобразования данных фермы из модели в формат для отображения
 function formatFarmData(farm) {
     if (!farm) return null;
@@ -143,7 +151,7 @@ function formatFarmData(farm) {
         description: farm.description || '',
         location: farm.address || 'Адрес не указан',
         address: farm.address,
-        image: farm.image ? `data:image/jpeg;base64,${farm.image}` : '/static/images/default-farm.jpg',
+        image: imageKeyUrl(farm.image_key, 640, '/static/images/default-farm.jpg'),
         rating: farm.rating_avg || 0,
         rating_avg: farm.rating_avg || 0,
         user_id: farm.user_id,
@@ -170,7 +178,8 @@ function formatProductData(product, farms = null, categories = null) {
         unit: product.unit || 'шт',
         quantity: product.quantity || 0,
         in_stock: isInStock,
-        image: product.image ? `data:image/jpeg;base64,${product.image}` : '/static/images/default-product.jpg',
+        image: imageKeyUrl(product.image_key, 320),
+        imageLarge: imageKeyUrl(product.image_key, 640),
         farm_id: product.farm_id,
         category_id: product.category_id,
         supplier_id: product.farm_id, // Для совместимости со старым кодом
@@ -525,17 +534,16 @@ async function renderFeaturedSuppliers() {
 
 async function renderNewProducts() {
     try {
-        const products = await apiRequest('/products');
+        // Сортировка и лимит на сервере: запрашиваются только четыре последних товара
+        const products = await apiRequest('/products?sort=newest&limit=4');
         const categories = await loadCategories();
         const farms = await loadSuppliers();
         
         if (!products || !Array.isArray(products)) return;
         
-        const newProducts = [...products]
+        const newProducts = products
             .map(p => formatProductData(p, farms, categories))
-            .filter(p => p) // Убираем null
-            .reverse()
-            .slice(0, 4);
+            .filter(p => p); // Убираем null
         
         console.log('Новые продукты для показа:', newProducts.length);
         
@@ -586,10 +594,13 @@ async function renderNewProducts() {
 
 async function renderHomeProducts() {
     try {
-        const products = await apiRequest('/products');
         const categories = await loadCategories();
         const farms = await loadSuppliers();
         
+        // Фильтрация по категории и лимит на сервере: на главной показываются восемь товаров
+        const selected = categories.find(c => c.name === selectedCategory);
+        const products = await apiRequest(selected ? `/products?category_id=${selected.id}&limit=8` : '/products?limit=8');
+        
         if (!products || !Array.isArray(products)) {
             console.error('Продукты не получены или не массив:', products);
             return;
@@ -608,17 +619,7 @@ async function renderHomeProducts() {
             document.getElementById('categoryFiltersHome').innerHTML = filtersHTML;
         }
 
-        let filteredProducts = selectedCategory === 'Все' 
-            ? products.map(p => formatProductData(p, farms, categories))
-            : products
-                .map(p => formatProductData(p, farms, categories))
-                .filter(p => p && p.category_name === selectedCategory);
-        
-        // Отладочная информация
-        console.log('Отфильтровано продуктов:', filteredProducts.length);
-        console.log('Пример продукта:', filteredProducts[0]);
-        
-        filteredProducts = filteredProducts.slice(0, 8);
+        const filteredProducts = products.map(p => formatProductData(p, farms, categories));
 
         const productsHTML = await Promise.all(filteredProducts.map(async (product) => {
             if (!product) return '';
@@ -668,78 +669,113 @@ async function renderHomeProducts() {
 
 async function renderProducts() {
     try {
-        const products = await apiRequest('/products');
         const categories = await loadCategories();
-        const farms = await loadSuppliers();
         
-        if (!products || !Array.isArray(products)) {
-            console.error('Продукты не получены или не массив:', products);
-            return;
+        if (document.getElementById('categoryFilters')) {
+            const categoriesList = ['Все', ...categories.map(c => c.name)];
+            document.getElementById('categoryFilters').innerHTML = categoriesList.map(cat => 
+                `<button class="category-btn ${cat === selectedCategory ? 'active' : ''}" onclick="filterCategory('${cat}', 'products')">${cat}</button>`
+            ).join('');
         }
         
-        console.log('Получено продуктов для страницы продуктов:', products.length);
+        loadedProducts = [];
+        productsNextCursor = null;
+        await loadMoreProducts();
+    } catch (error) {
+        console.error('Ошибка при загрузке продуктов:', error);
+        showProductsError();
+    }
+}
+
+// Каталог отдается страницами: следующая запрашивается по X-Next-Cursor кнопкой «Показать еще»
+async function loadMoreProducts() {
+    try {
+        const categories = await loadCategories();
         
-        const categoriesList = ['Все', ...categories.map(c => c.name)];
+        // Фильтрация по категории выполняется на сервере
+        const selected = categories.find(c => c.name === selectedCategory);
+        const params = new URLSearchParams();
+        if (selected) params.set('category_id', selected.id);
+        if (productsNextCursor) params.set('cursor', productsNextCursor);
+        const query = params.toString();
         
-        const filtersHTML = categoriesList.map(cat => 
-            `<button class="category-btn ${cat === selectedCategory ? 'active' : ''}" onclick="filterCategory('${cat}', 'products')">${cat}</button>`
-        ).join('');
+        let nextCursor = null;
+        const products = await apiRequest(query ? `/products?${query}` : '/products', {
+            onResponse: response => { nextCursor = response.headers.get('X-Next-Cursor'); }
+        });
         
-        if (document.getElementById('categoryFilters')) {
-            document.getElementById('categoryFilters').innerHTML = filtersHTML;
+        if (!products || !Array.isArray(products)) {
+            console.error('Продукты не получены или не массив:', products);
+            return;
         }
+        
+        loadedProducts = [...loadedProducts, ...products];
+        productsNextCursor = nextCursor;
+        console.log('Загружено продуктов для страницы продуктов:', loadedProducts.length);
+        
+        await renderProductsGrid();
+    } catch (error) {
+        console.error('Ошибка при загрузке продуктов:', error);
+        showProductsError();
+    }
+}
 
-        let filteredProducts = selectedCategory === 'Все' 
-            ? products.map(p => formatProductData(p, farms, categories))
-            : products
-                .map(p => formatProductData(p, farms, categories))
-                .filter(p => p && p.category_name === selectedCategory);
-
-        console.log('Отфильтровано продуктов для страницы:', filteredProducts.length);
+// Перерисовывает уже загруженные страницы каталога, не запрашивая их заново
+async function renderProductsGrid() {
+    const categories = await loadCategories();
+    const farms = await loadSuppliers();
+    const filteredProducts = loadedProducts.map(p => formatProductData(p, farms, categories));
 
-        const productsHTML = await Promise.all(filteredProducts.map(async (product) => {
-            if (!product) return '';
-            
-            const inCartCount = await getProductInCartCount(product.id);
-            const categoryName = product.category_name || getCategoryNameById(product.category_id, categories);
-            const unit = product.unit || 'шт';
-            
-            return `
-                <div class="card" onclick="navigateTo('productDetail', '${product.id}')" style="cursor: pointer;">
-                    <img src="${product.image}" alt="${product.name}" style="height: 200px; object-fit: cover;">
-                    <div class="card-content">
-                        <div style="margin-bottom: 0.5rem;">
-                            <span class="badge badge-green">${categoryName}</span>
-                            ${!product.in_stock ? '<span class="badge badge-red" style="margin-left: 0.5rem;">Нет в наличии</span>' : ''}
-                        </div>
-                        <h3 style="font-size: 1rem; margin-bottom: 0.25rem;">${product.name}</h3>
-                        <p style="font-size: 0.875rem; color: #6b7280; margin-bottom: 0.75rem;">${product.description?.substring(0, 80) || ''}${product.description && product.description.length > 80 ? '...' : ''}</p>
-                        <div class="flex-between">
-                            <div>
-                                <span class="product-price">${product.price || 0} ₽</span>
-                                <span class="text-gray" style="font-size: 0.875rem;"> / ${unit}</span>
-                            </div>
-                            ${currentUser ? `
-                                <button class="btn ${inCartCount > 0 ? 'btn-green' : 'btn-primary'} btn-small" onclick="event.stopPropagation(); addToCart('${product.id}')" ${!product.in_stock ? 'disabled style="opacity: 0.5;"' : ''}>
-                                    ${inCartCount > 0 ? `${getIcon('check')} ${inCartCount} шт` : '+ В корзину'}
-                                </button>
-                            ` : ''}
+    const productsHTML = await Promise.all(filteredProducts.map(async (product) => {
+        if (!product) return '';
+        
+        const inCartCount = await getProductInCartCount(product.id);
+        const categoryName = product.category_name || getCategoryNameById(product.category_id, categories);
+        const unit = product.unit || 'шт';
+        
+        return `
+            <div class="card" onclick="navigateTo('productDetail', '${product.id}')" style="cursor: pointer;">
+                <img src="${product.image}" alt="${product.name}" style="height: 200px; object-fit: cover;">
+                <div class="card-content">
+                    <div style="margin-bottom: 0.5rem;">
+                        <span class="badge badge-green">${categoryName}</span>
+                        ${!product.in_stock ? '<span class="badge badge-red" style="margin-left: 0.5rem;">Нет в наличии</span>' : ''}
+                    </div>
+                    <h3 style="font-size: 1rem; margin-bottom: 0.25rem;">${product.name}</h3>
+                    <p style="font-size: 0.875rem; color: #6b7280; margin-bottom: 0.75rem;">${product.description?.substring(0, 80) || ''}${product.description && product.description.length > 80 ? '...' : ''}</p>
+                    <div class="flex-between">
+                        <div>
+                            <span class="product-price">${product.price || 0} ₽</span>
+                            <span class="text-gray" style="font-size: 0.875rem;"> / ${unit}</span>
                         </div>
+                        ${currentUser ? `
+                            <button class="btn ${inCartCount > 0 ? 'btn-green' : 'btn-primary'} btn-small" onclick="event.stopPropagation(); addToCart('${product.id}')" ${!product.in_stock ? 'disabled style="opacity: 0.5;"' : ''}>
+                                ${inCartCount > 0 ? `${getIcon('check')} ${inCartCount} шт` : '+ В корзину'}
+                            </button>
+                        ` : ''}
                     </div>
                 </div>
-            `;
-        }));
+            </div>
+        `;
+    }));
 
-        const productsGrid = document.getElementById('productsGrid');
-        if (productsGrid) {
-            productsGrid.innerHTML = productsHTML.join('') || '<div class="empty-state"><div class="empty-state-icon"><i class="fas fa-box"></i></div><p>Продукты не найдены</p></div>';
-        }
-    } catch (error) {
-        console.error('Ошибка при загрузке продуктов:', error);
-        const productsGrid = document.getElementById('productsGrid');
-        if (productsGrid) {
-            productsGrid.innerHTML = '<div class="empty-state"><div class="empty-state-icon"><i class="fas fa-exclamation-circle"></i></div><p>Ошибка загрузки данных</p></div>';
-        }
+    const productsGrid = document.getElementById('productsGrid');
+    if (productsGrid) {
+        productsGrid.innerHTML = productsHTML.join('') || '<div class="empty-state"><div class="empty-state-icon"><i class="fas fa-box"></i></div><p>Продукты не найдены</p></div>';
+    }
+    
+    const loadMore = document.getElementById('productsLoadMore');
+    if (loadMore) {
+        loadMore.innerHTML = productsNextCursor
+            ? '<button class="btn btn-secondary" onclick="loadMoreProducts()">Показать еще</button>'
+            : '';
+    }
+}
+
+function showProductsError() {
+    const productsGrid = document.getElementById('productsGrid');
+    if (productsGrid) {
+        productsGrid.innerHTML = '<div class="empty-state"><div class="empty-state-icon"><i class="fas fa-exclamation-circle"></i></div><p>Ошибка загрузки данных</p></div>';
     }
 }
 
@@ -774,7 +810,7 @@ async function addToCart(productId, quantity = 1) {
             renderHomeProducts();
             renderNewProducts();
         } else if (currentPage === 'products') {
-            renderProducts();
+            renderProductsGrid();
         } else if (currentPage === 'productDetail') {
             renderProductDetail();
         }
@@ -843,20 +879,17 @@ async function renderSupplierDetail() {
         
         const formattedSupplier = formatFarmData(supplier);
         
-        const products = await apiRequest('/products');
-        const reviews = await apiRequest('/reviews');
+        // Товары и отзывы фильтруются по ферме на сервере
+        const products = await apiRequestAll(`/products?farm_id=${supplier.id}`);
+        const reviews = await apiRequestAll(`/reviews?farm_id=${supplier.id}`);
         const categories = await loadCategories();
         const farms = await loadSuppliers();
         
         const supplierProducts = products && Array.isArray(products) 
-            ? products
-                .filter(p => p.farm_id === parseInt(selectedSupplierId))
-                .map(p => formatProductData(p, farms, categories))
+            ? products.map(p => formatProductData(p, farms, categories))
             : [];
         
-        const supplierReviews = reviews && Array.isArray(reviews) 
-            ? reviews.filter(r => r.farm_id === parseInt(selectedSupplierId))
-            : [];
+        const supplierReviews = reviews && Array.isArray(reviews) ? reviews : [];
 
         let html = `
             <div class="card mb-4">
@@ -1028,7 +1061,7 @@ async function renderProductDetail() {
         let html = `
             <div style="display: grid; grid-template-columns: 1fr 400px; gap: 3rem; margin-top: 2rem;">
                 <div>
-                    <img src="${formattedProduct.image}" alt="${formattedProduct.name}" class="product-main-image" style="width: 100%; height: auto; border-radius: 0.5rem;">
+                    <img src="${formattedProduct.imageLarge}" alt="${formattedProduct.name}" class="product-main-image" style="width: 100%; height: auto; border-radius: 0.5rem;">
                     
                     <div class="card mb-4">
                         <div class="card-content">
@@ -1161,7 +1194,7 @@ function addToCartFromProductPage() {
 
 async function renderSubscriptions() {
     try {
-        const subscriptions = await apiRequest('/subscriptions/plans');
+        const subscriptions = await apiRequestAll('/subscriptions/plans');
         if (!subscriptions || !Array.isArray(subscriptions)) return;
         
         const subscriptionsHTML = subscriptions.map(sub => {
@@ -1240,7 +1273,10 @@ async function renderCart() {
 
     try {
         const cartItems = await apiRequest('/cart');
-        const products = await apiRequest('/products');
+        // Только товары из корзины, а не весь каталог
+        const products = Array.isArray(cartItems)
+            ? (await Promise.all(cartItems.map(item => apiRequest(`/products/${item.product_id}`)))).filter(p => p)
+            : [];
         const categories = await loadCategories();
         const farms = await loadSuppliers();
 
@@ -1552,13 +1588,14 @@ async function updateOrderStatus(orderId, newStatus) {
 
 
 async function apiRequest(endpoint, options = {}) {
+    const { onResponse, ...fetchOptions } = options;
     const headers = {
         'Content-Type': 'application/json',
-        ...options.headers
+        ...fetchOptions.headers
     };
     
     const config = {
-        ...options,
+        ...fetchOptions,
         headers,
         credentials: 'include'
     };
@@ -1572,6 +1609,7 @@ async function apiRequest(endpoint, options = {}) {
         const response = await fetch(`${API_BASE_URL}${endpoint}`, config);
         
         console.log(`Ответ от ${endpoint}:`, response.status, response.statusText);
+        if (onResponse) onResponse(response);
         
         if (response.status === 401) {
             currentUser = null;
@@ -1624,6 +1662,24 @@ async function apiRequest(endpoint, options = {}) {
     }
 }
 
+// Списки товаров, ферм, отзывов и тарифов отдаются страницами: следующая запрашивается по X-Next-Cursor
+async function apiRequestAll(endpoint, pageSize = 500) {
+    const items = [];
+    let cursor = null;
+    do {
+        const separator = endpoint.includes('?') ? '&' : '?';
+        let url = `${endpoint}${separator}limit=${pageSize}`;
+        if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+        cursor = null;
+        const page = await apiRequest(url, {
+            onResponse: response => { cursor = response.headers.get('X-Next-Cursor'); }
+        });
+        if (!Array.isArray(page)) return items.length ? items : page;
+        items.push(...page);
+    } while (cursor);
+    return items;
+}
+
 
 async function renderProfile() {
     if (!currentUser) {
@@ -1892,6 +1948,18 @@ async function renderAdminDashboard() {
                         <p style="font-size: 2.5rem; font-weight: 700; color: #8b5cf6;">${stats.total_reviews || 0}</p>
                     </div>
                 </div>
+                <div class="card">
+                    <div class="card-content">
+                        <p class="text-gray mb-2">Ожидают обработки</p>
+                        <p style="font-size: 2.5rem; font-weight: 700; color: #ef4444;">${stats.pending_orders || 0}</p>
+                    </div>
+                </div>
+                <div class="card">
+                    <div class="card-content">
+                        <p class="text-gray mb-2">Выручка</p>
+                        <p style="font-size: 2.5rem; font-weight: 700; color: #16a34a;">${(stats.total_revenue || 0).toLocaleString('ru-RU')} ₽</p>
+                    </div>
+                </div>
             </div>
         `;
     } catch (error) {
@@ -2015,7 +2083,7 @@ async function renderAdminProducts() {
         const products = response.products || [];
         const total = response.total || 0;
         const totalPages = response.total_pages || 1;
-        const farms = await apiRequest('/farms');
+        const farms = await apiRequestAll('/farms');
         const categories = await loadCategories();
         
         let html = `
@@ -2393,7 +2461,7 @@ async function renderSupplierPanel() {
     }
 
     try {
-        const farms = await apiRequest('/farms');
+        const farms = await apiRequestAll('/farms');
         const farm = farms && Array.isArray(farms) 
             ? farms.find(s => s.user_id === currentUser.id)
             : null;
@@ -2409,7 +2477,7 @@ async function renderSupplierPanel() {
                     ${farm ? `
                         <div id="supplierInfo">
                             <div class="flex gap-2 mb-4">
-                                <img src="${farm.image ? `data:image/jpeg;base64,${farm.image}` : '/static/images/default-farm.jpg'}" alt="${farm.name}" style="width: 128px; height: 128px; object-fit: cover; border-radius: 0.5rem;">
+                                <img src="${imageKeyUrl(farm.image_key, 160, '/static/images/default-farm.jpg')}" alt="${farm.name}" style="width: 128px; height: 128px; object-fit: cover; border-radius: 0.5rem;">
                                 <div style="flex: 1;">
                                     <div class="flex gap-1 mb-2" style="align-items: center;">
                                         <h3>${farm.name}</h3>
@@ -2466,12 +2534,10 @@ async function renderSupplierPanel() {
         `;
 
         if (farm) {
-            const products = await apiRequest('/products');
+            const products = await apiRequestAll(`/products?farm_id=${farm.id}`);
             const categories = await loadCategories();
             const supplierProducts = products && Array.isArray(products) 
-                ? products
-                    .filter(p => p.farm_id === farm.id)
-                    .map(p => formatProductData(p, [farm], categories))
+                ? products.map(p => formatProductData(p, [farm], categories))
                 : [];
             
             html += `
@@ -2656,7 +2722,7 @@ async function saveSupplierPanelInfo(e) {
     }
 
     try {
-        const farms = await apiRequest('/farms');
+        const farms = await apiRequestAll('/farms');
         const farm = farms && Array.isArray(farms) 
             ? farms.find(s => s.user_id === currentUser.id)
             : null;
@@ -2777,7 +2843,7 @@ async function saveSupplierProduct(e) {
     }
 
     try {
-        const farms = await apiRequest('/farms');
+        const farms = await apiRequestAll('/farms');
         const farm = farms && Array.isArray(farms) 
             ? farms.find(s => s.user_id === currentUser.id)
             : null;
@@ -0,0 +1,266 @@
+"""Сборка статики: минификация, имена с хешем содержимого и заранее сжатые копии.
+
+    python -m app.utils.assets
+
+Результат пишется в app/static/dist вместе с manifest.json; шаблоны получают
+имена файлов через asset_url(), поэтому без сборки отдаются исходные файлы.
+Файлы прошлых сборок не удаляются сразу: их еще запрашивают страницы, открытые
+до пересборки. prune_assets() удаляет те из них, что старше ASSET_RETENTION.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость, без нее собираются только .gz
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST_PATH = DIST_DIR / "manifest.json"
+
+ASSETS = ("css/index.css", "js/app.js")
+# Сколько секунд хранятся файлы прошлых сборок
+ASSET_RETENTION = 7 * 24 * 60 * 60
+
+_IDENTIFIER = re.compile(r"[\w$\u0080-\uffff]")
+# После этих слов "/" начинает регулярное выражение, а не деление
+_REGEX_KEYWORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw", "instanceof", "yield", "await",
+}
+# Перевод строки можно убрать, если до него или после него стоит такой символ: ASI здесь не срабатывает
+_JOIN_AFTER = set("{([,;:=&|?*%<>!~^")
+_JOIN_BEFORE = set(")]},;:?.=")
+
+
+def _is_identifier(char: str) -> bool:
+    return bool(char) and bool(_IDENTIFIER.match(char))
+
+
+def _skip_string(source: str, start: int) -> int:
+    quote, i = source[start], start + 1
+    while i < len(source) and source[i] != quote:
+        i += 2 if source[i] == "\\" else 1
+    return i + 1
+
+
+def _skip_template(source: str, start: int) -> int:
+    i = start + 1
+    while i < len(source) and source[i] != "`":
+        if source[i] == "\\":
+            i += 2
+        elif source.startswith("${", i):
+            i = _skip_code_block(source, i + 2)
+        else:
+            i += 1
+    return i + 1
+
+
+def _skip_code_block(source: str, start: int) -> int:
+    """Выражение внутри ${...}: доходит до парной закрывающей скобки"""
+    depth, i = 1, start
+    while i < len(source):
+        char = source[i]
+        if char in "'\"":
+            i = _skip_string(source, i)
+        elif char == "`":
+            i = _skip_template(source, i)
+        elif char == "{":
+            depth, i = depth + 1, i + 1
+        elif char == "}":
+            depth, i = depth - 1, i + 1
+            if depth == 0:
+                return i
+        else:
+            i += 1
+    return i
+
+
+def _skip_regex(source: str, start: int) -> int:
+    i, in_class = start + 1, False
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            i += 1
+            break
+        i += 1
+    while i < len(source) and _is_identifier(source[i]):
+        i += 1
+    return i
+
+
+def js_tokens(source: str):
+    """Токены JS без пробелов и комментариев: (токен, был ли перед ним перевод строки)"""
+    i, newline, previous = 0, False, ""
+    while i < len(source):
+        char = source[i]
+        if char.isspace():
+            newline = newline or char == "\n"
+            i += 1
+            continue
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = len(source) if end == -1 else end
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            end = len(source) if end == -1 else end + 2
+            newline = newline or "\n" in source[i:end]
+            i = end
+            continue
+
+        if char in "'\"":
+            end = _skip_string(source, i)
+        elif char == "`":
+            end = _skip_template(source, i)
+        elif source.startswith(("++", "--"), i):
+            # Инкремент - один токен: иначе минификатор разделил бы его пробелом на два унарных оператора
+            end = i + 2
+        elif char == "/" and (not previous or previous in _REGEX_KEYWORDS or not (
+            _is_identifier(previous[-1]) or previous[-1] in ")]" or previous in ("++", "--")
+        )):
+            end = _skip_regex(source, i)
+        elif _is_identifier(char):
+            end = i + 1
+            while end < len(source) and _is_identifier(source[end]):
+                end += 1
+        else:
+            end = i + 1
+        token = source[i:end]
+        yield token, newline
+        previous, newline, i = token, False, end
+
+
+def minify_js(source: str) -> str:
+    """Консервативная минификация: убирает комментарии и пробелы, не трогая литералы.
+
+    Перевод строки сохраняется везде, где от него может зависеть автоматическая вставка ";".
+    """
+    output: list[str] = []
+    previous = ""
+    for token, newline in js_tokens(source):
+        if previous:
+            if newline and previous[-1] not in _JOIN_AFTER and token[0] not in _JOIN_BEFORE:
+                output.append("\n")
+            elif (_is_identifier(previous[-1]) and _is_identifier(token[0])) or (
+                previous[-1] in "+-/" and token[0] in "+-/"
+            ):
+                output.append(" ")
+        output.append(token)
+        previous = token
+    return "".join(output)
+
+
+_CSS_TOKEN = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)|([^"'/]+|/)""", re.S)
+_CSS_SPACE_AROUND = re.compile(r"\s*([{};,>~])\s*")
+_CSS_SPACE_AFTER_COLON = re.compile(r":\s+")
+
+
+def minify_css(source: str) -> str:
+    parts: list[str] = []
+    code = ""
+
+    def flush():
+        collapsed = _CSS_SPACE_AROUND.sub(r"\1", re.sub(r"\s+", " ", code))
+        parts.append(_CSS_SPACE_AFTER_COLON.sub(":", collapsed))
+
+    for string, comment, text in _CSS_TOKEN.findall(source):
+        if string:
+            flush()
+            parts.append(string)
+            code = ""
+        else:
+            # Комментарий заменяется пробелом, чтобы склеить код по обе стороны от него
+            code += " " if comment else text
+    flush()
+    return "".join(parts).replace(";}", "}").strip()
+
+
+_MINIFIERS = {".js": minify_js, ".css": minify_css}
+
+
+def build_assets() -> dict[str, str]:
+    """Собирает ASSETS в dist и возвращает манифест «исходное имя -> имя со хешем».
+
+    Файлы прошлых сборок остаются на месте: имена содержат хеш и не пересекаются с новыми,
+    а манифест заменяется атомарно после записи всех файлов.
+    """
+    manifest = {}
+    for name in ASSETS:
+        path = Path(name)
+        content = _MINIFIERS[path.suffix]((STATIC_DIR / path).read_text(encoding="utf-8")).encode()
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        target = DIST_DIR / path.with_name(f"{path.stem}.{digest}{path.suffix}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+
+        compressed = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed[".br"] = brotli.compress(content, quality=11)
+        for suffix, data in compressed.items():
+            if len(data) < len(content):
+                target.with_name(target.name + suffix).write_bytes(data)
+        manifest[name] = target.relative_to(STATIC_DIR).as_posix()
+
+    temporary = MANIFEST_PATH.with_name(MANIFEST_PATH.name + ".tmp")
+    temporary.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(temporary, MANIFEST_PATH)
+    return manifest
+
+
+def prune_assets(max_age: float = ASSET_RETENTION) -> list[Path]:
+    """Удаляет файлы прошлых сборок старше max_age секунд; текущая сборка не трогается"""
+    current = {STATIC_DIR / target for target in _manifest().values()}
+    keep = {path.with_name(path.name + suffix) for path in current for suffix in ("", ".gz", ".br")}
+    deadline = time.time() - max_age
+    removed = []
+    for path in DIST_DIR.rglob("*"):
+        if path.is_file() and path != MANIFEST_PATH and path not in keep and path.stat().st_mtime < deadline:
+            path.unlink()
+            removed.append(path)
+    return removed
+
+
+@lru_cache(maxsize=1)
+def _load_manifest(path: Path, version: tuple[int, int, int]) -> dict[str, str]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _manifest() -> dict[str, str]:
+    # Кэш привязан к версии файла: пересборка рядом с работающим сервером подхватывается без перезапуска
+    try:
+        stat = MANIFEST_PATH.stat()
+    except FileNotFoundError:
+        return {}
+    return _load_manifest(MANIFEST_PATH, (stat.st_ino, stat.st_mtime_ns, stat.st_size))
+
+
+def asset_url(name: str) -> str:
+    """URL файла статики для шаблонов: собранная версия, если она есть"""
+    return "/static/" + _manifest().get(name, name)
+
+
+if __name__ == "__main__":
+    for source, target in build_assets().items():
+        original = (STATIC_DIR / source).stat().st_size
+        sizes = ", ".join(
+            f"{path.name}: {path.stat().st_size}" for path in sorted((STATIC_DIR / target).parent.glob(Path(target).name + "*"))
+        )
+        print(f"{source} ({original}) -> {target}: {sizes}")
+    for path in prune_assets():
+        print(f"Удален файл прошлой сборки: {path.relative_to(STATIC_DIR).as_posix()}")
+    if brotli is None:
+        print("Модуль brotli не установлен: .br не собраны")
@@ -0,0 +1,66 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.config import settings
+
+
+class TTLCache:
+    """Снимок одного значения на ttl секунд; конкурентные запросы ждут один общий пересчет"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value: Any = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_or_load(self, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if time.monotonic() < self._expires_at:
+            return self._value
+        async with self._lock:
+            if time.monotonic() < self._expires_at:
+                return self._value
+            self._value = await loader()
+            self._expires_at = time.monotonic() + self.ttl
+            return self._value
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+
+class VersionedCache:
+    """Кэш справочников в памяти процесса: значения привязаны к версии таблицы и живут не дольше ttl.
+
+    Сервисы вызывают invalidate(table) после commit; версия растет, и старые значения
+    перестают отдаваться. Значение, загрузка которого пересеклась с записью, не сохраняется.
+    Версия - счетчик этого процесса, поэтому другие воркеры узнают о записи только по
+    истечении ttl: он ограничивает, сколько они отдают устаревший справочник.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._versions: defaultdict[str, int] = defaultdict(int)
+        self._entries: dict[tuple[str, Hashable], tuple[int, float, Any]] = {}
+
+    def version(self, table: str) -> int:
+        return self._versions[table]
+
+    async def get_or_load(self, table: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        version = self._versions[table]
+        entry = self._entries.get((table, key))
+        if entry is not None and entry[0] == version and time.monotonic() < entry[1]:
+            return entry[2]
+        value = await loader()
+        if self._versions[table] == version:
+            self._entries[(table, key)] = (version, time.monotonic() + self.ttl, value)
+        return value
+
+    def invalidate(self, table: str) -> None:
+        self._versions[table] += 1
+        for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == table]:
+            del self._entries[entry_key]
+
+
+# Категории, роли и тарифы подписок: маленькие таблицы, которые читаются почти в каждом запросе
+reference_cache = VersionedCache(settings.REFERENCE_CACHE_TTL)
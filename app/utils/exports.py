@@ -0,0 +1,34 @@
+import csv
+import io
+from typing import Any, Iterable, Sequence
+
+import orjson
+
+# С этих символов Excel и LibreOffice начинают формулу: такие строки экранируются апострофом
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    if isinstance(value, (list, dict)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+def csv_chunk(rows: Iterable[dict], columns: Sequence[str], header: bool = False) -> bytes:
+    """Пачка строк CSV; header=True добавляет BOM и заголовок (для первой пачки)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        buffer.write("\ufeff")
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(row.get(column)) for column in columns])
+    return buffer.getvalue().encode()
+
+
+def ndjson_chunk(rows: Iterable[dict]) -> bytes:
+    return b"".join(orjson.dumps(row) + b"\n" for row in rows)
@@ -0,0 +1,140 @@
+"""Хранилище изображений по адресу содержимого.
+
+Ключ изображения - "<sha256>.<расширение>". Оригинал лежит в originals/ab/<ключ>,
+миниатюры фиксированных ширин - в w<ширина>/ab/<sha256>.webp. Содержимое файла
+по ключу никогда не меняется, поэтому файлы отдаются с immutable-кэшем, а одинаковые
+загрузки хранятся один раз.
+"""
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import re
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterable, Optional
+
+import anyio
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.config import settings
+from app.exceptions.images import ImageTooLargeError, InvalidImageError
+
+THUMBNAIL_WIDTHS: tuple[int, ...] = (160, 320, 640)
+THUMBNAIL_EXTENSION = "webp"
+
+_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif"}
+MEDIA_TYPES = {"jpg": "image/jpeg", "png": "image/png", "webp": "image/webp", "gif": "image/gif"}
+IMAGE_KEY = re.compile(r"^(?P<digest>[0-9a-f]{64})\.(?P<extension>jpg|png|webp|gif)$")
+
+
+def image_path(root: Path, key: str, width: Optional[int] = None) -> Path:
+    digest = key.partition(".")[0]
+    if width is None:
+        return root / "originals" / digest[:2] / key
+    return root / f"w{width}" / digest[:2] / f"{digest}.{THUMBNAIL_EXTENSION}"
+
+
+def _replace(source: Path, target: Path) -> None:
+    """Атомарно кладет файл на место: параллельная загрузка того же содержимого не увидит его недописанным"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(source, target)
+
+
+def process_image(source: str, root: str, digest: str) -> str:
+    """Проверяет, что файл - изображение, и пишет миниатюры; возвращает ключ.
+
+    Выполняется в отдельном процессе: декодирование и ресайз занимают CPU на десятки миллисекунд.
+    """
+    try:
+        with Image.open(source) as image:
+            extension = _EXTENSIONS.get(image.format)
+            if extension is None:
+                raise InvalidImageError
+            image = ImageOps.exif_transpose(image)
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+            key = f"{digest}.{extension}"
+            for width in THUMBNAIL_WIDTHS:
+                thumbnail = image.copy()
+                # thumbnail() сохраняет пропорции и не увеличивает изображения, которые и так не шире width
+                thumbnail.thumbnail((width, width * 10), Image.LANCZOS)
+                target = image_path(Path(root), key, width)
+                temporary = target.with_name(f"{target.name}.{secrets.token_hex(4)}.tmp")
+                target.parent.mkdir(parents=True, exist_ok=True)
+                thumbnail.save(temporary, "WEBP", quality=80, method=4)
+                _replace(temporary, target)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError):
+        raise InvalidImageError
+    return key
+
+
+class ImageStore:
+    def __init__(self, root: str, max_bytes: int, workers: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def path(self, key: str, width: Optional[int] = None) -> Path:
+        return image_path(self.root, key, width)
+
+    def find(self, digest: str) -> Optional[str]:
+        """Ключ уже сохраненного изображения с таким содержимым"""
+        for extension in MEDIA_TYPES:
+            key = f"{digest}.{extension}"
+            if self.path(key).is_file():
+                return key
+        return None
+
+    async def save(self, chunks: AsyncIterable[bytes]) -> str:
+        """Потоково пишет загрузку во временный файл, считая SHA-256 по ходу, и возвращает ключ"""
+        temporary = self.root / "tmp" / secrets.token_hex(16)
+        await anyio.to_thread.run_sync(lambda: temporary.parent.mkdir(parents=True, exist_ok=True))
+        digest, size = hashlib.sha256(), 0
+        try:
+            async with await anyio.open_file(temporary, "wb") as file:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise ImageTooLargeError
+                    digest.update(chunk)
+                    await file.write(chunk)
+
+            existing = await anyio.to_thread.run_sync(self.find, digest.hexdigest())
+            if existing:
+                return existing
+            loop = asyncio.get_running_loop()
+            key = await loop.run_in_executor(self._get_pool(), process_image, str(temporary), str(self.root), digest.hexdigest())
+            await anyio.to_thread.run_sync(_replace, temporary, self.path(key))
+            return key
+        finally:
+            await anyio.to_thread.run_sync(lambda: temporary.unlink(missing_ok=True))
+
+    def save_bytes(self, data: bytes) -> str:
+        """Синхронное сохранение в текущем процессе - для миграций и скриптов"""
+        temporary = self.root / "tmp" / secrets.token_hex(16)
+        temporary.parent.mkdir(parents=True, exist_ok=True)
+        temporary.write_bytes(data)
+        try:
+            digest = hashlib.sha256(data).hexdigest()
+            key = self.find(digest) or process_image(str(temporary), str(self.root), digest)
+            if not self.path(key).is_file():
+                _replace(temporary, self.path(key))
+            return key
+        finally:
+            temporary.unlink(missing_ok=True)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, а не fork: к моменту первой загрузки в процессе уже работают потоки aiosqlite и anyio
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+image_store = ImageStore(settings.MEDIA_DIR, settings.IMAGE_MAX_BYTES, settings.IMAGE_WORKERS)
@@ -0,0 +1,30 @@
+import csv
+import io
+from itertools import islice
+from typing import BinaryIO
+
+# Excel в русской локали сохраняет CSV через ";", поэтому разделитель определяется по заголовку
+_DELIMITERS = ",;\t"
+
+
+def open_csv(file: BinaryIO) -> csv.DictReader:
+    """DictReader поверх загруженного файла: строки разбираются по мере чтения, BOM пропускается.
+
+    Имена колонок приводятся к нижнему регистру. UnicodeDecodeError означает, что файл не в UTF-8.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    header = text.readline()
+    try:
+        # От Sniffer берется только разделитель: по одной строке без кавычек он неверно угадывает doublequote
+        delimiter = csv.Sniffer().sniff(header, delimiters=_DELIMITERS).delimiter
+    except csv.Error:
+        delimiter = ","
+    text.seek(0)
+    reader = csv.DictReader(text, delimiter=delimiter)
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+    return reader
+
+
+def read_chunk(reader: csv.DictReader, size: int) -> list[tuple[int, dict]]:
+    """Следующие size строк вместе с номером строки в файле (для отчета об ошибках)"""
+    return [(reader.line_num, row) for row in islice(reader, size)]
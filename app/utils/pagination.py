@@ -0,0 +1,25 @@
+import base64
+import json
+from typing import Any, Optional
+
+from app.exceptions.pagination import InvalidCursorError
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Упаковывает ключ последней строки страницы в непрозрачный курсор"""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[list[Any]]:
+    """Распаковывает курсор, полученный от клиента"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursorError
+    if not isinstance(values, list) or not values:
+        raise InvalidCursorError
+    return values
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.exceptions.auth import PasswordHashingBusyError
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _lower_thread_priority() -> None:
+    """Понижает приоритет потока bcrypt (Linux): при нехватке ядер планировщик отдает CPU event loop'у"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass
+
+
+class PasswordHasher:
+    """bcrypt вне event loop: один вызов занимает CPU на сотни миллисекунд.
+
+    Пул потоков, а не процессов: bcrypt отпускает GIL на время вычисления хеша. Одновременно
+    считается не больше workers хешей; если в работе и очереди уже max_pending вызовов,
+    новый сразу получает PasswordHashingBusyError, а не ждет в растущей очереди.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="bcrypt", initializer=_lower_thread_priority)
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def ensure_capacity(self) -> None:
+        """Ранний отказ до похода в БД: отклоненный вход не должен ничего стоить"""
+        if self._pending >= self.max_pending:
+            raise PasswordHashingBusyError
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, password, hashed_password)
+
+    async def _run(self, func, *args):
+        self.ensure_capacity()
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        future = self._executor.submit(func, *args)
+        # Место освобождается, когда поток закончил работу, даже если запрос уже отменен клиентом
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,142 @@
+import re
+from typing import Optional
+
+# Стеммер Snowball для русского языка (https://snowballstem.org/algorithms/russian/stemmer.html).
+# В SQLite FTS5 нет русского токенизатора, поэтому в индекс и в запрос попадают уже стеммированные слова.
+
+_VOWELS = "аеиоуыэюя"
+
+_PERFECTIVE_GERUND = (("в", "вши", "вшись"), ("ив", "ивши", "ившись", "ыв", "ывши", "ывшись"))
+_ADJECTIVE = (
+    (),
+    (
+        "ее", "ие", "ые", "ое", "ими", "ыми", "ей", "ий", "ый", "ой", "ем", "им", "ым", "ом",
+        "его", "ого", "ему", "ому", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею",
+    ),
+)
+_PARTICIPLE = (("ем", "нн", "вш", "ющ", "щ"), ("ивш", "ывш", "ующ"))
+_REFLEXIVE = ((), ("ся", "сь"))
+_VERB = (
+    ("ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет", "ют", "ны", "ть", "ешь", "нно"),
+    (
+        "ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй", "ил", "ыл", "им", "ым", "ен",
+        "ило", "ыло", "ено", "ят", "ует", "уют", "ит", "ыт", "ены", "ить", "ыть", "ишь", "ую", "ю",
+    ),
+)
+_NOUN = (
+    (),
+    (
+        "а", "ев", "ов", "ие", "ье", "е", "иями", "ями", "ами", "еи", "ии", "и", "ией", "ей", "ой", "ий", "й",
+        "иям", "ям", "ием", "ем", "ам", "ом", "о", "у", "ах", "иях", "ях", "ы", "ь", "ию", "ью", "ю", "ия",
+        "ья", "я",
+    ),
+)
+_DERIVATIONAL = ("ост", "ость")
+_SUPERLATIVE = ("ейше", "ейш")
+
+_WORD = re.compile(r"\w+")
+_CYRILLIC = re.compile(r"[а-я]")
+
+
+def _remove_ending(rv: str, groups: tuple[tuple[str, ...], tuple[str, ...]]) -> Optional[str]:
+    """Отрезает самое длинное окончание группы; окончания первой группы - только после «а»/«я»"""
+    best, needs_a = "", False
+    for index, endings in enumerate(groups):
+        for ending in endings:
+            if len(ending) > len(best) and rv.endswith(ending):
+                best, needs_a = ending, index == 0
+    if not best:
+        return None
+    stem = rv[: -len(best)]
+    if needs_a and not stem.endswith(("а", "я")):
+        return None
+    return stem
+
+
+def _region_start(word: str, start: int) -> int:
+    """Начало области после первой согласной, следующей за гласной"""
+    for i in range(start + 1, len(word)):
+        if word[i] not in _VOWELS and word[i - 1] in _VOWELS:
+            return i + 1
+    return len(word)
+
+
+def stem_word(word: str) -> str:
+    word = word.lower().replace("ё", "е")
+    rv_start = next((i + 1 for i, char in enumerate(word) if char in _VOWELS), len(word))
+    r2_start = _region_start(word, _region_start(word, 0))
+    head, rv = word[:rv_start], word[rv_start:]
+
+    # Шаг 1
+    stem = _remove_ending(rv, _PERFECTIVE_GERUND)
+    if stem is None:
+        reflexive = _remove_ending(rv, _REFLEXIVE)
+        if reflexive is not None:
+            rv = reflexive
+        stem = _remove_ending(rv, _ADJECTIVE)
+        if stem is not None:
+            participle = _remove_ending(stem, _PARTICIPLE)
+            if participle is not None:
+                stem = participle
+        else:
+            stem = _remove_ending(rv, _VERB)
+            if stem is None:
+                stem = _remove_ending(rv, _NOUN)
+    if stem is not None:
+        rv = stem
+
+    # Шаг 2
+    if rv.endswith("и"):
+        rv = rv[:-1]
+
+    # Шаг 3: словообразовательные окончания только в R2
+    for ending in _DERIVATIONAL[::-1]:
+        if rv.endswith(ending) and rv_start + len(rv) - len(ending) >= r2_start:
+            rv = rv[: -len(ending)]
+            break
+
+    # Шаг 4
+    superlative = next((ending for ending in _SUPERLATIVE if rv.endswith(ending)), None)
+    if superlative:
+        rv = rv[: -len(superlative)]
+        if rv.endswith("нн"):
+            rv = rv[:-1]
+    elif rv.endswith("нн"):
+        rv = rv[:-1]
+    elif rv.endswith("ь"):
+        rv = rv[:-1]
+    return head + rv
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Слова текста в нижнем регистре; русские слова приводятся к основе"""
+    if not text:
+        return []
+    words = _WORD.findall(text.lower().replace("ё", "е"))
+    return [stem_word(word) if _CYRILLIC.search(word) else word for word in words]
+
+
+def to_search_text(text: Optional[str]) -> str:
+    return " ".join(tokenize(text))
+
+
+def to_match_query(query: str) -> Optional[str]:
+    """Запрос пользователя -> выражение FTS5 MATCH: все слова обязательны, последнее - по префиксу.
+
+    Однобуквенные слова (предлоги, союзы) отбрасываются: они есть почти в каждом описании.
+    """
+    terms = [term for term in tokenize(query) if len(term) > 1]
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def to_tsquery_text(query: str) -> Optional[str]:
+    """Запрос пользователя -> текст для to_tsquery в PostgreSQL (стемминг выполняет сама БД)"""
+    words = _WORD.findall(query.lower())
+    if not words:
+        return None
+    words[-1] += ":*"
+    return " & ".join(words)
@@ -0,0 +1,28 @@
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter(list[schema]) строится один раз на схему"""
+    return TypeAdapter(list[schema])
+
+
+def validate_list(schema: type[BaseModel], rows: Iterable[Any]) -> list:
+    """Строки (ORM-объекты или mappings) -> список схем одним вызовом pydantic-core, а не model_validate на строку"""
+    return list_adapter(schema).validate_python(rows, from_attributes=True)
+
+
+class ValidatedListResponse(Response):
+    """JSON-ответ из уже провалидированного списка схем.
+
+    Эндпоинт возвращает Response, поэтому FastAPI не валидирует список повторно по response_model;
+    заголовки из параметра response (ETag, X-Next-Cursor) нужно передать в headers.
+    """
+    media_type = "application/json"
+
+    def __init__(self, items: list, schema: type[BaseModel], headers: Optional[Mapping[str, str]] = None):
+        super().__init__(content=list_adapter(schema).dump_json(items), headers=headers)
@@ -0,0 +1,64 @@
+import mimetypes
+import os
+import stat
+from pathlib import PurePath
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Порядок предпочтения, если клиент принимает несколько кодировок
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Кодировки из Accept-Encoding, кроме явно запрещенных через q=0"""
+    encodings = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles, который отдает собранные файлы из dist/ заранее сжатыми и с immutable-кэшем.
+
+    Имена в dist/ содержат хеш содержимого, поэтому браузеру не нужно их перепроверять.
+    Остальные файлы отдаются как обычно.
+    """
+
+    def __init__(self, *args, build_dir: str = "dist", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.build_dir = build_dir
+
+    async def get_response(self, path: str, scope) -> FileResponse:
+        if PurePath(path).parts[:1] != (self.build_dir,):
+            return await super().get_response(path, scope)
+
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        for encoding, suffix in _PRECOMPRESSED:
+            if encoding not in encodings and "*" not in encodings:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                media_type, _ = mimetypes.guess_type(os.path.basename(path))
+                return FileResponse(
+                    full_path,
+                    stat_result=stat_result,
+                    media_type=media_type or "text/plain",
+                    headers={**headers, "Content-Encoding": encoding},
+                )
+
+        response = await super().get_response(path, scope)
+        response.headers.update(headers)
+        return response
@@ -0,0 +1,55 @@
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+from app.config import settings
+
+
+class TokenVersions:
+    """Версии токенов пользователей в памяти процесса.
+
+    Токен действителен, пока claim ver совпадает с users.token_version. Версия читается из БД
+    при первом запросе пользователя и хранится не дольше ttl секунд, дальше проверка идет без БД.
+    Смена роли и удаление пользователя обновляют таблицу после commit; удаленный пользователь
+    хранится как None. Другие воркеры узнают об отзыве, перечитав версию по истечении ttl.
+    Значение, загрузка которого пересеклась с записью, не сохраняется (как в VersionedCache).
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._versions: dict[int, tuple[float, Optional[int]]] = {}
+        self._generation = 0
+
+    async def get(self, user_id: int, loader: Callable[[int], Awaitable[Optional[int]]]) -> Optional[int]:
+        entry = self._versions.get(user_id)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        generation = self._generation
+        version = await loader(user_id)
+        if self._generation == generation:
+            self._store(user_id, version)
+        return version
+
+    def set(self, user_id: int, version: int) -> None:
+        self._generation += 1
+        self._store(user_id, version)
+
+    def revoke(self, user_id: int) -> None:
+        self._generation += 1
+        self._store(user_id, None)
+
+    def forget(self, user_ids: Iterable[int]) -> None:
+        """Версии изменены в БД массово: следующий запрос каждого пользователя перечитает свою"""
+        self._generation += 1
+        for user_id in user_ids:
+            self._versions.pop(user_id, None)
+
+    def _store(self, user_id: int, version: Optional[int]) -> None:
+        self._versions.pop(user_id, None)
+        if len(self._versions) >= self.max_size:
+            # Вытесняется самая давняя запись: это стоит лишь повторного чтения версии из БД
+            del self._versions[next(iter(self._versions))]
+        self._versions[user_id] = (time.monotonic() + self.ttl, version)
+
+
+token_versions = TokenVersions(settings.TOKEN_VERSIONS_MAX_SIZE, settings.TOKEN_VERSIONS_TTL)
@@ -1,12 +1,16 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
+from app.api.admin import router as admin_router
 from app.api.auth import router as auth_router
 from app.api.roles import router as roles_router
 from app.api.categories import router as categories_router
 from app.api.farms import router as farms_router
+from app.api.images import router as images_router
 from app.api.products import router as products_router
 from app.api.cart import router as cart_router
 from app.api.orders import router as orders_router
@@ -14,8 +18,36 @@ from app.api.order_items import router as order_items_router
 from app.api.reviews import router as reviews_router
 from app.api.subscriptions import router as subscriptions_router
 from app.api.web import router as web_router
+from app.config import settings
+from app.database.database import engine, read_engine, warm_pool
+from app.database.query_stats import QueryCounterMiddleware, install_query_listeners
+from app.database.table_versions import install_table_version_listeners
+from app.utils.images import image_store
+from app.utils.passwords import password_hasher
+from app.utils.assets import asset_url
+from app.utils.static_files import PrecompressedStaticFiles
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    engines = [engine] if read_engine is None else [engine, read_engine]
+    if settings.DB_POOL_WARMUP:
+        for db_engine in engines:
+            await warm_pool(db_engine)
+    yield
+    for db_engine in engines:
+        await db_engine.dispose()
+    image_store.shutdown()
+    password_hasher.shutdown()
+
+
+app = FastAPI(title="Прямо с грядки", version="1.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
-app = FastAPI(title="Прямо с грядки", version="1.0")
+install_query_listeners(engine)
+if read_engine is not None:
+    install_query_listeners(read_engine)
+install_table_version_listeners()
+app.add_middleware(QueryCounterMiddleware, threshold=settings.SQL_N_PLUS_ONE_THRESHOLD)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,15 +55,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-DB-Query-Count", "X-DB-Query-Time", "ETag"],
 )
 
-app.mount("/static", StaticFiles(directory="app/static"), "static")
+app.mount("/static", PrecompressedStaticFiles(directory="app/static"), "static")
 templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["asset_url"] = asset_url
 
+app.include_router(admin_router)
 app.include_router(auth_router)
 app.include_router(roles_router)
 app.include_router(categories_router)
 app.include_router(farms_router)
+app.include_router(images_router)
 app.include_router(products_router)
 app.include_router(cart_router)
 app.include_router(orders_router)
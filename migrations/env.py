@@ -20,6 +20,7 @@ from app.models.order_items import OrderItem
 from app.models.reviews import Review
 from app.models.subscription_plans import SubscriptionPlan
 from app.models.user_subscriptions import UserSubscription
+from app.models.table_versions import TableVersion
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -39,6 +40,20 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Поисковые объекты создаются DDL-событиями модели Product (app/models/products.py), а не метаданными:
+# виртуальная таблица FTS5 с ее теневыми таблицами в SQLite и GIN-индекс в PostgreSQL.
+# Без этого фильтра autogenerate предлагает их удалить.
+SEARCH_TABLE_PREFIX = "products_fts"
+SEARCH_INDEXES = {"ix_products_search"}
+
+
+def include_name(name, type_, parent_names) -> bool:
+    if type_ == "table":
+        return not name.startswith(SEARCH_TABLE_PREFIX)
+    if type_ == "index":
+        return name not in SEARCH_INDEXES
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -61,6 +76,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -70,7 +86,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_name=include_name)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,57 @@
+"""add indexes for foreign keys and filter columns
+
+Revision ID: 3b7e9a1c5d20
+Revises: d633315fc1e1
+Create Date: 2026-10-18 14:30:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e9a1c5d20'
+down_revision: Union[str, Sequence[str], None] = 'd633315fc1e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Составной индекс (user_id, product_id) покрывает и выборки только по user_id
+    op.create_index('ix_cart_user_id_product_id', 'cart', ['user_id', 'product_id'], unique=False)
+    op.create_index('ix_cart_product_id', 'cart', ['product_id'], unique=False)
+    op.create_index('ix_orders_user_id', 'orders', ['user_id'], unique=False)
+    op.create_index('ix_orders_farm_id', 'orders', ['farm_id'], unique=False)
+    op.create_index('ix_orders_status', 'orders', ['status'], unique=False)
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'], unique=False)
+    op.create_index('ix_order_items_product_id', 'order_items', ['product_id'], unique=False)
+    op.create_index('ix_reviews_user_id_product_id', 'reviews', ['user_id', 'product_id'], unique=False)
+    op.create_index('ix_reviews_user_id_farm_id', 'reviews', ['user_id', 'farm_id'], unique=False)
+    op.create_index('ix_reviews_product_id', 'reviews', ['product_id'], unique=False)
+    op.create_index('ix_reviews_farm_id', 'reviews', ['farm_id'], unique=False)
+    op.create_index('ix_products_farm_id', 'products', ['farm_id'], unique=False)
+    op.create_index('ix_products_category_id', 'products', ['category_id'], unique=False)
+    op.create_index('ix_farms_status', 'farms', ['status'], unique=False)
+    op.create_index('ix_user_subscriptions_status', 'user_subscriptions', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_subscriptions_status', table_name='user_subscriptions')
+    op.drop_index('ix_farms_status', table_name='farms')
+    op.drop_index('ix_products_category_id', table_name='products')
+    op.drop_index('ix_products_farm_id', table_name='products')
+    op.drop_index('ix_reviews_farm_id', table_name='reviews')
+    op.drop_index('ix_reviews_product_id', table_name='reviews')
+    op.drop_index('ix_reviews_user_id_farm_id', table_name='reviews')
+    op.drop_index('ix_reviews_user_id_product_id', table_name='reviews')
+    op.drop_index('ix_order_items_product_id', table_name='order_items')
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_status', table_name='orders')
+    op.drop_index('ix_orders_farm_id', table_name='orders')
+    op.drop_index('ix_orders_user_id', table_name='orders')
+    op.drop_index('ix_cart_product_id', table_name='cart')
+    op.drop_index('ix_cart_user_id_product_id', table_name='cart')
@@ -0,0 +1,47 @@
+"""add products.rating_avg and catalog filter/sort indexes
+
+Revision ID: 5d2f8b7e1a94
+Revises: 8c41f0d2a6b3
+Create Date: 2026-10-18 16:12:03.640218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8b7e1a94'
+down_revision: Union[str, Sequence[str], None] = '8c41f0d2a6b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('rating_avg', sa.Float(), nullable=False, server_default='0'))
+    op.execute(
+        """
+        UPDATE products SET rating_avg = COALESCE(
+            (SELECT AVG(reviews.rating) FROM reviews WHERE reviews.product_id = products.id), 0
+        )
+        """
+    )
+    op.create_index('ix_products_price', 'products', ['price'], unique=False)
+    op.create_index('ix_products_name', 'products', ['name'], unique=False)
+    op.create_index('ix_products_rating_avg', 'products', ['rating_avg'], unique=False)
+    op.create_index('ix_products_category_id_price', 'products', ['category_id', 'price'], unique=False)
+    op.create_index('ix_products_farm_id_price', 'products', ['farm_id', 'price'], unique=False)
+    op.create_index('ix_products_in_stock_price', 'products', ['in_stock', 'price'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_in_stock_price', table_name='products')
+    op.drop_index('ix_products_farm_id_price', table_name='products')
+    op.drop_index('ix_products_category_id_price', table_name='products')
+    op.drop_index('ix_products_rating_avg', table_name='products')
+    op.drop_index('ix_products_name', table_name='products')
+    op.drop_index('ix_products_price', table_name='products')
+    op.drop_column('products', 'rating_avg')
@@ -0,0 +1,56 @@
+"""make cart (user_id, product_id) index unique
+
+Revision ID: 8c41f0d2a6b3
+Revises: 3b7e9a1c5d20
+Create Date: 2026-10-18 15:05:41.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41f0d2a6b3'
+down_revision: Union[str, Sequence[str], None] = '3b7e9a1c5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Схлопываем дубли, накопившиеся из-за гонки в add_item: количество суммируется в строку с минимальным id
+    op.execute(
+        """
+        UPDATE cart SET quantity = (
+            SELECT totals.quantity FROM (
+                SELECT user_id, product_id, SUM(quantity) AS quantity
+                FROM cart GROUP BY user_id, product_id
+            ) AS totals
+            WHERE totals.user_id = cart.user_id AND totals.product_id = cart.product_id
+        )
+        WHERE id IN (
+            SELECT keep.id FROM (
+                SELECT MIN(id) AS id FROM cart GROUP BY user_id, product_id HAVING COUNT(*) > 1
+            ) AS keep
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM cart WHERE id NOT IN (
+            SELECT keep.id FROM (
+                SELECT MIN(id) AS id FROM cart GROUP BY user_id, product_id
+            ) AS keep
+        )
+        """
+    )
+    op.drop_index('ix_cart_user_id_product_id', table_name='cart')
+    op.create_index('ix_cart_user_id_product_id', 'cart', ['user_id', 'product_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cart_user_id_product_id', table_name='cart')
+    op.create_index('ix_cart_user_id_product_id', 'cart', ['user_id', 'product_id'], unique=False)
@@ -0,0 +1,49 @@
+"""add product full-text search (sqlite fts5 / postgresql tsvector)
+
+Revision ID: a7c3e9f14b62
+Revises: 5d2f8b7e1a94
+Create Date: 2026-10-18 17:04:51.118372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.products import PRODUCTS_FTS_DDL, PRODUCTS_TSVECTOR_INDEX_DDL
+from app.utils.search import to_search_text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f14b62'
+down_revision: Union[str, Sequence[str], None] = '5d2f8b7e1a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(PRODUCTS_TSVECTOR_INDEX_DDL)
+    elif bind.dialect.name == "sqlite":
+        op.execute(PRODUCTS_FTS_DDL)
+        # Стемминг выполняется в Python, поэтому индекс заполняется построчно из приложения
+        rows = bind.execute(sa.text("SELECT id, name, description FROM products")).all()
+        if rows:
+            bind.execute(
+                sa.text("INSERT INTO products_fts (rowid, name, description) VALUES (:id, :name, :description)"),
+                [
+                    {"id": row.id, "name": to_search_text(row.name), "description": to_search_text(row.description)}
+                    for row in rows
+                ],
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.drop_index('ix_products_search', table_name='products')
+    elif bind.dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS products_fts")
@@ -0,0 +1,28 @@
+"""add token_version to users for role claims in JWT
+
+Revision ID: b7d3f5a1c820
+Revises: e4a8b2c6d913
+Create Date: 2026-10-18 23:05:17.402861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3f5a1c820'
+down_revision: Union[str, Sequence[str], None] = 'e4a8b2c6d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,49 @@
+"""add rating sum/count/histogram aggregates to farms and products
+
+Revision ID: c91e4d7a2f38
+Revises: a7c3e9f14b62
+Create Date: 2026-10-18 17:48:26.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c91e4d7a2f38'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9f14b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ['rating_sum', 'rating_count', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+TABLES = {'farms': 'farm_id', 'products': 'product_id'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, review_key in TABLES.items():
+        for column in COLUMNS:
+            op.add_column(table, sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+        # Первичное заполнение из существующих отзывов
+        histogram = ", ".join(
+            f"rating_{n} = (SELECT COUNT(*) FROM reviews WHERE reviews.{review_key} = {table}.id AND reviews.rating = {n})"
+            for n in range(1, 6)
+        )
+        op.execute(
+            f"""
+            UPDATE {table} SET
+                rating_count = (SELECT COUNT(*) FROM reviews WHERE reviews.{review_key} = {table}.id),
+                rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM reviews WHERE reviews.{review_key} = {table}.id),
+                rating_avg = COALESCE((SELECT AVG(rating) FROM reviews WHERE reviews.{review_key} = {table}.id), 0),
+                {histogram}
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        for column in reversed(COLUMNS):
+            op.drop_column(table, column)
@@ -0,0 +1,36 @@
+"""add table_versions: ETag versions bumped in the writing transaction
+
+Revision ID: d2a6c8e0f417
+Revises: b7d3f5a1c820
+Create Date: 2026-10-19 10:42:08.615290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6c8e0f417'
+down_revision: Union[str, Sequence[str], None] = 'b7d3f5a1c820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table_versions = op.create_table(
+        'table_versions',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    # Строки версий только для таблиц со списками под ETag (app.models.table_versions.VERSIONED_TABLES)
+    names = ('products', 'farms', 'categories', 'reviews', 'subscription_plans')
+    op.bulk_insert(table_versions, [{'name': name, 'version': 0} for name in names])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('table_versions')
@@ -0,0 +1,65 @@
+"""move product and farm images from BLOB columns to the content-addressed store
+
+Revision ID: e4a8b2c6d913
+Revises: c91e4d7a2f38
+Create Date: 2026-10-18 21:12:40.537219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.exceptions.images import InvalidImageError
+from app.utils.images import image_store
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a8b2c6d913'
+down_revision: Union[str, Sequence[str], None] = 'c91e4d7a2f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('products', 'farms')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # Сначала все BLOB переносятся в хранилище, и только потом меняется схема: DDL в SQLite
+    # не откатывается, а колонка image удаляется вместе с данными
+    image_keys, invalid = {}, []
+    for table in TABLES:
+        image_keys[table] = {}
+        # BLOB читается по одной строке, чтобы не держать все изображения в памяти
+        ids = bind.execute(sa.text(f"SELECT id FROM {table} WHERE image IS NOT NULL ORDER BY id")).scalars().all()
+        for row_id in ids:
+            data = bind.execute(sa.text(f"SELECT image FROM {table} WHERE id = :id"), {"id": row_id}).scalar_one()
+            try:
+                image_keys[table][row_id] = image_store.save_bytes(data)
+            except InvalidImageError:
+                invalid.append(f"{table}.id={row_id}")
+    if invalid:
+        raise RuntimeError(
+            "Содержимое колонки image не является изображением: " + ", ".join(invalid)
+            + ". Исправьте или очистите эти значения и повторите upgrade, иначе они будут потеряны"
+        )
+
+    for table in TABLES:
+        op.add_column(table, sa.Column('image_key', sa.String(length=80), nullable=True))
+        for row_id, image_key in image_keys[table].items():
+            bind.execute(sa.text(f"UPDATE {table} SET image_key = :key WHERE id = :id"), {"key": image_key, "id": row_id})
+        op.drop_column(table, 'image')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    for table in TABLES:
+        op.add_column(table, sa.Column('image', sa.LargeBinary(), nullable=True))
+        rows = bind.execute(sa.text(f"SELECT id, image_key FROM {table} WHERE image_key IS NOT NULL")).all()
+        for row in rows:
+            path = image_store.path(row.image_key)
+            if path.is_file():
+                bind.execute(sa.text(f"UPDATE {table} SET image = :data WHERE id = :id"), {"data": path.read_bytes(), "id": row.id})
+        op.drop_column(table, 'image_key')
@@ -0,0 +1,35 @@
+"""users.id AUTOINCREMENT on SQLite: ids of deleted users are never reused
+
+Revision ID: f1c3e5a7b902
+Revises: d2a6c8e0f417
+Create Date: 2026-10-19 11:20:44.183952
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c3e5a7b902'
+down_revision: Union[str, Sequence[str], None] = 'd2a6c8e0f417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Без AUTOINCREMENT SQLite выдает новому пользователю id удаленного последним, и его токен
+    # (user_id, ver) снова становится действительным. PostgreSQL и MySQL id не переиспользуют.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('users', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('users', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+        pass
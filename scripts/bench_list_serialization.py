@@ -0,0 +1,114 @@
+"""Бенчмарк сериализации списка товаров: CPU на 10 000 строк.
+
+    python scripts/bench_list_serialization.py --rows 10000
+
+before — прежний путь: model_validate на каждую строку, serialize_response FastAPI и
+JSONResponse; after — ValidatedListResponse(validate_list(...)). Скрипт проверяет, что
+оба пути отдают одинаковый JSON, и печатает медиану process_time по 9 запускам.
+"""
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DIRECTORY = tempfile.mkdtemp(prefix="from_garden_bench_")
+atexit.register(shutil.rmtree, DIRECTORY, ignore_errors=True)
+os.environ.setdefault("SECRET_KEY", "bench-secret-key-at-least-32-bytes-long")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ["DB_NAME"] = os.path.join(DIRECTORY, "bench.db")
+os.environ["MEDIA_DIR"] = os.path.join(DIRECTORY, "media")
+sys.path.insert(0, str(ROOT))
+
+import main  # noqa: E402,F401  регистрирует все модели
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database.database import Base  # noqa: E402
+from app.models.categories import Category  # noqa: E402
+from app.models.farms import Farm  # noqa: E402
+from app.models.products import Product  # noqa: E402
+from app.models.roles import Role  # noqa: E402
+from app.models.users import User  # noqa: E402
+from app.schemes.products import SProductGet  # noqa: E402
+from app.utils.serialization import ValidatedListResponse, validate_list  # noqa: E402
+
+FIELD = create_model_field(name="Response", type_=list[SProductGet], mode="serialization")
+
+
+def load_rows(count: int) -> list[Product]:
+    engine = create_engine(f"sqlite:///{os.environ['DB_NAME']}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(insert(Role), [{"id": 3, "name": "farmer"}])
+        session.execute(
+            insert(User),
+            [{"id": 1, "email": "farmer@example.com", "username": "farmer", "role_id": 3, "hashed_password": "-"}],
+        )
+        session.execute(insert(Farm), [{"id": 1, "user_id": 1, "name": "Ферма", "address": "Адрес", "status": "approved"}])
+        session.execute(insert(Category), [{"id": 1, "name": "Овощи"}])
+        session.execute(
+            insert(Product),
+            [
+                {
+                    "farm_id": 1,
+                    "category_id": 1,
+                    "name": f"Товар {i}",
+                    "description": "Описание товара " * 4,
+                    "unit": "кг",
+                    "price": 10 + i % 500,
+                    "quantity": i % 50,
+                    "in_stock": True,
+                }
+                for i in range(count)
+            ],
+        )
+        session.commit()
+        rows = session.scalars(select(Product)).all()
+    engine.dispose()
+    return rows
+
+
+def before(rows: list[Product]) -> bytes:
+    models = [SProductGet.model_validate(row, from_attributes=True) for row in rows]
+    content = asyncio.run(serialize_response(field=FIELD, response_content=models, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def after(rows: list[Product]) -> bytes:
+    return ValidatedListResponse(validate_list(SProductGet, rows), SProductGet).body
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=9)
+    args = parser.parse_args()
+
+    rows = load_rows(args.rows)
+    assert json.loads(before(rows)) == json.loads(after(rows)), "пути сериализации расходятся"
+    for function in (before, after):
+        times = []
+        for _ in range(args.runs):
+            start = time.process_time()
+            function(rows)
+            times.append(time.process_time() - start)
+        print(
+            f"{function.__name__:6s} медиана {statistics.median(times) * 1000:6.1f} мс CPU "
+            f"на {len(rows)} строк (min {min(times) * 1000:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    run()
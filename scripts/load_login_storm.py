@@ -0,0 +1,145 @@
+"""Нагрузочный тест: задержка каталога во время шторма входов.
+
+    python scripts/load_login_storm.py --storm 100 --duration 8
+
+Скрипт создает временную БД (пользователь и 500 товаров), запускает uvicorn и меряет
+GET /products?limit=20 от четырех клиентов сначала без нагрузки, затем вместе со storm
+клиентами, которые в цикле выполняют POST /auth/login и соблюдают Retry-After.
+Переменные окружения (PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING и др.) передаются серверу.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+EMAIL = "load@example.com"
+PASSWORD = "secret1"
+
+
+def prepare_environment(directory: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "load-test-secret-key-at-least-32-bytes")
+    env.setdefault("ALGORITHM", "HS256")
+    env.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    env["DB_NAME"] = os.path.join(directory, "load.db")
+    env["MEDIA_DIR"] = os.path.join(directory, "media")
+    return env
+
+
+def seed(env: dict[str, str]) -> None:
+    """Схема из моделей и данные; выполняется в отдельном процессе с окружением сервера"""
+    code = f"""
+import asyncio
+from passlib.context import CryptContext
+from sqlalchemy import insert
+import main
+from app.database.database import Base, engine
+from app.models.categories import Category
+from app.models.farms import Farm
+from app.models.products import Product
+from app.models.roles import Role
+from app.models.users import User
+
+async def seed():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Role), [{{"id": 1, "name": "admin"}}, {{"id": 2, "name": "customer"}}, {{"id": 3, "name": "farmer"}}])
+        await conn.execute(insert(User), [
+            {{"id": 1, "email": "farmer@example.com", "username": "farmer", "role_id": 3, "hashed_password": "-"}},
+            {{"id": 2, "email": {EMAIL!r}, "username": "load", "role_id": 2,
+             "hashed_password": CryptContext(schemes=["bcrypt"]).hash({PASSWORD!r})}},
+        ])
+        await conn.execute(insert(Farm), [{{"id": 1, "user_id": 1, "name": "Ферма", "address": "Адрес", "status": "approved"}}])
+        await conn.execute(insert(Category), [{{"id": 1, "name": "Овощи"}}])
+        await conn.execute(insert(Product), [
+            {{"farm_id": 1, "category_id": 1, "name": f"Товар {{i}}", "unit": "кг", "price": 10 + i, "quantity": 1, "in_stock": True}}
+            for i in range(500)
+        ])
+    await engine.dispose()
+
+asyncio.run(seed())
+"""
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+async def poll_catalog(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/products", params={"limit": 20})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+
+async def login_loop(client: httpx.AsyncClient, stop: asyncio.Event, codes: dict[int, int]) -> None:
+    while not stop.is_set():
+        response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        codes[response.status_code] = codes.get(response.status_code, 0) + 1
+        if response.status_code == 503:
+            await asyncio.sleep(float(response.headers.get("retry-after", 1)))
+
+
+async def phase(base_url: str, storm: int, duration: float) -> None:
+    limits = httpx.Limits(max_connections=storm + 20, max_keepalive_connections=storm + 20)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        stop, latencies, codes = asyncio.Event(), [], {}
+        tasks = [asyncio.create_task(poll_catalog(client, stop, latencies)) for _ in range(4)]
+        tasks += [asyncio.create_task(login_loop(client, stop, codes)) for _ in range(storm)]
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+    print(
+        f"storm={storm:3d}: catalog n={len(latencies)} p50={percentile(latencies, 0.5):.1f} мс "
+        f"p99={percentile(latencies, 0.99):.1f} мс max={max(latencies) * 1000:.0f} мс; "
+        f"входов {sum(codes.values()) / duration:.1f}/с, коды {codes}"
+    )
+
+
+async def run(base_url: str, storm: int, duration: float) -> None:
+    await phase(base_url, 0, duration)
+    await phase(base_url, storm, duration)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--storm", type=int, default=100, help="число клиентов, выполняющих вход")
+    parser.add_argument("--duration", type=float, default=8.0, help="длительность каждой фазы, с")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="from_garden_load_") as directory:
+        env = prepare_environment(directory)
+        seed(env)
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=ROOT,
+            env=env,
+        )
+        try:
+            for _ in range(100):
+                try:
+                    httpx.get(base_url + "/products")
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+            asyncio.run(run(base_url, args.storm, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+
+# Настройки читаются при импорте app.config: тесты работают с отдельной БД и каталогом изображений
+_TMP_DIR = tempfile.mkdtemp(prefix="from_garden_tests_")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-at-least-32-bytes-long")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ["DB_NAME"] = os.path.join(_TMP_DIR, "test.db")
+os.environ["MEDIA_DIR"] = os.path.join(_TMP_DIR, "media")
+os.environ.pop("DB_READ_URL", None)
+
+import httpx
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import event, insert
+
+import main
+from app.database.database import Base, engine
+from app.models.categories import Category
+from app.models.farms import Farm
+from app.models.products import Product
+from app.models.roles import Role
+from app.models.subscription_plans import SubscriptionPlan
+from app.models.users import User
+
+PASSWORD = "secret1"
+PRODUCTS_COUNT = 250
+
+USERS = {
+    "admin": {"id": 1, "email": "admin@example.com", "username": "admin", "role_id": 1},
+    "customer": {"id": 2, "email": "customer@example.com", "username": "customer", "role_id": 2},
+    "farmer": {"id": 3, "email": "farmer@example.com", "username": "farmer", "role_id": 3},
+}
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def database(anyio_backend):
+    """Схема из моделей (вместе с FTS5) и небольшой каталог: три пользователя, ферма, 250 товаров"""
+    hashed_password = CryptContext(schemes=["bcrypt"]).hash(PASSWORD)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Role), [{"id": 1, "name": "admin"}, {"id": 2, "name": "customer"}, {"id": 3, "name": "farmer"}])
+        await conn.execute(insert(User), [{**user, "hashed_password": hashed_password} for user in USERS.values()])
+        await conn.execute(insert(Farm), [{"id": 1, "user_id": 3, "name": "Ферма", "address": "Адрес", "status": "approved"}])
+        await conn.execute(insert(Category), [{"id": 1, "name": "Овощи"}, {"id": 2, "name": "Фрукты"}])
+        await conn.execute(insert(SubscriptionPlan), [{"name": "Базовый", "price": 10, "delivery_frequency": "weekly"}])
+        await conn.execute(insert(Product), [
+            {
+                "farm_id": 1,
+                "category_id": 1 + i % 2,
+                "name": f"Товар {i}",
+                "unit": "кг",
+                "price": 10.0 + i,
+                "quantity": i % 5,
+                "in_stock": bool(i % 5),
+                "description": f"Описание {i}",
+            }
+            for i in range(PRODUCTS_COUNT)
+        ])
+    yield
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        yield client
+
+
+async def login(client: httpx.AsyncClient, email: str) -> None:
+    response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    client.cookies.clear()
+    client.cookies.set("access_token", response.json()["access_token"])
+
+
+@pytest.fixture
+def executed_sql():
+    """SQL, выполненный основным движком за время теста: (statement, parameters)"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
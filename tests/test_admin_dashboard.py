@@ -0,0 +1,91 @@
+"""Статистика админ-панели: все счетчики одним запросом и снимок на DASHBOARD_STATS_TTL секунд"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete, func, insert, select
+
+from app.config import settings
+from app.database.database import async_session_maker, engine
+from app.database.db_manager import DBManager
+from app.database.query_stats import query_budget
+from app.models.farms import Farm
+from app.models.orders import Order
+from app.models.products import Product
+from app.models.reviews import Review
+from app.models.users import User
+from app.services import admin
+from app.services.admin import AdminService
+from app.utils import cache
+from tests.conftest import USERS, login
+
+pytestmark = pytest.mark.anyio
+
+
+async def expected_stats() -> dict:
+    """Те же счетчики отдельными запросами"""
+    async with engine.connect() as conn:
+        async def count(model, *where):
+            return (await conn.execute(select(func.count()).select_from(model).where(*where))).scalar_one()
+
+        revenue = select(func.coalesce(func.sum(Order.total_amount), 0.0)).where(Order.status != "cancelled")
+        return {
+            "total_users": await count(User),
+            "total_farms": await count(Farm),
+            "total_products": await count(Product),
+            "total_orders": await count(Order),
+            "total_reviews": await count(Review),
+            "pending_orders": await count(Order, Order.status == "pending"),
+            "total_revenue": (await conn.execute(revenue)).scalar_one(),
+        }
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Управляемые часы TTL-кэша; снимок сбрасывается до и после теста"""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now.value))
+    admin._dashboard_stats_cache.invalidate()
+    yield now
+    admin._dashboard_stats_cache.invalidate()
+
+
+async def get_stats() -> dict:
+    async with DBManager(session_factory=async_session_maker) as db:
+        return await AdminService(db).get_dashboard_stats()
+
+
+async def test_dashboard_stats_single_query_and_ttl_snapshot(clock):
+    expected = await expected_stats()
+    with query_budget(1):
+        stats = await get_stats()
+    assert stats == expected
+
+    async with engine.begin() as conn:
+        product_id = (await conn.execute(
+            insert(Product)
+            .values(farm_id=1, category_id=1, name="Товар для статистики", unit="кг", price=1, quantity=1, in_stock=True)
+            .returning(Product.id)
+        )).scalar_one()
+    try:
+        # В пределах TTL отдается снимок без обращения к БД
+        clock.value += settings.DASHBOARD_STATS_TTL - 1
+        with query_budget(0):
+            assert await get_stats() == expected
+
+        clock.value += 2
+        with query_budget(1):
+            stats = await get_stats()
+        assert stats == {**expected, "total_products": expected["total_products"] + 1}
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(Product).where(Product.id == product_id))
+
+
+async def test_dashboard_endpoint(client, clock):
+    await login(client, USERS["customer"]["email"])
+    assert (await client.get("/admin/dashboard")).status_code == 403
+
+    await login(client, USERS["admin"]["email"])
+    response = await client.get("/admin/dashboard")
+    assert response.status_code == 200
+    assert response.json() == await expected_stats()
@@ -0,0 +1,102 @@
+"""Сборка статики: минификатор не меняет поведение JS и CSS, пересборка не ломает открытые страницы"""
+import os
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from app.utils import assets
+from app.utils.assets import minify_css, minify_js
+
+node = shutil.which("node")
+requires_node = pytest.mark.skipif(node is None, reason="нужен Node.js")
+
+
+def run_node(source: str) -> str:
+    result = subprocess.run([node, "-e", source], capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+@requires_node
+def test_minified_app_js_is_valid(tmp_path):
+    path = tmp_path / "app.min.js"
+    path.write_text(minify_js((assets.STATIC_DIR / "js/app.js").read_text(encoding="utf-8")), encoding="utf-8")
+    result = subprocess.run([node, "--check", str(path)], capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+
+
+@requires_node
+@pytest.mark.parametrize(
+    "source",
+    [
+        "const a = 10 / 2 / 5; const b = [8][0] / 4; console.log(a, b)",
+        "const x = 4\n/2/1\nconsole.log(x)",
+        "const r = /[/]\\/ab+c/gi; console.log(r.source, r.flags, 'x/'.replace(/\\//g, '|'))",
+        "function f(s) { return /^a.*z$/.test(s) } console.log(f('abz'), typeof /x/)",
+        "const n = 2; const s = `${ {a: n}.a } ${`вложенный ${n + 1}`} // не комментарий /* и это */`; console.log(s)",
+        "console.log('a // b', \"c /* d */\", 'e\\'f')",
+        "let i = 1\nlet j = i\n++i\nconsole.log(i, j)",
+        "const a = 5\nconst b = a\n-1\nconsole.log(a, b, 5 - -1, 5 + +1)",
+        "let a = 5; let b = a++ + ++a; let c = a-- - --a; console.log(a, b, c, a++ / 2, [a--] / 2)",
+        "const o = {\n  a: 1, // комментарий\n  /* блок */ b: [1,\n 2]\n}\nconsole.log(JSON.stringify(o))",
+        "function g() {\n  return\n  42\n}\nconsole.log(g())",
+    ],
+)
+def test_minified_js_behaves_like_source(source):
+    assert run_node(minify_js(source)) == run_node(source)
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        (".a .b { color: red ; }", ".a .b{color:red}"),
+        # Пробел перед двоеточием значим в селекторе: "a :hover" и "a:hover" различаются
+        ("a :hover { color: red }", "a :hover{color:red}"),
+        ("/* c */ a > b , c ~ d { margin: 0 auto; }", "a>b,c~d{margin:0 auto}"),
+        ('a::after { content: "  /* не комментарий */  "; }', 'a::after{content:"  /* не комментарий */  "}'),
+        ("@media (max-width: 768px) { .x { display: none; } }", "@media (max-width:768px){.x{display:none}}"),
+    ],
+)
+def test_minify_css(source, expected):
+    assert minify_css(source) == expected
+
+
+def test_minified_index_css_keeps_every_rule():
+    source = (assets.STATIC_DIR / "css/index.css").read_text(encoding="utf-8")
+    minified = minify_css(source)
+    without_comments = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    assert re.sub(r"\s+", "", without_comments).replace(";}", "}") == re.sub(r"\s+", "", minified)
+
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    """Копия исходников статики во временном каталоге"""
+    for name in assets.ASSETS:
+        target = tmp_path / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(assets.STATIC_DIR / name, target)
+    monkeypatch.setattr(assets, "STATIC_DIR", tmp_path)
+    monkeypatch.setattr(assets, "DIST_DIR", tmp_path / "dist")
+    monkeypatch.setattr(assets, "MANIFEST_PATH", tmp_path / "dist" / "manifest.json")
+    return tmp_path
+
+
+def test_rebuild_keeps_previous_files_until_pruned(static_dir):
+    first = assets.build_assets()
+    assert assets.asset_url("js/app.js") == "/static/" + first["js/app.js"]
+
+    with open(static_dir / "js/app.js", "a", encoding="utf-8") as file:
+        file.write("\nconsole.log('новая сборка');\n")
+    second = assets.build_assets()
+    assert second["js/app.js"] != first["js/app.js"]
+    # Манифест перечитан без перезапуска, а файл прошлой сборки еще отдается
+    assert assets.asset_url("js/app.js") == "/static/" + second["js/app.js"]
+    assert (static_dir / first["js/app.js"]).is_file()
+
+    assert assets.prune_assets() == []
+    old = static_dir / first["js/app.js"]
+    os.utime(old, (0, 0))
+    assert assets.prune_assets() == [old]
+    assert all((static_dir / target).is_file() for target in second.values())
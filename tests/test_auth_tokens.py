@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import update
+
+from app.database.database import async_session_maker, engine
+from app.database.db_manager import DBManager
+from app.database.query_stats import collect_queries
+from app.models.users import User
+from app.services.admin import AdminService
+from app.services.auth import AuthService
+from app.utils import token_versions as token_versions_module
+from tests.conftest import login
+
+pytestmark = pytest.mark.anyio
+
+
+async def register(client, name: str) -> int:
+    email = f"{name}@example.com"
+    response = await client.post("/auth/register", json={"email": email, "username": name, "password": "secret1"})
+    assert response.status_code == 200, response.text
+    await login(client, email)
+    return AuthService.decode_token(client.cookies["access_token"])["user_id"]
+
+
+async def test_authorization_uses_claims_without_users_lookup(client):
+    await register(client, "claims_user")
+    assert (await client.get("/orders")).status_code == 200
+
+    with collect_queries() as stats:
+        assert (await client.get("/orders")).status_code == 200
+        assert (await client.get("/orders/all")).status_code == 403
+    assert not [shape for shape in stats.shapes if "FROM users" in shape]
+
+
+async def test_role_change_revokes_token(client):
+    user_id = await register(client, "promoted_user")
+    assert (await client.get("/orders/all")).status_code == 403
+
+    async with DBManager(session_factory=async_session_maker) as db:
+        await AdminService(db).change_user_role(user_id, "admin")
+
+    assert (await client.get("/orders")).status_code == 401
+    await login(client, "promoted_user@example.com")
+    assert (await client.get("/orders/all")).status_code == 200
+
+
+async def test_deleted_user_token_is_rejected(client):
+    user_id = await register(client, "deleted_user")
+    deleted_token = client.cookies["access_token"]
+    async with DBManager(session_factory=async_session_maker) as db:
+        await AdminService(db).delete_user(user_id)
+    assert (await client.get("/orders")).status_code == 401
+
+    # id удаленного пользователя не переиспользуется, и его токен не оживает вместе с новой учетной записью
+    assert await register(client, "next_user") != user_id
+    client.cookies.set("access_token", deleted_token)
+    assert (await client.get("/orders")).status_code == 401
+
+
+async def test_revocation_by_another_worker_applies_after_ttl(client, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(token_versions_module, "time", SimpleNamespace(monotonic=lambda: now))
+    user_id = await register(client, "remote_user")
+    assert (await client.get("/orders")).status_code == 200
+
+    # Роль сменил другой воркер: версия в БД выросла, а таблица этого процесса о ней не знает
+    async with engine.begin() as conn:
+        await conn.execute(update(User).where(User.id == user_id).values(token_version=User.token_version + 1))
+    assert (await client.get("/orders")).status_code == 200
+
+    now += token_versions_module.token_versions.ttl + 1
+    assert (await client.get("/orders")).status_code == 401
+
+
+async def test_token_without_role_claims_is_rejected(client):
+    legacy = AuthService._create_access_token(None, {"sub": "customer@example.com", "user_id": 2})
+    client.cookies.set("access_token", legacy)
+    assert (await client.get("/orders")).status_code == 401
+
+
+async def test_token_version_miss_reuses_request_session(client):
+    user_id = await register(client, "one_connection_user")
+    token_versions_module.token_versions.forget([user_id])
+    metrics = engine.pool.metrics
+    checkouts = metrics.checkouts
+
+    with collect_queries() as stats:
+        assert (await client.get("/orders")).status_code == 200
+    # Версия токена и заказы читаются через одно соединение запроса
+    assert [shape for shape in stats.shapes if "FROM users" in shape]
+    assert metrics.checkouts - checkouts == 1
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import cache
+from app.utils.cache import VersionedCache
+
+pytestmark = pytest.mark.anyio
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+async def test_versioned_cache_reloads_after_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now))
+    reference = VersionedCache(ttl=30)
+    loader = Loader()
+
+    assert await reference.get_or_load("roles", "all", loader) == 1
+    assert await reference.get_or_load("roles", "all", loader) == 1
+    # Запись другим воркером этот процесс не видит: значение обновляется по истечении ttl
+    now += 31
+    assert await reference.get_or_load("roles", "all", loader) == 2
+
+
+async def test_versioned_cache_drops_value_loaded_during_invalidation():
+    reference = VersionedCache(ttl=30)
+
+    async def loader():
+        reference.invalidate("roles")
+        return "stale"
+
+    assert await reference.get_or_load("roles", "all", loader) == "stale"
+    assert await reference.get_or_load("roles", "all", Loader()) == 1
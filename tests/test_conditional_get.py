@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import select, update
+
+from app.api.dependencies import conditional_get
+from app.database.database import engine
+from app.database.query_stats import query_budget
+from app.models.table_versions import TableVersion
+from tests.conftest import USERS, login
+
+pytestmark = pytest.mark.anyio
+
+
+async def table_version(name: str) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(TableVersion.version).where(TableVersion.name == name))).scalar_one()
+
+
+async def test_not_modified_skips_loading_rows(client):
+    etag = (await client.get("/products?limit=100")).headers["etag"]
+
+    with query_budget(1):
+        response = await client.get("/products?limit=100", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+async def test_commit_bumps_version_in_database(client):
+    before = await table_version("categories")
+    etag = (await client.get("/categories")).headers["etag"]
+
+    await login(client, USERS["admin"]["email"])
+    response = await client.post("/categories", json={"name": "Ягоды"})
+    assert response.status_code == 200, response.text
+
+    assert await table_version("categories") == before + 1
+    response = await client.get("/categories", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_write_from_another_worker_changes_etag(client):
+    etag = (await client.get("/reviews")).headers["etag"]
+
+    # Другой воркер меняет версию в своей транзакции записи; этот процесс о ней ничего не знает
+    async with engine.begin() as conn:
+        await conn.execute(update(TableVersion).where(TableVersion.name == "reviews").values(version=TableVersion.version + 1))
+
+    response = await client.get("/reviews", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_write_to_unversioned_table_skips_table_versions(client, executed_sql):
+    # Корзина не отдается с ETag: запись в нее не должна блокировать общую строку версии
+    await login(client, USERS["customer"]["email"])
+    response = await client.post("/cart/items", json={"product_id": 3, "quantity": 1})
+    assert response.status_code == 200, response.text
+    await client.delete("/cart/items/3")
+    assert not [statement for statement, _ in executed_sql if "table_versions" in statement]
+
+
+def test_conditional_get_rejects_unversioned_table():
+    with pytest.raises(ValueError):
+        conditional_get("cart")
+
+
+@pytest.mark.parametrize("path", ["/categories", "/subscriptions/plans"])
+async def test_cached_list_serves_etag_without_queries(client, path):
+    etag = (await client.get(path)).headers["etag"]
+
+    with query_budget(0):
+        response = await client.get(path)
+        assert response.status_code == 200
+        assert response.headers["etag"] == etag
+        response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
@@ -0,0 +1,29 @@
+"""Профиль SQLite применяется к каждому новому соединению движка"""
+import pytest
+from sqlalchemy import text
+
+from app.config import settings
+from app.database.database import engine
+
+pytestmark = pytest.mark.anyio
+
+SYNCHRONOUS = {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3}
+TEMP_STORE = {"DEFAULT": 0, "FILE": 1, "MEMORY": 2}
+
+
+async def pragma(name: str):
+    async with engine.connect() as conn:
+        return (await conn.execute(text(f"PRAGMA {name}"))).scalar_one()
+
+
+async def test_sql_echo_is_off_by_default():
+    assert settings.DB_ECHO is False
+    assert engine.echo is False
+
+
+async def test_connection_uses_configured_pragmas():
+    assert (await pragma("journal_mode")).lower() == settings.SQLITE_JOURNAL_MODE.lower()
+    assert await pragma("synchronous") == SYNCHRONOUS[settings.SQLITE_SYNCHRONOUS.upper()]
+    assert await pragma("busy_timeout") == settings.SQLITE_BUSY_TIMEOUT
+    assert await pragma("cache_size") == settings.SQLITE_CACHE_SIZE
+    assert await pragma("temp_store") == TEMP_STORE[settings.SQLITE_TEMP_STORE.upper()]
@@ -0,0 +1,107 @@
+"""DBManager создает сессию и репозитории лениво: запрос без обращения к БД их не получает"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.api import dependencies
+from app.config import settings
+from app.database.database import async_session_maker, create_db_engine
+from app.database.db_manager import DBManager
+
+pytestmark = pytest.mark.anyio
+
+
+def _unexpected_session():
+    raise AssertionError("сессия не должна создаваться")
+
+
+async def test_unused_manager_opens_no_session():
+    async with DBManager(session_factory=_unexpected_session) as db:
+        pass
+    assert db._session is None
+
+
+async def test_repository_built_on_first_access_and_cached():
+    async with DBManager(session_factory=async_session_maker) as db:
+        assert "products" not in vars(db)
+        products = db.products
+        assert db.products is products
+        assert products.session is db.session
+        # Вторая ленивая сессия не создается: все репозитории работают в одной
+        assert db.users.session is products.session
+
+
+async def test_unknown_attribute_is_attribute_error():
+    async with DBManager(session_factory=_unexpected_session) as db:
+        with pytest.raises(AttributeError):
+            db.missing
+
+
+async def test_request_rejected_by_auth_runs_no_queries(client, executed_sql):
+    response = await client.get("/orders/all")
+    assert response.status_code == 401
+    assert executed_sql == []
+
+
+class _RecordingFactory:
+    """Обертка над фабрикой сессий: запоминает созданные сессии"""
+
+    def __init__(self):
+        self.sessions = []
+
+    def __call__(self):
+        session = async_session_maker()
+        self.sessions.append(session)
+        return session
+
+
+@pytest.mark.parametrize("method, uses_replica", [("GET", True), ("HEAD", True), ("POST", False), ("DELETE", False)])
+async def test_get_db_routes_reads_to_replica(monkeypatch, method, uses_replica):
+    replica = _RecordingFactory()
+    monkeypatch.setattr(dependencies, "async_read_session_maker", replica)
+    generator = dependencies.get_db(SimpleNamespace(method=method))
+    db = await anext(generator)
+    try:
+        assert (db.read_session_factory is replica) is uses_replica
+        db.products
+        assert (replica.sessions == [db.session]) is uses_replica
+    finally:
+        await generator.aclose()
+
+
+async def test_use_primary_rebinds_repositories():
+    primary, replica = _RecordingFactory(), _RecordingFactory()
+    async with DBManager(session_factory=primary, read_session_factory=replica) as db:
+        products, users = db.products, db.users
+        assert replica.sessions == [products.session] and primary.sessions == []
+        await db.use_primary()
+        assert primary.sessions == [db.session]
+        # Сервисы держат ссылки на репозитории: те же объекты должны работать в основной сессии
+        assert db.products is products and products.session is db.session
+        assert users.session is db.session
+        # Повторный вызов ничего не переключает
+        await db.use_primary()
+        assert primary.sessions == [db.session]
+        # Репозиторий, созданный после переключения, тоже работает в основной сессии
+        assert db.reviews.session is db.session
+
+
+async def test_use_primary_before_first_query_opens_only_primary():
+    primary, replica = _RecordingFactory(), _RecordingFactory()
+    async with DBManager(session_factory=primary, read_session_factory=replica) as db:
+        await db.use_primary()
+        db.products
+    assert replica.sessions == [] and len(primary.sessions) == 1
+
+
+async def test_sqlite_read_only_engine_rejects_writes():
+    read_engine = create_db_engine(settings.get_db_url, read_only=True)
+    try:
+        async with read_engine.connect() as conn:
+            assert (await conn.execute(text("SELECT count(*) FROM products"))).scalar_one() > 0
+            with pytest.raises(OperationalError, match="readonly|read-only"):
+                await conn.execute(text("UPDATE products SET price = price WHERE id = 1"))
+    finally:
+        await read_engine.dispose()
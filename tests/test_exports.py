@@ -0,0 +1,68 @@
+"""Потоковая выгрузка для админа: CSV (строка на позицию заказа, BOM, экранирование формул) и NDJSON"""
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy import delete, insert
+
+from app.database.database import engine
+from app.models.order_items import OrderItem
+from app.models.orders import Order
+from app.services.exports import ExportService
+from tests.conftest import PRODUCTS_COUNT, USERS, login
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def orders():
+    """Заказ с двумя позициями и заказ без позиций; адрес первого начинается с формулы"""
+    orders = [
+        {"id": 1001, "user_id": 2, "farm_id": 1, "delivery_address": "=HYPERLINK(\"x\")", "total_amount": 30},
+        {"id": 1002, "user_id": 2, "farm_id": 1, "delivery_address": "Адрес", "total_amount": 5},
+    ]
+    items = [
+        {"id": 2001, "order_id": 1001, "product_id": 1, "quantity": 1, "unit_price": 10},
+        {"id": 2002, "order_id": 1001, "product_id": 2, "quantity": 2, "unit_price": 10},
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(insert(Order), orders)
+        await conn.execute(insert(OrderItem), items)
+    yield
+    async with engine.begin() as conn:
+        await conn.execute(delete(OrderItem).where(OrderItem.id.in_([2001, 2002])))
+        await conn.execute(delete(Order).where(Order.id.in_([1001, 1002])))
+
+
+async def test_export_requires_admin(client):
+    await login(client, USERS["customer"]["email"])
+    response = await client.get("/admin/export/orders")
+    assert response.status_code == 403
+
+
+async def test_orders_csv_has_row_per_item(client, orders, monkeypatch):
+    # Пачки по одному заказу: заголовок и BOM только в первой
+    monkeypatch.setattr(ExportService, "batch_size", 1)
+    await login(client, USERS["admin"]["email"])
+    response = await client.get("/admin/export/orders", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="orders.csv"'
+
+    body = response.content.decode()
+    assert body.startswith("\ufeff") and body.count("\ufeff") == 1
+    rows = list(csv.DictReader(io.StringIO(body.removeprefix("\ufeff"))))
+    assert [(row["id"], row["item_id"]) for row in rows] == [("1001", "2001"), ("1001", "2002"), ("1002", "")]
+    assert rows[0]["delivery_address"] == "'=HYPERLINK(\"x\")"
+
+
+async def test_products_ndjson_has_line_per_row(client, monkeypatch):
+    monkeypatch.setattr(ExportService, "batch_size", 100)
+    await login(client, USERS["admin"]["email"])
+    response = await client.get("/admin/export/products", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.content.splitlines()
+    assert len(lines) >= PRODUCTS_COUNT
+    assert {"id", "name", "price"} <= json.loads(lines[0]).keys()
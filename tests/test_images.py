@@ -0,0 +1,65 @@
+"""Изображения товаров и ферм вне строк каталога: 404 без изображения, 307 на неизменяемый адрес файла"""
+import io
+
+import pytest
+from PIL import Image
+from sqlalchemy import LargeBinary, update
+
+from app.database.database import engine
+from app.models.farms import Farm
+from app.models.products import Product
+from app.utils.images import image_store
+from tests.conftest import PRODUCTS_COUNT, USERS, login
+
+pytestmark = pytest.mark.anyio
+
+PRODUCT_ID = PRODUCTS_COUNT
+
+
+def png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), "green").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+async def product_image():
+    yield
+    image_store.shutdown()
+    async with engine.begin() as conn:
+        await conn.execute(update(Product).where(Product.id == PRODUCT_ID).values(image_key=None))
+
+
+def test_catalog_rows_hold_no_image_bytes():
+    for model in (Product, Farm):
+        assert not [column.name for column in model.__table__.columns if isinstance(column.type, LargeBinary)]
+
+
+@pytest.mark.parametrize("path", [f"/products/{PRODUCT_ID}/image", "/farms/1/image", "/products/100000/image"])
+async def test_missing_image_is_404(client, path):
+    response = await client.get(path)
+    assert response.status_code == 404
+
+
+async def test_uploaded_image_redirects_to_immutable_file(client, product_image):
+    await login(client, USERS["farmer"]["email"])
+    response = await client.put(f"/products/{PRODUCT_ID}/image", content=png_bytes())
+    assert response.status_code == 200, response.text
+    key = response.json()["image_key"]
+
+    redirect = await client.get(f"/products/{PRODUCT_ID}/image")
+    assert redirect.status_code == 307
+    assert redirect.headers["location"].endswith(f"/images/{key}")
+    product = (await client.get(f"/products/{PRODUCT_ID}")).json()
+    assert product["image_key"] == key
+
+    image = await client.get(f"/images/{key}")
+    assert image.status_code == 200
+    assert image.headers["content-type"] == "image/png"
+    assert "immutable" in image.headers["cache-control"]
+    not_modified = await client.get(f"/images/{key}", headers={"If-None-Match": image.headers["etag"]})
+    assert not_modified.status_code == 304
+
+    # Повторная загрузка тех же байтов дает тот же ключ
+    again = await client.put(f"/products/{PRODUCT_ID}/image", content=png_bytes())
+    assert again.json()["image_key"] == key
@@ -0,0 +1,60 @@
+"""Keyset-пагинация списков: курсор из X-Next-Cursor и проверка курсора, присланного клиентом"""
+import pytest
+from sqlalchemy import delete, insert
+
+from app.database.database import engine
+from app.models.reviews import Review
+from app.utils.pagination import encode_cursor
+from tests.conftest import PRODUCTS_COUNT
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cursor_pages_cover_catalog_once(client):
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 100, "sort": "price"}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/products", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        ids += [product["id"] for product in page]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(ids) == len(set(ids)) >= PRODUCTS_COUNT
+
+
+@pytest.mark.parametrize(
+    ("params", "cursor"),
+    [
+        ({}, "не base64"),
+        ({}, encode_cursor(["1"])),
+        # bool - подкласс int в Python, но id в курсоре им быть не может
+        ({}, encode_cursor([True])),
+        ({"sort": "price"}, encode_cursor([10.0, False])),
+        ({"sort": "price"}, encode_cursor([1])),
+    ],
+)
+async def test_invalid_cursor_is_rejected(client, params, cursor):
+    response = await client.get("/products", params={**params, "cursor": cursor})
+    assert response.status_code == 422
+
+
+
+async def test_reviews_filtered_on_server(client):
+    reviews = [
+        {"id": 3001, "user_id": 2, "farm_id": 1, "product_id": None, "rating": 5},
+        {"id": 3002, "user_id": 2, "farm_id": None, "product_id": 1, "rating": 4},
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(insert(Review), reviews)
+    try:
+        by_farm = (await client.get("/reviews", params={"farm_id": 1})).json()
+        by_product = (await client.get("/reviews", params={"product_id": 1})).json()
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(Review).where(Review.id.in_([3001, 3002])))
+    assert [review["id"] for review in by_farm] == [3001]
+    assert [review["id"] for review in by_product] == [3002]
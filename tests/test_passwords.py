@@ -0,0 +1,40 @@
+"""bcrypt считается в ограниченном пуле потоков; при переполнении вход и регистрация получают 503"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import passwords
+from app.utils.passwords import password_hasher
+from tests.conftest import PASSWORD, USERS
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_verify_runs_off_event_loop_thread(monkeypatch):
+    threads = []
+
+    def verify(password, hashed_password):
+        threads.append(threading.current_thread().name)
+        return True
+
+    monkeypatch.setattr(passwords, "pwd_context", SimpleNamespace(verify=verify))
+    assert await password_hasher.verify("secret", "hash")
+    assert threads[0].startswith("bcrypt")
+    assert threads[0] != threading.current_thread().name
+
+
+@pytest.mark.parametrize(
+    ("endpoint", "payload"),
+    [
+        ("/auth/login", {"email": USERS["customer"]["email"], "password": PASSWORD}),
+        ("/auth/register", {"email": "new-user@example.com", "username": "new_user", "password": PASSWORD}),
+    ],
+)
+async def test_full_queue_answers_503_without_db(client, executed_sql, monkeypatch, endpoint, payload):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    response = await client.post(endpoint, json=payload)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    # Отказ происходит до поиска пользователя в БД
+    assert executed_sql == []
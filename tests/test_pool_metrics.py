@@ -0,0 +1,83 @@
+"""Метрики пула: checkout, ожидание свободного соединения, таймауты и админский эндпоинт"""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database.pool_metrics import MeteredAsyncQueuePool
+from tests.conftest import USERS, login
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def small_engine():
+    """Пул из одного соединения без overflow: второй checkout ждет первого"""
+    db_engine = create_async_engine(
+        settings.get_db_url,
+        poolclass=MeteredAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.3,
+    )
+    yield db_engine
+    await db_engine.dispose()
+
+
+async def test_checkout_counts_and_peak(small_engine):
+    for _ in range(3):
+        async with small_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    metrics = small_engine.pool.metrics
+    assert metrics.checkouts == 3
+    assert metrics.timeouts == 0
+    assert metrics.peak_checked_out == 1
+    stats = small_engine.pool.stats()
+    assert stats["checkouts"] == 3
+    assert stats["peak_saturation"] == 1.0
+    assert stats["checked_out"] == 0 and stats["saturation"] == 0.0
+
+
+async def test_wait_for_busy_pool_is_measured(small_engine):
+    async def hold():
+        async with small_engine.connect():
+            await asyncio.sleep(0.1)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    async with small_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await holder
+    metrics = small_engine.pool.metrics
+    assert metrics.checkouts == 2
+    assert metrics.max_wait >= 0.05
+    assert small_engine.pool.stats()["max_wait_ms"] >= 50
+
+
+async def test_pool_timeout_is_counted(small_engine):
+    async with small_engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            async with small_engine.connect():
+                pass
+    metrics = small_engine.pool.metrics
+    assert metrics.timeouts == 1
+    # Неудачная попытка не считается checkout
+    assert metrics.checkouts == 1
+
+
+async def test_pool_endpoint_is_admin_only(client):
+    assert (await client.get("/admin/db/pool")).status_code == 401
+    await login(client, USERS["customer"]["email"])
+    assert (await client.get("/admin/db/pool")).status_code == 403
+
+    await login(client, USERS["admin"]["email"])
+    response = await client.get("/admin/db/pool")
+    assert response.status_code == 200
+    stats = response.json()
+    # Реплика в тестах не настроена
+    assert set(stats) == {"primary"}
+    assert stats["primary"]["pool_size"] == settings.DB_POOL_SIZE
+    assert stats["primary"]["checkouts"] >= 1
@@ -0,0 +1,75 @@
+"""Импорт товаров из CSV: пачки, отчет об ошибках с номерами строк файла, ферма фермера"""
+import pytest
+from sqlalchemy import select
+
+from app.database.database import async_session_maker
+from app.models.products import Product
+from app.services.products import ProductService
+from tests.conftest import USERS, login
+
+pytestmark = pytest.mark.anyio
+
+CSV = "\n".join([
+    "name;category;price;quantity;unit;farm_id",
+    "Импорт морковь;овощи;12,5;3;кг;",
+    "Импорт яблоко;Фрукты;-1;1;кг;",
+    "Импорт груша;Нет такой категории;20;1;кг;",
+    "Импорт слива;Фрукты;30;1;кг;2",
+    "Импорт свекла;Овощи;8;0;кг;1",
+]).encode("utf-8-sig")
+
+
+async def upload(client, content: bytes):
+    return await client.post("/products/import", files={"file": ("products.csv", content, "text/csv")})
+
+
+@pytest.fixture
+async def imported_products(client):
+    yield
+    async with async_session_maker() as session:
+        ids = (await session.scalars(select(Product.id).where(Product.name.startswith("Импорт")))).all()
+    await login(client, USERS["farmer"]["email"])
+    for product_id in ids:
+        assert (await client.delete(f"/products/{product_id}")).status_code == 200
+
+
+async def test_import_reports_invalid_rows(client, imported_products, monkeypatch):
+    # Пачки по две строки: ошибки и номера строк не зависят от границ пачек
+    monkeypatch.setattr(ProductService, "import_chunk_size", 2)
+    await login(client, USERS["farmer"]["email"])
+    response = await upload(client, CSV)
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["created"] == 2, report
+    assert [(error["row"], error["field"]) for error in report["errors"]] == [(3, "price"), (4, "category"), (5, "farm_id")]
+
+    async with async_session_maker() as session:
+        products = (await session.scalars(select(Product).where(Product.name.startswith("Импорт")).order_by(Product.id))).all()
+    assert [(product.name, product.price, product.category_id, product.farm_id) for product in products] == [
+        ("Импорт морковь", 12.5, 1, 1),
+        ("Импорт свекла", 8.0, 1, 1),
+    ]
+    found = (await client.get("/products/search", params={"q": "морковь"})).json()
+    assert [product["name"] for product in found] == ["Импорт морковь"]
+
+
+async def test_import_rejects_file_without_required_columns(client):
+    await login(client, USERS["farmer"]["email"])
+    response = await upload(client, "name,price\nМорковь,10\n".encode())
+    assert response.status_code == 422
+
+
+async def test_import_requires_farm(client):
+    await login(client, USERS["customer"]["email"])
+    response = await upload(client, CSV)
+    assert response.status_code == 403
+
+
+async def test_non_ascii_digits_are_row_errors(client, imported_products):
+    content = "name;category_id;price;quantity\nИмпорт лук;²;10;1\nИмпорт чеснок;1;10;1\n".encode()
+    await login(client, USERS["farmer"]["email"])
+    response = await upload(client, content)
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["created"] == 1
+    assert [(error["row"], error["field"]) for error in report["errors"]] == [(2, "category_id")]
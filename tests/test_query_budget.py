@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database.database import engine
+from app.database.query_stats import collect_queries, query_budget
+from tests.conftest import USERS, login
+
+pytestmark = pytest.mark.anyio
+
+
+# Списки с conditional_get: версия таблицы для ETag и сами строки
+@pytest.mark.parametrize(
+    ("url", "budget"),
+    [
+        ("/products?limit=100", 2),
+        ("/products?limit=100&category_id=1&sort=price", 2),
+        ("/products?limit=100&in_stock=true&sort=rating", 2),
+        ("/products/1", 1),
+        ("/farms", 2),
+        ("/reviews", 2),
+    ],
+)
+async def test_catalog_endpoints_query_budget(client, url, budget):
+    with query_budget(budget):
+        response = await client.get(url)
+    assert response.status_code == 200
+
+
+async def test_cart_is_loaded_without_n_plus_one(client):
+    await login(client, USERS["customer"]["email"])
+    for product_id in range(1, 21):
+        response = await client.post("/cart/items", json={"product_id": product_id, "quantity": 1})
+        assert response.status_code == 200, response.text
+
+    with query_budget(1):
+        response = await client.get("/cart")
+    assert response.status_code == 200
+    assert len(response.json()) == 20
+
+    for product_id in range(1, 21):
+        await client.delete(f"/cart/items/{product_id}")
+
+
+async def test_query_budget_reports_excess_queries(client):
+    with pytest.raises(AssertionError, match="при бюджете 0"):
+        with query_budget(0):
+            await client.get("/products?limit=5")
+
+
+async def test_failed_statement_leaves_no_timing_state_on_connection():
+    async with engine.connect() as conn:
+        with collect_queries() as stats:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+        info = await conn.run_sync(lambda sync_conn: dict(sync_conn.info))
+    # Упавшие запросы не доходят до after_cursor_execute: учитывается только выполненный
+    assert stats.count == 1
+    assert 0 <= stats.total_time < 1
+    assert "query_start_time" not in info
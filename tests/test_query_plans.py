@@ -0,0 +1,53 @@
+"""EXPLAIN QUERY PLAN для горячих фильтров репозиториев: каждый запрос должен искать по индексу"""
+import pytest
+
+from app.database.database import async_session_maker, engine
+from app.database.db_manager import DBManager
+
+pytestmark = pytest.mark.anyio
+
+
+async def query_plans(executed_sql, call) -> list[str]:
+    async with DBManager(session_factory=async_session_maker) as db:
+        await call(db)
+    selects = [(statement, parameters) for statement, parameters in executed_sql if statement.lstrip().upper().startswith("SELECT")]
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in selects:
+            rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append("\n".join(row.detail for row in rows))
+    return plans
+
+
+@pytest.mark.parametrize(
+    ("call", "index"),
+    [
+        (lambda db: db.products.get_filtered_page(limit=20, sort="price", category_id=1), "ix_products_category_id_price"),
+        (lambda db: db.products.get_filtered_page(limit=20, sort="price", min_price=50, category_id=1), "ix_products_category_id_price"),
+        (lambda db: db.products.get_filtered_page(limit=20, sort="price", farm_id=1), "ix_products_farm_id_price"),
+        (lambda db: db.products.get_filtered_page(limit=20, sort="price", in_stock=True), "ix_products_in_stock_price"),
+        (lambda db: db.products.get_filtered_page(limit=20, sort="price", max_price=100), "ix_products_price"),
+        (lambda db: db.products.get_filtered_page(limit=20, sort="name"), "ix_products_name"),
+        (lambda db: db.products.get_filtered_page(limit=20, sort="rating"), "ix_products_rating_avg"),
+        (lambda db: db.cart.get_by_user_id(2), "ix_cart_user_id_product_id"),
+        (lambda db: db.cart.get_by_product_id(1), "ix_cart_product_id"),
+        (lambda db: db.orders.get_by_user_id(2), "ix_orders_user_id"),
+        (lambda db: db.orders.get_by_status("pending"), "ix_orders_status"),
+        (lambda db: db.order_items.get_by_order_id(1), "ix_order_items_order_id"),
+        (lambda db: db.order_items.get_by_product_id(1), "ix_order_items_product_id"),
+        (lambda db: db.reviews.get_reviews_by_product(1), "ix_reviews_product_id"),
+        (lambda db: db.reviews.get_page(limit=20, product_id=1), "ix_reviews_product_id"),
+        (lambda db: db.reviews.get_page(limit=20, farm_id=1), "ix_reviews_farm_id"),
+        (lambda db: db.reviews.get_reviews_by_farm(1), "ix_reviews_farm_id"),
+        (lambda db: db.reviews.get_user_product_review(2, 1), "ix_reviews_user_id_product_id"),
+        (lambda db: db.reviews.get_user_farm_review(2, 1), "ix_reviews_user_id_farm_id"),
+        (lambda db: db.farms.get_pending_applications(), "ix_farms_status"),
+        (lambda db: db.user_subscriptions.get_all(status="active"), "ix_user_subscriptions_status"),
+    ],
+)
+async def test_hot_filter_uses_index(executed_sql, call, index):
+    plans = await query_plans(executed_sql, call)
+    assert plans
+    assert f"USING INDEX {index}" in plans[0], plans[0]
+    # Порядок страницы тоже берется из индекса, без сортировки во временном B-дереве
+    assert "TEMP B-TREE" not in plans[0], plans[0]
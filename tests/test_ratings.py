@@ -0,0 +1,103 @@
+"""Агрегаты рейтинга ферм и товаров обновляются вместе с отзывом и совпадают с полным пересчетом"""
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.database.database import engine
+from app.models.farms import Farm
+from app.models.products import Product
+from app.models.reviews import Review
+from tests.conftest import USERS, login
+
+pytestmark = pytest.mark.anyio
+
+PRODUCT_A, PRODUCT_B = 241, 242
+FARM_A, FARM_B = 1, 2
+
+
+async def aggregates(model, id: int) -> dict:
+    async with engine.connect() as conn:
+        row = (await conn.execute(
+            select(
+                model.rating_count, model.rating_sum, model.rating_avg,
+                model.rating_1, model.rating_2, model.rating_3, model.rating_4, model.rating_5,
+            ).where(model.id == id)
+        )).one()
+    return {
+        "count": row.rating_count,
+        "sum": row.rating_sum,
+        "avg": row.rating_avg,
+        "histogram": [row.rating_1, row.rating_2, row.rating_3, row.rating_4, row.rating_5],
+    }
+
+
+def expected(*ratings: int) -> dict:
+    return {
+        "count": len(ratings),
+        "sum": sum(ratings),
+        "avg": sum(ratings) / len(ratings) if ratings else 0.0,
+        "histogram": [ratings.count(rating) for rating in range(1, 6)],
+    }
+
+
+async def snapshot() -> dict:
+    return {
+        "products": [await aggregates(Product, id) for id in (PRODUCT_A, PRODUCT_B)],
+        "farms": [await aggregates(Farm, id) for id in (FARM_A, FARM_B)],
+    }
+
+
+async def review_id(client, **filters) -> int:
+    response = await client.get("/reviews", params=filters)
+    ids = [review["id"] for review in response.json() if review["user_id"] == USERS["customer"]["id"]]
+    assert len(ids) == 1
+    return ids[0]
+
+
+@pytest.fixture
+async def second_farm():
+    async with engine.begin() as conn:
+        await conn.execute(insert(Farm), [{"id": FARM_B, "user_id": USERS["admin"]["id"], "name": "Вторая ферма", "address": "Адрес"}])
+    yield
+    async with engine.begin() as conn:
+        await conn.execute(delete(Review).where(Review.farm_id == FARM_B))
+        await conn.execute(delete(Farm).where(Farm.id == FARM_B))
+
+
+async def test_aggregates_follow_review_changes_and_match_rebuild(client, second_farm):
+    baseline = await snapshot()
+    assert baseline["products"] == [expected(), expected()]
+    farm_a = baseline["farms"][0]
+
+    await login(client, USERS["customer"]["email"])
+    assert (await client.post("/reviews", json={"product_id": PRODUCT_A, "rating": 4})).status_code == 200
+    assert (await client.post("/reviews", json={"farm_id": FARM_A, "rating": 2})).status_code == 200
+    product_review = await review_id(client, product_id=PRODUCT_A)
+    farm_review = await review_id(client, farm_id=FARM_A)
+    assert await aggregates(Product, PRODUCT_A) == expected(4)
+    farm_after_create = await aggregates(Farm, FARM_A)
+    assert farm_after_create["count"] == farm_a["count"] + 1
+    assert farm_after_create["sum"] == farm_a["sum"] + 2
+
+    await login(client, USERS["admin"]["email"])
+    # Смена оценки на том же товаре
+    assert (await client.put(f"/reviews/{product_review}", json={"product_id": PRODUCT_A, "rating": 5})).status_code == 200
+    assert await aggregates(Product, PRODUCT_A) == expected(5)
+    # Перенос на другой товар и другую ферму
+    assert (await client.put(f"/reviews/{product_review}", json={"product_id": PRODUCT_B, "rating": 1})).status_code == 200
+    assert (await client.put(f"/reviews/{farm_review}", json={"farm_id": FARM_B, "rating": 3})).status_code == 200
+    assert await snapshot() == {
+        "products": [expected(), expected(1)],
+        "farms": [farm_a, expected(3)],
+    }
+
+    # Полный пересчет из reviews дает те же значения, что и инкрементальные изменения
+    incremental = await snapshot()
+    response = await client.post("/admin/ratings/rebuild")
+    assert response.status_code == 200
+    assert await snapshot() == incremental
+
+    assert (await client.delete(f"/reviews/{product_review}")).status_code == 200
+    assert (await client.delete(f"/reviews/{farm_review}")).status_code == 200
+    assert await snapshot() == {**baseline, "farms": [farm_a, expected()]}
+    await client.post("/admin/ratings/rebuild")
+    assert await snapshot() == {**baseline, "farms": [farm_a, expected()]}
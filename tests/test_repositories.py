@@ -0,0 +1,20 @@
+import pytest
+
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_create_many_inserts_batch_in_one_statement(executed_sql):
+    rows = [{"name": f"Пакетная категория {i}"} for i in range(50)]
+    async with DBManager(session_factory=async_session_maker) as db:
+        ids = await db.categories.create_many(rows)
+        inserts = [statement for statement, _ in executed_sql if statement.lstrip().upper().startswith("INSERT")]
+        names = {category.name for category in await db.categories.get_by_ids(ids)}
+        await db.rollback()
+
+    assert len(inserts) == 1
+    assert isinstance(ids, set) and len(ids) == len(rows)
+    # Порядок id не гарантирован, но множество строк совпадает с переданным
+    assert names == {row["name"] for row in rows}
@@ -0,0 +1,92 @@
+"""Полнотекстовый поиск: стемминг русских слов, ранжирование и поддержка индекса FTS5"""
+import pytest
+from sqlalchemy import select
+
+from app.database.database import async_session_maker
+from app.models.products import Product
+from app.repositories.products import ProductRepository
+from app.utils.search import stem_word, to_match_query
+from tests.conftest import USERS, login
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize(
+    "words",
+    [
+        ("морковь", "моркови", "морковью", "морковей"),
+        ("яблоко", "яблока", "яблоком", "яблоку"),
+        ("свежий", "свежая", "свежие", "свежего"),
+        ("ёжик", "ежик", "ежика"),
+    ],
+)
+def test_inflections_share_stem(words):
+    assert len({stem_word(word) for word in words}) == 1
+
+
+def test_match_query_requires_every_word_and_prefixes_last():
+    assert to_match_query("Свежая морковь и яблоки") == '"свеж" "морков" "яблок"*'
+    assert to_match_query("и в") is None
+
+
+async def search(client, query: str) -> list[str]:
+    response = await client.get("/products/search", params={"q": query})
+    assert response.status_code == 200
+    return [product["name"] for product in response.json()]
+
+
+async def product_id(name: str) -> int:
+    async with async_session_maker() as session:
+        return (await session.scalars(select(Product.id).where(Product.name == name))).one()
+
+
+@pytest.fixture
+async def farmer(client):
+    await login(client, USERS["farmer"]["email"])
+    created = []
+
+    async def create(name: str, description: str) -> int:
+        payload = {"name": name, "category_id": 1, "description": description, "price": 10, "quantity": 1}
+        response = await client.post("/products", json=payload)
+        assert response.status_code == 200, response.text
+        created.append(await product_id(name))
+        return created[-1]
+
+    yield create
+    for id in created:
+        await client.delete(f"/products/{id}")
+
+
+async def test_index_follows_create_update_and_delete(client, farmer):
+    id = await farmer("Поиск репа", "Сладкая репа с грядки")
+    assert await search(client, "репы") == ["Поиск репа"]
+
+    payload = {"name": "Поиск брюква", "farm_id": 1, "category_id": 1, "unit": "кг", "description": "Крупная брюква", "price": 10, "quantity": 1}
+    response = await client.put(f"/products/{id}", json=payload)
+    assert response.status_code == 200, response.text
+    assert await search(client, "репа") == []
+    assert await search(client, "брюквой") == ["Поиск брюква"]
+
+    assert (await client.delete(f"/products/{id}")).status_code == 200
+    assert await search(client, "брюква") == []
+
+
+async def test_name_match_ranks_above_description_match(client, farmer):
+    await farmer("Поиск пастернак", "Корнеплод")
+    await farmer("Поиск корнеплод", "Похож на пастернак")
+    assert await search(client, "пастернака") == ["Поиск пастернак", "Поиск корнеплод"]
+
+
+async def test_last_word_matches_by_prefix(client, farmer):
+    await farmer("Поиск топинамбур", "Земляная груша")
+    assert await search(client, "земляная гру") == ["Поиск топинамбур"]
+
+
+async def test_only_newest_candidates_are_ranked(client, farmer, monkeypatch):
+    # Старый товар совпадает лучше (слово в названии), но в ранжирование попадает только самое новое совпадение
+    await farmer("Поиск шпинат", "Зелень")
+    await farmer("Поиск зелень", "Немного шпината")
+    assert await search(client, "шпинат") == ["Поиск шпинат", "Поиск зелень"]
+
+    monkeypatch.setattr(ProductRepository, "search_candidates", 1)
+    assert await search(client, "шпинат") == ["Поиск зелень"]
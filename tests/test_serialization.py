@@ -0,0 +1,39 @@
+"""Списки валидируются одним вызовом pydantic и кодируются без повторной валидации по response_model"""
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.database.database import async_session_maker
+from app.models.products import Product
+from app.schemes.products import SProductGet
+from app.utils.serialization import ValidatedListResponse, list_adapter, validate_list
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_validate_list_matches_per_row_validation():
+    async with async_session_maker() as session:
+        products = (await session.scalars(select(Product).order_by(Product.id).limit(50))).all()
+        per_row = [SProductGet.model_validate(product).model_dump(mode="json") for product in products]
+        validated = validate_list(SProductGet, products)
+    assert list_adapter(SProductGet) is list_adapter(SProductGet)
+    assert json.loads(ValidatedListResponse(validated, SProductGet).body) == per_row
+
+
+async def test_products_list_keeps_schema_and_headers(client):
+    response = await client.get("/products", params={"limit": 20})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["ETag"]
+    assert response.headers["X-Next-Cursor"]
+    items = response.json()
+    assert len(items) == 20
+    assert items == [SProductGet.model_validate(item).model_dump(mode="json") for item in items]
+
+
+async def test_openapi_keeps_list_response_model(client):
+    schema = (await client.get("/openapi.json")).json()
+    content = schema["paths"]["/products"]["get"]["responses"]["200"]["content"]["application/json"]
+    assert content["schema"]["type"] == "array"
+    assert content["schema"]["items"]["$ref"].endswith("/SProductGet")